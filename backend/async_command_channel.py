@@ -0,0 +1,199 @@
+import time, asyncio, subprocess
+
+from uuid import uuid4
+from typing import Dict, List, Optional
+
+from .logger import Logger
+from .instrumentation import record_spawn, record_child_cpu_time, process_cpu_time
+
+class AsyncCommandChannel:
+    def __init__(
+        self,
+        command: List[str],
+        timeout: float = 5.0,
+        echo: str = "echo {marker}",
+        size: int = 2,
+    ):
+        """Keeps up to `size` shell processes alive and runs queries through their stdin, for asyncio.
+
+        Works like CommandChannel, every query is followed by an echo of a unique marker, but the
+        shells are started with `asyncio.create_subprocess_exec` and read without threads. Each
+        shell answers one query at a time, so up to `size` queries run at once, the others wait
+        for a free shell. A query that misses its deadline or gets cancelled kills its shell,
+        whose output can't be trusted anymore, the next query on it starts a fresh one. The CPU
+        time a shell spends answering a query is counted against the probe being read.
+
+        Shells are started on first use and belong to the event loop they were started on.
+
+        Args:
+        ---------
+            command (list): The shell to start, e.g. `["powershell.exe", "-Command", "-"]` or `["sh"]`.
+            timeout (float): The default deadline of a query in seconds, waiting for a free shell included.
+            echo (str): The shell command that prints `{marker}` on its own line.
+            size (int): The most shells kept alive, and queries run at once.
+        """
+        self.logger = Logger()
+        self.command = command
+        self.timeout = timeout
+        self.echo = echo
+        self.size = size
+        self.spawns = 0
+        self.queries = 0
+        self.timeouts = 0
+
+        # Idle shells, None for one that isn't started yet
+        self._idle: Optional["asyncio.Queue[Optional[asyncio.subprocess.Process]]"] = None
+        self._processes: List[asyncio.subprocess.Process] = []
+        # The shells as psutil sees them, for their CPU time
+        self._shells: Dict[asyncio.subprocess.Process, object] = {}
+
+    @property
+    def alive(self) -> int:
+        """How many shells are running."""
+        return sum(process.returncode is None for process in self._processes)
+
+    async def start(self) -> asyncio.subprocess.Process:
+        """Start one shell process."""
+        process = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin = subprocess.PIPE,
+            stdout = subprocess.PIPE,
+            stderr = subprocess.DEVNULL,
+            # Don't flash a console window for every shell on Windows
+            creationflags = getattr(subprocess, "CREATE_NO_WINDOW", 0),
+        )
+        self._processes.append(process)
+        self._shells[process] = self._watch(process.pid)
+        self.spawns += 1
+        record_spawn()
+        self.logger.debug(f"Started async command channel {self.command[0]} (pid {process.pid})")
+        return process
+
+    async def close(self):
+        """Stop every shell process."""
+        processes, self._processes = self._processes, []
+        self._idle = None
+        for process in processes:
+            await self._kill(process)
+
+    async def query(self, command: str, timeout: Optional[float] = None) -> str:
+        """Run a command in a free shell and get what it printed.
+
+        Parameters:
+        ----------
+        command: str
+            A single line command for the shell.
+        timeout: float
+            The deadline in seconds, the channel's default if not given.
+
+        Returns:
+        ----------
+        str:
+            The output of the command, stripped.
+
+        Raises:
+        ----------
+        TimeoutError:
+            If the reply didn't arrive before the deadline, the shell is restarted.
+        RuntimeError:
+            If the shell exited while answering."""
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+            for _ in range(self.size):
+                self._idle.put_nowait(None)
+        idle = self._idle
+
+        try:
+            process = await asyncio.wait_for(idle.get(), max(0, deadline - time.monotonic()))
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise TimeoutError(f"Every {self.command[0]} of the async command channel was busy for the whole deadline")
+
+        stale = None
+        try:
+            if process is None or process.returncode is not None:
+                process = await self.start()
+            shell = self._shells.get(process)
+            cpu_time = process_cpu_time(shell)
+            try:
+                return await self._run(process, command, deadline)
+            finally:
+                # Nothing is charged for a shell that was killed, it can't be asked anymore
+                used = process_cpu_time(shell)
+                if cpu_time is not None and used is not None:
+                    record_child_cpu_time(used - cpu_time)
+        except BaseException:
+            # Cancelled or failed halfway, whatever the shell prints next would be taken for the next reply
+            stale, process = process, None
+            raise
+        finally:
+            # The slot is free before the shell is waited for, other queries start a new one meanwhile
+            if idle is self._idle:
+                idle.put_nowait(process)
+            elif process is not None:
+                # The channel was closed while this query ran
+                stale = process
+            if stale is not None:
+                await self._kill(stale)
+
+    async def _run(self, process: asyncio.subprocess.Process, command: str, deadline: float) -> str:
+        marker = f"NYX_{uuid4().hex}"
+        try:
+            process.stdin.write(f"{command}\n{self.echo.format(marker = marker)}\n".encode()) # type: ignore
+            await process.stdin.drain() # type: ignore
+        except (OSError, RuntimeError) as e:
+            raise RuntimeError(f"Async command channel {self.command[0]} is gone: {e}")
+
+        self.queries += 1
+        output = []
+        while True:
+            try:
+                line = await asyncio.wait_for(process.stdout.readline(), max(0, deadline - time.monotonic())) # type: ignore
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise TimeoutError(f"'{command}' did not answer in time, restarting {self.command[0]}")
+
+            if not line:
+                raise RuntimeError(f"Async command channel {self.command[0]} exited while running '{command}'")
+            text = line.decode(errors = "replace")
+            if text.strip() == marker:
+                return "".join(output).strip()
+            output.append(text)
+
+    def _watch(self, pid: int):
+        try:
+            import psutil
+            return psutil.Process(pid)
+        except Exception as e:
+            self.logger.debug(f"Can't measure the CPU time of async command channel {self.command[0]}: {e}")
+            return None
+
+    def _children(self, shell) -> list:
+        if shell is None:
+            return []
+        try:
+            return shell.children(recursive = True)
+        except Exception:
+            # The shell is gone already
+            return []
+
+    async def _kill(self, process: asyncio.subprocess.Process, timeout: float = 1.0):
+        if process in self._processes:
+            self._processes.remove(process)
+        shell = self._shells.pop(process, None)
+        try:
+            # What the shell started, e.g. a query's command, holds its output pipe too, and waiting
+            # for the shell waits for that pipe to close
+            for child in self._children(shell):
+                child.kill()
+            if process.returncode is None:
+                process.kill()
+            if process.stdin is not None:
+                process.stdin.close()
+            await asyncio.wait_for(process.wait(), timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning(f"Async command channel {self.command[0]} (pid {process.pid}) didn't exit within {timeout}s")
+        except Exception as e:
+            self.logger.error(f"An error occurred while stopping async command channel {self.command[0]}: {e}")
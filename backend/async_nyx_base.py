@@ -0,0 +1,220 @@
+import time, asyncio, functools, contextvars
+
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+from concurrent.futures import ThreadPoolExecutor
+
+from .logger import Logger
+from .instrumentation import SourceStats, record_error, task_stats
+from .objects import CPU
+from .nyx_base import NyxBase
+
+async def gather(*awaitables):
+    """Like `asyncio.gather`, but the first failure cancels the awaitables that are still running."""
+    tasks = [asyncio.ensure_future(awaitable) for awaitable in awaitables]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+class AsyncNyxBase:
+    def __init__(self, nyx_base: Optional[NyxBase] = None, timeout: float = 5.0, workers: int = 4, channels: int = 2):
+        """NyxBase for asyncio, where independent probes run at the same time.
+
+        Reading everything costs about as much as the slowest probe instead of the sum of all of
+        them. PowerShell queries go through an AsyncCommandChannel with `channels` shells, unless
+        the platform of `nyx_base` reads the value its own way, e.g. from sysfs on Linux. psutil,
+        NVML, the registry, the inventory and those platform getters block, so they run on a pool
+        of `workers` threads, with the caches and rates of `nyx_base`. Every probe in `read_all` has a deadline. A probe
+        that misses it is cancelled: its shell is killed, a blocking read finishes unobserved.
+
+        The getters return what their NyxBase counterparts return and fail like them, except that
+        `get_cpu` has no temperature instead of failing when there's no sensor.
+
+        Args:
+        ---------
+            nyx_base (NyxBase): The NyxBase whose sources, caches and inventory are used, a new one if not given.
+            timeout (float): The default deadline of a probe in seconds.
+            workers (int): The threads blocking reads run on.
+            channels (int): The most PowerShell processes kept alive, and queries run at once.
+        """
+        self.logger = Logger()
+        self.nyx_base = nyx_base if nyx_base is not None else NyxBase.create()
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers = workers, thread_name_prefix = "NyxAsync")
+        self.powershell = self.nyx_base.sources.create_async_channel(NyxBase.POWERSHELL, size = channels)
+        # Latencies and failures of every probe `read_all` ran, see `diagnostics`
+        self.stats: Dict[str, SourceStats] = {}
+
+    async def close(self):
+        """Release the shells, the threads and the sessions of the NyxBase."""
+        await self.powershell.close()
+        self.executor.shutdown(wait = False, cancel_futures = True)
+        self.nyx_base.close()
+
+    async def run(self, function: Callable, *args):
+        """Run a blocking function on the thread pool.
+
+        Failures it handles itself are counted against the probe being read, like on the scheduler."""
+        call = functools.partial(contextvars.copy_context().run, function, *args)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, call)
+
+    async def probe(self, key: str, awaitable: Awaitable, timeout: Optional[float] = None):
+        """Await a probe with a deadline, counting its latency and failures under `key`.
+
+        Raises:
+        ----------
+        TimeoutError:
+            If the probe missed its deadline, it's cancelled."""
+        timeout = self.timeout if timeout is None else timeout
+        stats = self.stats.setdefault(key, SourceStats())
+        # The task wait_for runs the probe in takes a copy of this, and so does everything it starts
+        token = task_stats.set(stats)
+        start_time = time.perf_counter_ns()
+        try:
+            return await asyncio.wait_for(awaitable, timeout)
+        except asyncio.TimeoutError as e:
+            # The one wait_for raises says nothing, and before Python 3.11 it isn't a TimeoutError
+            error = e if isinstance(e, TimeoutError) and str(e) else TimeoutError(f"{key} did not answer in {timeout}s")
+            stats.record_error(error)
+            raise error
+        except Exception as e:
+            stats.record_error(e)
+            raise
+        finally:
+            stats.latency.record(time.perf_counter_ns() - start_time)
+            task_stats.reset(token)
+
+    def diagnostics(self) -> Dict[str, dict]:
+        """Get the latency percentiles, call, error and timeout counts of every probe, see Scheduler.diagnostics."""
+        return {key: stats.to_dict() for key, stats in list(self.stats.items())}
+
+    def is_overridden(self, getter: str) -> bool:
+        """Whether the platform of the NyxBase reads `getter` its own way instead of through PowerShell."""
+        return getattr(type(self.nyx_base), getter) is not getattr(NyxBase, getter)
+
+    async def get_cpu_temperature(self):
+        if self.is_overridden("get_cpu_temperature"):
+            return await self.run(self.nyx_base.get_cpu_temperature)
+        return float(await self.powershell.query(NyxBase.QUERIES["cpu.temperature"]))
+
+    async def get_cpu_usage(self):
+        if self.is_overridden("get_cpu_usage"):
+            return await self.run(self.nyx_base.get_cpu_usage)
+        try:
+            output = await self.powershell.query(NyxBase.QUERIES["cpu.usage"])
+            return float(output) if len(output) > 0 else 0
+        except Exception as e:
+            self.logger.error(f"An error occurred while retrieving CPU usage: {e}")
+            record_error(e)
+            return 0
+
+    async def get_cpu(self):
+        """Get CPU object, its temperature, name and usage are read at the same time.
+
+        A temperature that can't be read is None, a missing sensor doesn't cancel the other reads."""
+        # The temperature query is sent first, before the others make the CPU any warmer
+        temperature, processor, usage = await gather(
+            self._read_cpu_temperature(),
+            self.run(self.nyx_base.get_cpu_name),
+            self.get_cpu_usage(),
+        )
+        return CPU(processor = processor, temperature = temperature, usage = usage)
+
+    async def _read_cpu_temperature(self) -> Optional[float]:
+        try:
+            return await self.get_cpu_temperature()
+        except Exception as e:
+            self.logger.error(f"An error occurred while retrieving CPU temperature: {e}")
+            record_error(e)
+            return None
+
+    async def get_gpu(self):
+        return await self.run(self.nyx_base.get_gpu)
+
+    async def get_ram_info(self):
+        return await self.run(self.nyx_base.get_ram_info)
+
+    async def get_harddisk_info(self):
+        return await self.run(self.nyx_base.get_harddisk_info)
+
+    async def get_disk_io_percentage(self):
+        return await self.run(self.nyx_base.get_disk_io_percentage)
+
+    async def get_network_speed(self, interface: str):
+        return await self.run(self.nyx_base.get_network_speed, interface)
+
+    async def get_fans(self):
+        return await self.run(self.nyx_base.get_fans)
+
+    async def get_computer_model(self):
+        return await self.run(self.nyx_base.get_computer_model)
+
+    async def get_drive_type(self):
+        if self.is_overridden("get_drive_type"):
+            return await self.run(self.nyx_base.get_drive_type)
+        disk_info = await self.powershell.query(NyxBase.QUERIES["disk.drive_type"])
+        return "SSD" if "ssd" in disk_info.lower() else "HDD"
+
+    async def get_power_plan(self):
+        if self.is_overridden("get_power_plan"):
+            return await self.run(self.nyx_base.get_power_plan)
+        try:
+            return await self.powershell.query(NyxBase.QUERIES["power_plan"])
+        except Exception as e:
+            self.logger.error(f"An error occurred while retrieving power plan: {e}")
+            record_error(e)
+            return "N/A"
+
+    async def is_on_battery(self):
+        return await self.run(self.nyx_base.is_on_battery)
+
+    async def get_idle_time(self):
+        return await self.run(self.nyx_base.get_idle_time)
+
+    def get_probes(self) -> Dict[str, Callable[[], Awaitable]]:
+        """Get everything `read_all` reads, keyed like the metric sources of NyxBase."""
+        return {
+            "cpu": self.get_cpu,
+            "gpu": self.get_gpu,
+            "ram": self.get_ram_info,
+            "disk": self.get_harddisk_info,
+            "disk.io_percent": self.get_disk_io_percentage,
+            "net.wifi": lambda: self.get_network_speed("Wi-Fi"),
+            "net.lan": lambda: self.get_network_speed("Ethernet"),
+            "power_plan": self.get_power_plan,
+        }
+
+    async def read_all(self, keys: Optional[Iterable[str]] = None, timeout: Optional[float] = None) -> dict:
+        """Run every probe at the same time, each with its own deadline.
+
+        Parameters:
+        ----------
+        keys: Iterable[str]
+            The probes to run, see `get_probes`, every one if not given.
+        timeout: float
+            The deadline of every probe in seconds, the default one if not given.
+
+        Returns:
+        ----------
+        dict:
+            Probe keys mapped to their results, probes that failed or missed their deadline are left out."""
+        probes = self.get_probes()
+        if keys is not None:
+            probes = {key: probes[key] for key in keys}
+
+        results = await asyncio.gather(
+            *(self.probe(key, probe(), timeout) for key, probe in probes.items()),
+            return_exceptions = True,
+        )
+
+        values = {}
+        for key, result in zip(probes, results):
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, BaseException):
+                self.logger.error(f"An error occurred while reading {key}: {result}")
+                continue
+            values[key] = result
+        return values
@@ -0,0 +1,133 @@
+import time
+
+from typing import Dict, List, Optional
+
+# What a source that can't be read publishes instead of its values, and what the UI shows for it
+UNAVAILABLE = "N/A"
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    UNAVAILABLE = "unavailable"
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_timeout: float = 5.0,
+        max_reset_timeout: float = 300.0,
+        timeout: Optional[float] = 5.0,
+    ):
+        """Stops calling a source that keeps failing, and tries it again less and less often.
+
+        Calls until the first success probe the source: one that fails `failure_threshold` of
+        them, the last one other than by timing out, isn't there on this machine. It becomes
+        unavailable and is only probed again every `max_reset_timeout` seconds, e.g. for an
+        adapter that shows up later. After a success, `failure_threshold` failures in a row open
+        the breaker for `reset_timeout` seconds, doubled every time it opens again without a
+        success in between, up to `max_reset_timeout`. Once the breaker allows it, one call is
+        let through, a success closes the breaker and a failure opens it again.
+
+        Calls can't be interrupted, the shells enforce their own deadlines, but a call that took
+        longer than `timeout` seconds counts as a timed out failure even if it returned.
+
+        Args:
+        ---------
+            failure_threshold (int): Failures in a row that open the breaker.
+            reset_timeout (float): Seconds the breaker stays open the first time.
+            max_reset_timeout (float): The most seconds the breaker stays open.
+            timeout (float): Seconds after which a call counts as timed out, None for no limit.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.timeout = timeout
+        self.state = self.CLOSED
+        # Whether a call ever succeeded
+        self.probed = False
+        # Failures since the last success, and times opened since then
+        self.failures = 0
+        self.opens = 0
+        self.retry_at = 0.0
+
+    def allow(self, now: Optional[float] = None) -> bool:
+        """Whether the source may be called now, as `time.monotonic()`."""
+        if self.state == self.CLOSED:
+            return True
+        return (time.monotonic() if now is None else now) >= self.retry_at
+
+    def record(self, failed: bool, timed_out: bool = False, elapsed: float = 0.0, now: Optional[float] = None) -> str:
+        """Account for a finished call.
+
+        Parameters:
+        ----------
+        failed: bool
+            Whether the call raised or reported a failure it handled.
+        timed_out: bool
+            Whether the failure was a missed deadline.
+        elapsed: float
+            How long the call took in seconds.
+
+        Returns:
+        ----------
+        str:
+            The new state."""
+        if self.timeout is not None and elapsed > self.timeout:
+            failed = timed_out = True
+
+        if not failed:
+            self.state = self.CLOSED
+            self.probed = True
+            self.failures = 0
+            self.opens = 0
+            return self.state
+
+        self.failures += 1
+        # A timeout says nothing about whether the source is there, it may only be slow to start
+        if not self.probed and self.failures >= self.failure_threshold and not timed_out:
+            self.state = self.UNAVAILABLE
+            self.retry_at = (time.monotonic() if now is None else now) + self.max_reset_timeout
+            return self.state
+
+        if self.state != self.CLOSED or self.failures >= self.failure_threshold:
+            self.opens += 1
+            delay = min(self.reset_timeout * 2 ** (self.opens - 1), self.max_reset_timeout)
+            self.state = self.OPEN
+            self.retry_at = (time.monotonic() if now is None else now) + delay
+        return self.state
+
+    def to_dict(self) -> dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_in": max(0.0, self.retry_at - time.monotonic()) if self.state != self.CLOSED else None,
+        }
+
+class CapabilityRegistry:
+    def __init__(self, **defaults):
+        """Knows which sources this machine can read, with a circuit breaker for each of them.
+
+        Args:
+        ---------
+            defaults: CircuitBreaker arguments every registered breaker gets, unless overridden.
+        """
+        self.defaults = defaults
+        self.breakers: Dict[str, CircuitBreaker] = {}
+
+    def register(self, key: str, **options) -> CircuitBreaker:
+        """Get the breaker of `key`, creating it with `options` on top of the defaults the first time."""
+        breaker = self.breakers.get(key)
+        if breaker is None:
+            breaker = self.breakers[key] = CircuitBreaker(**{**self.defaults, **options})
+        return breaker
+
+    def is_available(self, key: str) -> bool:
+        """Whether `key` can be read right now, unknown keys can."""
+        breaker = self.breakers.get(key)
+        return breaker is None or breaker.allow()
+
+    def unavailable(self) -> List[str]:
+        """The keys this machine doesn't seem to have."""
+        return [key for key, breaker in self.breakers.items() if breaker.state == CircuitBreaker.UNAVAILABLE]
+
+    def to_dict(self) -> Dict[str, dict]:
+        return {key: breaker.to_dict() for key, breaker in list(self.breakers.items())}
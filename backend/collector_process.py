@@ -0,0 +1,318 @@
+import time, multiprocessing
+
+from typing import Callable, Dict, List, Optional
+
+from .logger import Logger
+from .objects import Snapshot
+from .snapshot_ring import SnapshotRing
+
+def create_pipeline(nyx_path: Optional[str] = None) -> tuple:
+    """Build everything sampling needs, without starting it.
+
+    Returns:
+    ----------
+    tuple:
+        The NyxBase, the Scheduler with every source added, the ThrottlePolicy and the Governor."""
+    # Imported here so the GUI process, which only needs the keys, never loads the sampling code
+    from .nyx_base import NyxBase
+    from .scheduler import Scheduler
+    from .throttle_policy import ThrottlePolicy
+    from .governor import Governor
+
+    nyx_base = NyxBase.create(nyx_path = nyx_path)
+    scheduler = Scheduler()
+    for source in nyx_base.get_metric_sources():
+        scheduler.add_source(source)
+    throttle_policy = ThrottlePolicy(scheduler, nyx_base.is_on_battery, nyx_base.get_idle_time)
+    scheduler.add_source(throttle_policy.get_metric_source())
+    governor = Governor(scheduler)
+    scheduler.add_source(governor.get_metric_source())
+    return nyx_base, scheduler, throttle_policy, governor
+
+def get_snapshot_keys() -> List[str]:
+    """Get every metric key the collector publishes, the layout of its SnapshotRing.
+
+    Only the classes are asked, nothing is created, so the GUI process never builds the pipeline."""
+    from .nyx_base import NyxBase
+    from .throttle_policy import ThrottlePolicy
+    from .governor import Governor
+
+    return [*NyxBase.platform().get_metric_keys(), *ThrottlePolicy.METRIC_KEYS, *Governor.METRIC_KEYS]
+
+def get_source_keys(scheduler) -> List[str]:
+    """Get every metric key the sources of `scheduler` publish."""
+    return [
+        f"{source.key}.{name}" if source.fields else source.key
+        for source in scheduler.sources.values()
+        for name in (source.fields or [None])
+    ]
+
+def run_collector(connection, ring_name: str, nyx_path: Optional[str]):
+    """The collector process: samples everything and writes the snapshots into the ring `ring_name`.
+
+    Tells the parent once it's ready, then serves its commands and beats the heartbeat
+    until told to stop or the parent goes away."""
+    logger = Logger()
+    nyx_base, scheduler, throttle_policy, governor = create_pipeline(nyx_path)
+    if nyx_base.inventory is not None:
+        scheduler.seed(nyx_base.inventory.cached())
+
+    ring = SnapshotRing.attach(ring_name)
+    missing_keys = set(get_source_keys(scheduler)).difference(ring.keys)
+    if missing_keys:
+        logger.warning(f"The snapshot ring has no room for {', '.join(sorted(missing_keys))}, they are dropped")
+    # The inventory values are there before the first sample
+    ring.write(scheduler.snapshot)
+    scheduler.add_listener(ring.write)
+    ring.beat()
+    connection.send(("ready", None))
+    scheduler.start()
+
+    try:
+        while scheduler.running:
+            ring.beat()
+            if not connection.poll(0.25):
+                continue
+
+            command, argument = connection.recv()
+            if command == "stop":
+                break
+            elif command == "set_visible":
+                throttle_policy.set_visible(argument)
+            elif command == "diagnostics":
+                connection.send(("diagnostics", (scheduler.diagnostics(), governor.report())))
+    except (EOFError, OSError, KeyboardInterrupt):
+        # The parent is gone
+        pass
+    finally:
+        scheduler.stop(timeout = 1)
+        nyx_base.close()
+        ring.close()
+        logger.debug("Stopped the collector process")
+
+class CollectorProcess:
+    def __init__(
+        self,
+        ring: SnapshotRing,
+        nyx_path: Optional[str] = None,
+        stall_timeout: float = 10.0,
+        start_timeout: float = 30.0,
+        restart_delay: float = 1.0,
+        diagnostics_interval: float = 1.0,
+    ):
+        """Runs the sampling pipeline in a worker process that writes its snapshots into `ring`.
+
+        It stands in for a Scheduler in the GUI process: listeners, subscriptions, `snapshot`,
+        `seed` and `diagnostics` work the same, and `governor_report` has the decisions of the
+        worker's Governor. Values only arrive when `poll` is called, which is meant to run on a
+        QTimer so callbacks run on the GUI thread. Only `poll` and `set_visible` talk to the
+        worker, the rest can be read from any thread. Nothing here ever waits on the worker. A worker that dies, or whose heartbeat stops for
+        `stall_timeout` seconds, is killed and started again while the last values stay shown.
+
+        Args:
+        ---------
+            ring (SnapshotRing): The ring the worker writes to, created with `get_snapshot_keys()`.
+                Polls further apart than the ring holds lose the older snapshots.
+            nyx_path (str): The Nyx folder, used by the worker for the cached inventory.
+            stall_timeout (float): Seconds without a heartbeat after which the worker is restarted.
+            start_timeout (float): Seconds a new worker gets to have its ring ready.
+            restart_delay (float): Seconds to wait before starting a worker again, doubled on every
+                restart that happens before the worker delivered a snapshot.
+            diagnostics_interval (float): Seconds between the diagnostics `poll` asks the worker for.
+        """
+        self.logger = Logger()
+        self.ring = ring
+        self.nyx_path = nyx_path
+        self.stall_timeout = stall_timeout
+        self.start_timeout = start_timeout
+        self.restart_delay = restart_delay
+        self.diagnostics_interval = diagnostics_interval
+        self.snapshot = Snapshot(0, 0.0, {}, frozenset())
+        self.restarts = 0
+        self.visible = True
+
+        self._context = multiprocessing.get_context("spawn")
+        self._process = None
+        self._connection = None
+        self._ready = False
+        self._read_sequence = ring.write_sequence
+        self._started_at = 0.0
+        self._restart_at: Optional[float] = None
+        self._delay = restart_delay
+        self._delivered = False
+        self._diagnostics: Dict[str, dict] = {}
+        self._governor_report: List[dict] = []
+        self._diagnostics_pending = False
+        self._diagnostics_due = 0.0
+        self._subscribers: Dict[str, List[Callable]] = {}
+        self._listeners: List[Callable] = []
+
+    def seed(self, values: dict):
+        """Make values known before the worker delivers any, see Scheduler.seed."""
+        self.snapshot = Snapshot(self.snapshot.sequence, time.time(), {**self.snapshot.values, **values}, frozenset())
+
+    def subscribe(self, key: str, callback: Callable):
+        """Call `callback(value)` from `poll` every time the metric `key` gets a new value."""
+        self._subscribers.setdefault(key, []).append(callback)
+
+    def add_listener(self, callback: Callable):
+        """Call `callback(snapshot)` from `poll` for every snapshot read from the worker."""
+        self._listeners.append(callback)
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def start(self):
+        if self._process is not None:
+            return
+
+        parent_connection, child_connection = self._context.Pipe()
+        self._process = self._context.Process(
+            target = run_collector,
+            args = (child_connection, self.ring.name, self.nyx_path),
+            name = "NyxCollector",
+            daemon = True,
+        )
+        self._process.start()
+        child_connection.close()
+        self._connection = parent_connection
+        self._started_at = time.monotonic()
+        self._restart_at = None
+        self._ready = False
+        self._diagnostics_pending = False
+        self._diagnostics_due = 0.0
+        self.logger.debug(f"Started the collector process (pid {self._process.pid})")
+
+    def stop(self, timeout: Optional[float] = None):
+        """Ask the worker to stop and wait for it, killing it if it doesn't within `timeout`."""
+        process, connection = self._process, self._connection
+        self._process = self._connection = None
+        self._restart_at = None
+
+        if connection is not None:
+            try:
+                connection.send(("stop", None))
+            except (OSError, ValueError):
+                pass
+        if process is not None:
+            process.join(timeout)
+            if process.is_alive():
+                process.kill()
+                process.join(1)
+        if connection is not None:
+            connection.close()
+
+    def restart(self, reason: str):
+        self.logger.warning(f"Restarting the collector process: {reason}")
+        self.stop(timeout = 0)
+        self.restarts += 1
+        # Workers that die before delivering anything get started less and less often
+        self._delay = self.restart_delay if self._delivered else min(self._delay * 2, 60.0)
+        self._delivered = False
+        self._restart_at = time.monotonic() + self._delay
+
+    def set_visible(self, visible: bool):
+        """Tell the worker's throttle policy whether the window is shown."""
+        self.visible = visible
+        self._send("set_visible", visible)
+
+    def diagnostics(self) -> Dict[str, dict]:
+        """Get the latest diagnostics of the worker's sources, see Scheduler.diagnostics.
+
+        They are the ones `poll` last received, so they can be read from any thread, e.g. the metrics server's."""
+        return self._diagnostics
+
+    def governor_report(self) -> List[dict]:
+        """Get the latest decisions of the worker's governor, see Governor.report.
+
+        They arrive with the diagnostics, and are as old as those."""
+        return self._governor_report
+
+    def poll(self) -> int:
+        """Read what the worker published since the last call and hand it to listeners and subscribers.
+
+        Also restarts the worker if it died or stalled. Never blocks.
+
+        Returns:
+        ----------
+        int:
+            The number of snapshots read."""
+        if self._process is None:
+            if self._restart_at is not None and time.monotonic() >= self._restart_at:
+                self.start()
+            return 0
+
+        self._receive()
+
+        if not self._ready:
+            if not self._process.is_alive():
+                self.restart(f"it exited with code {self._process.exitcode} while starting")
+            elif time.monotonic() - self._started_at > self.start_timeout:
+                self.restart(f"it wasn't ready after {self.start_timeout:.0f}s")
+            return 0
+
+        # The worker's pipe isn't thread safe, diagnostics are only ever asked for from here
+        if not self._diagnostics_pending and time.monotonic() >= self._diagnostics_due and self._send("diagnostics", None):
+            self._diagnostics_pending = True
+            self._diagnostics_due = time.monotonic() + self.diagnostics_interval
+
+        snapshots = self.ring.read(self._read_sequence)
+        if snapshots:
+            self._read_sequence = snapshots[-1][0]
+            self._delivered = True
+            values = dict(self.snapshot.values)
+            updated = set()
+            for _, snapshot in snapshots:
+                values.update(snapshot.values)
+                updated.update(snapshot.updated)
+            self._publish(Snapshot(self.snapshot.sequence + 1, snapshots[-1][1].timestamp, values, frozenset(updated)))
+
+        if not self._process.is_alive():
+            self.restart(f"it exited with code {self._process.exitcode}")
+        elif time.time() - self.ring.heartbeat > self.stall_timeout:
+            self.restart(f"no heartbeat for {self.stall_timeout:.0f}s")
+
+        return len(snapshots)
+
+    def _send(self, command: str, argument) -> bool:
+        if self._connection is None:
+            return False
+        try:
+            self._connection.send((command, argument))
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def _receive(self):
+        try:
+            while self._connection is not None and self._connection.poll():
+                message, argument = self._connection.recv()
+                if message == "ready":
+                    self._ready = True
+                    # A new worker starts out with the window shown
+                    if not self.visible:
+                        self._send("set_visible", False)
+                elif message == "diagnostics":
+                    self._diagnostics, self._governor_report = argument
+                    self._diagnostics_pending = False
+        except (EOFError, OSError):
+            # The worker is gone, `poll` notices it's not alive
+            pass
+
+    def _publish(self, snapshot: Snapshot):
+        self.snapshot = snapshot
+
+        for listener in self._listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                self.logger.error(f"An error occurred while publishing snapshot {snapshot.sequence}: {e}")
+
+        for key in snapshot.updated:
+            value = snapshot.values[key]
+            for callback in self._subscribers.get(key, ()):
+                try:
+                    callback(value)
+                except Exception as e:
+                    self.logger.error(f"An error occurred while publishing {key}: {e}")
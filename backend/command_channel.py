@@ -0,0 +1,172 @@
+import time, queue, threading, subprocess
+
+from uuid import uuid4
+from typing import List, Optional
+
+from .logger import Logger
+from .instrumentation import record_spawn, record_child_cpu_time, process_cpu_time
+
+class CommandChannel:
+    def __init__(
+        self,
+        command: List[str],
+        timeout: float = 5.0,
+        echo: str = "echo {marker}",
+    ):
+        """Keeps one shell process alive and runs queries through its stdin.
+
+        Every query is followed by an echo of a unique marker, the reply is everything the
+        shell prints before that marker. A query that misses its deadline kills the shell,
+        the next query starts a fresh one. The CPU time the shell spends answering a query is
+        counted against the source being read.
+
+        Args:
+        ---------
+            command (list): The shell to start, e.g. `["powershell.exe", "-Command", "-"]` or `["sh"]`.
+            timeout (float): The default deadline of a query in seconds, waiting for the channel included.
+            echo (str): The shell command that prints `{marker}` on its own line.
+        """
+        self.logger = Logger()
+        self.command = command
+        self.timeout = timeout
+        self.echo = echo
+        self.process: Optional[subprocess.Popen] = None
+        # The shell as psutil sees it, for its CPU time
+        self.shell = None
+        self.spawns = 0
+        self.queries = 0
+        self.timeouts = 0
+
+        self._lock = threading.Lock()
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def start(self):
+        """Start the shell process and the thread reading its output."""
+        self._lines = queue.Queue()
+        self.process = subprocess.Popen(
+            self.command,
+            stdin = subprocess.PIPE,
+            stdout = subprocess.PIPE,
+            stderr = subprocess.DEVNULL,
+            text = True,
+            errors = "replace",
+            bufsize = 1,
+            # Don't flash a console window for every shell on Windows
+            creationflags = getattr(subprocess, "CREATE_NO_WINDOW", 0),
+        )
+        self.spawns += 1
+        record_spawn()
+        self.shell = self._watch(self.process.pid)
+
+        reader = threading.Thread(
+            target = self._read_lines,
+            args = (self.process, self._lines),
+            name = f"NyxChannel-{self.command[0]}",
+            daemon = True,
+        )
+        reader.start()
+        self.logger.debug(f"Started command channel {self.command[0]} (pid {self.process.pid})")
+
+    def close(self):
+        """Stop the shell process."""
+        with self._lock:
+            self._kill()
+
+    def query(self, command: str, timeout: Optional[float] = None) -> str:
+        """Run a command in the shell and get what it printed.
+
+        Parameters:
+        ----------
+        command: str
+            A single line command for the shell.
+        timeout: float
+            The deadline in seconds, the channel's default if not given.
+
+        Returns:
+        ----------
+        str:
+            The output of the command, stripped.
+
+        Raises:
+        ----------
+        TimeoutError:
+            If the reply didn't arrive before the deadline, the shell is restarted.
+        RuntimeError:
+            If the shell exited while answering."""
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+
+        if not self._lock.acquire(timeout = max(0, deadline - time.monotonic())):
+            self.timeouts += 1
+            raise TimeoutError(f"Command channel {self.command[0]} was busy for the whole deadline")
+
+        try:
+            if not self.alive:
+                self.start()
+
+            shell = self.shell
+            cpu_time = process_cpu_time(shell)
+            try:
+                return self._run(command, deadline)
+            finally:
+                # Nothing is charged for a shell that was killed, it can't be asked anymore
+                used = process_cpu_time(shell)
+                if cpu_time is not None and used is not None:
+                    record_child_cpu_time(used - cpu_time)
+        finally:
+            self._lock.release()
+
+    def _run(self, command: str, deadline: float) -> str:
+        marker = f"NYX_{uuid4().hex}"
+        lines = self._lines
+        try:
+            self.process.stdin.write(f"{command}\n{self.echo.format(marker = marker)}\n") # type: ignore
+            self.process.stdin.flush() # type: ignore
+        except OSError as e:
+            self._kill()
+            raise RuntimeError(f"Command channel {self.command[0]} is gone: {e}")
+
+        self.queries += 1
+        output = []
+        while True:
+            try:
+                line = lines.get(timeout = max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                self.timeouts += 1
+                self._kill()
+                raise TimeoutError(f"'{command}' did not answer in time, restarting {self.command[0]}")
+
+            if line is None:
+                self._kill()
+                raise RuntimeError(f"Command channel {self.command[0]} exited while running '{command}'")
+            if line.strip() == marker:
+                return "".join(output).strip()
+            output.append(line)
+
+    def _watch(self, pid: int):
+        try:
+            import psutil
+            return psutil.Process(pid)
+        except Exception as e:
+            self.logger.debug(f"Can't measure the CPU time of command channel {self.command[0]}: {e}")
+            return None
+
+    def _kill(self):
+        if self.process is None:
+            return
+        try:
+            self.process.kill()
+            self.process.wait(timeout = 1)
+        except Exception as e:
+            self.logger.error(f"An error occurred while stopping command channel {self.command[0]}: {e}")
+        self.process = None
+        self.shell = None
+
+    def _read_lines(self, process: subprocess.Popen, lines: queue.Queue):
+        # Every process gets its own queue, lines of a killed shell can't leak into the next one
+        for line in process.stdout: # type: ignore
+            lines.put(line)
+        lines.put(None)
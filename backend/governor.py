@@ -0,0 +1,180 @@
+from typing import Dict, List
+
+from .logger import Logger
+from .scheduler import Scheduler, MetricSource
+
+class GovernorDecision:
+    def __init__(
+        self,
+        key: str,
+        wall_time: float,
+        cpu_time: float,
+        volatility: float,
+        scale: float,
+        interval: float,
+        cost: float,
+        reason: str,
+    ):
+        """What the governor decided for a source and why.
+
+        Args:
+        ---------
+            key (str): The source key.
+            wall_time (float): The smoothed wall time of a reading in seconds.
+            cpu_time (float): The smoothed CPU time of a reading in seconds.
+            volatility (float): The smoothed relative change of the values per reading.
+            scale (float): The multiplier the source interval is sampled with.
+            interval (float): The resulting interval in milliseconds, before throttling.
+            cost (float): The share of one core the source costs at that interval.
+            reason (str): Why the source got its scale.
+        """
+        self.key = key
+        self.wall_time = wall_time
+        self.cpu_time = cpu_time
+        self.volatility = volatility
+        self.scale = scale
+        self.interval = interval
+        self.cost = cost
+        self.reason = reason
+
+    def to_dict(self) -> dict:
+        return dict(self.__dict__)
+
+    def __str__(self):
+        return f"GovernorDecision: {self.key} | Interval: {self.interval:.0f}ms (x{self.scale:.2f}) | Cost: {self.cost * 100:.3f}% | Volatility: {self.volatility:.4f} | {self.reason}"
+
+class Governor:
+    # What the source of `get_metric_source` publishes
+    METRIC_KEYS = ("governor.overhead", "governor.budget")
+    # Sources that keep sampling in check themselves, slowing them down would slow down their reactions
+    UNGOVERNED = frozenset({"governor", "throttle"})
+
+    def __init__(
+        self,
+        scheduler: Scheduler,
+        budget: float = 0.005,
+        min_scale: float = 0.5,
+        max_scale: float = 16.0,
+        flat_volatility: float = 0.005,
+        volatile_volatility: float = 0.05,
+        interval: int = 10000,
+    ):
+        """Keeps the total cost of sampling under a budget by adapting the interval of every source.
+
+        The cost of a reading is its CPU time and the CPU time of the shells that answered it,
+        what the machine actually pays for it: waiting on a shell or a driver only takes wall
+        time, and charging it would slow down the sources that wait the most, like CPU usage,
+        up to `max_scale`. Sources whose values barely move are sampled less often and sources
+        that change a lot more often. The budget is shared by those weights, and sources that
+        don't fit their share are slowed down until they do, up to `max_scale`.
+
+        Args:
+        ---------
+            scheduler (Scheduler): The scheduler whose sources are governed.
+            budget (float): The allowed share of one core, 0.005 is 0.5%.
+            min_scale (float): The fastest a source gets, as a multiple of its declared interval.
+            max_scale (float): The slowest a source gets, as a multiple of its declared interval.
+            flat_volatility (float): Sources changing less than this per reading count as flat.
+            volatile_volatility (float): Sources changing more than this per reading count as volatile.
+            interval (int): How often the governor decides in milliseconds.
+        """
+        self.logger = Logger()
+        self.scheduler = scheduler
+        self.budget = budget
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.flat_volatility = flat_volatility
+        self.volatile_volatility = volatile_volatility
+        self.interval = interval
+
+        self.decisions: Dict[str, GovernorDecision] = {}
+        self.overhead = 0.0
+
+    def get_metric_source(self) -> MetricSource:
+        """Get the source that runs the governor, to register on the scheduler."""
+        return MetricSource("governor", self.update, self.interval, fields = {
+            "overhead": lambda overhead: round(overhead * 100, 3),
+            "budget": lambda _: round(self.budget * 100, 3),
+        })
+
+    def governed_sources(self) -> List[MetricSource]:
+        # One-off sources cost nothing over time, and the governor and the throttle policy aren't governed
+        return [
+            source for source in list(self.scheduler.sources.values())
+            if source.interval > 0 and source.key not in self.UNGOVERNED and source.calls > 0
+        ]
+
+    def update(self) -> float:
+        """Decide the interval of every source from its measured cost and volatility.
+
+        Returns:
+        ----------
+        float:
+            The expected share of one core all governed sources cost, throttling not included."""
+        sources = self.governed_sources()
+        # key: (source, scale, reason, weight), volatile sources get a bigger share of the budget
+        preferred = {}
+
+        for source in sources:
+            if source.volatility < self.flat_volatility:
+                preferred[source.key] = (source, 2.0, "flat", 0.5)
+            elif source.volatility > self.volatile_volatility:
+                preferred[source.key] = (source, self.min_scale, "volatile", 2.0)
+            else:
+                preferred[source.key] = (source, 1.0, "steady", 1.0)
+
+        def cost_of(source: MetricSource, scale: float) -> float:
+            return source.cpu_time / (source.interval * scale / 1000)
+
+        # Share the budget by weight, sources that fit their share keep their preferred interval
+        # and leave the rest of it to the others, until every remaining source is over its share
+        decisions = {}
+        remaining = self.budget
+        while preferred:
+            total_weight = sum(item[3] for item in preferred.values())
+            fitting = {
+                key: item for key, item in preferred.items()
+                if cost_of(item[0], item[1]) <= remaining * item[3] / total_weight
+            }
+            if not fitting:
+                break
+
+            for key, (source, scale, reason, _) in fitting.items():
+                decisions[key] = (source, scale, reason)
+                remaining -= cost_of(source, scale)
+                del preferred[key]
+
+        # The rest are slowed down to cost exactly their share
+        total_weight = sum(item[3] for item in preferred.values())
+        for key, (source, scale, reason, weight) in preferred.items():
+            share = max(remaining, 0) * weight / total_weight
+            scale = min(max(scale, cost_of(source, 1.0) / share if share else self.max_scale), self.max_scale)
+            decisions[key] = (source, scale, f"{reason}, over budget")
+
+        self.overhead = 0.0
+        for key in set(self.decisions) - set(decisions):
+            del self.decisions[key]
+        for key, (source, scale, reason) in decisions.items():
+            cost = cost_of(source, scale)
+            self.overhead += cost
+
+            previous = self.decisions.get(key)
+            if previous is None or abs(previous.scale - scale) > 0.01:
+                self.logger.debug(f"Governor: sampling {key} every {source.interval * scale:.0f}ms ({reason})")
+
+            source.scale = scale
+            self.decisions[key] = GovernorDecision(
+                key, source.wall_time, source.cpu_time, source.volatility,
+                scale, source.interval * scale, cost, reason,
+            )
+
+        return self.overhead
+
+    def report(self) -> List[dict]:
+        """Get the latest decision for every source, most expensive first.
+
+        Returns:
+        ----------
+        list:
+            A list of dictionaries with the fields of GovernorDecision."""
+        return [decision.to_dict() for decision in sorted(self.decisions.values(), key = lambda decision: -decision.cost)]
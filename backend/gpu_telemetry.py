@@ -0,0 +1,128 @@
+import time, threading
+
+from typing import List
+
+from .logger import Logger
+from .objects import GPU
+
+class GPUTelemetry:
+    def __init__(self, nvml = None, max_age: float = 0.2):
+        """Keeps one NVML session open and reads every GPU field in one go.
+
+        Args:
+        ---------
+            nvml: The NVML module to use, `pynvml` by default. Pass the `FakeNVML` of the benchmarks to run without a GPU.
+            max_age (float): How long in seconds a reading is shared between callers before NVML is queried again.
+        """
+        self.logger = Logger()
+        self.nvml = nvml
+        self.max_age = max_age
+        self.handles = []
+        self.names: List[str] = []
+        self.started = False
+        self.available = False
+
+        self._lock = threading.Lock()
+        self._readings: List[GPU] = []
+        self._read_at = 0.0
+
+    def start(self) -> bool:
+        """Open the NVML session and look up the device handles.
+
+        A session that failed to open isn't started, so the next call tries again, e.g. once the
+        driver is installed. The scheduler's circuit breaker keeps that from happening on every read.
+
+        Returns:
+        ----------
+        bool:
+            Whether at least one GPU is available."""
+        with self._lock:
+            if self.started:
+                return self.available
+
+            try:
+                if self.nvml is None:
+                    import pynvml
+                    self.nvml = pynvml
+
+                self.nvml.nvmlInit()
+                self.handles = [
+                    self.nvml.nvmlDeviceGetHandleByIndex(index)
+                    for index in range(self.nvml.nvmlDeviceGetCount())
+                ]
+                self.names = [self._decode(self.nvml.nvmlDeviceGetName(handle)) for handle in self.handles]
+                self.available = len(self.handles) > 0
+                self.started = True
+                self.logger.debug(f"Opened NVML session with {len(self.handles)} GPU(s): {', '.join(self.names)}")
+            except Exception as e:
+                self.logger.error(f"An error occurred while opening the NVML session: {e}")
+                self.handles = []
+                self.names = []
+                self.available = False
+
+            return self.available
+
+    def stop(self):
+        """Close the NVML session."""
+        with self._lock:
+            if self.available:
+                try:
+                    self.nvml.nvmlShutdown() # type: ignore
+                except Exception as e:
+                    self.logger.error(f"An error occurred while closing the NVML session: {e}")
+            self.started = False
+            self.available = False
+            self.handles = []
+            self._readings = []
+
+    def read(self, index: int = 0) -> GPU:
+        """Get every field of a GPU, querying NVML at most once every `max_age` seconds.
+
+        Parameters:
+        ----------
+        index: int
+            The index of the GPU.
+
+        Returns:
+        ----------
+        GPU:
+            GPU object containing name, temperature, usage, clock, VRAM clock and fan speed."""
+        if not self.started:
+            self.start()
+
+        with self._lock:
+            if not self.available:
+                raise RuntimeError("No NVML session is available")
+
+            now = time.monotonic()
+            if not self._readings or now - self._read_at >= self.max_age:
+                self._readings = [self._read_device(handle, name) for handle, name in zip(self.handles, self.names)]
+                self._read_at = now
+
+            return self._readings[index]
+
+    def read_all(self) -> List[GPU]:
+        """Get every field of every GPU, sharing the reading with `read`."""
+        if not self.started:
+            self.start()
+        return [self.read(index) for index in range(len(self.handles))]
+
+    def _read_device(self, handle, name: str) -> GPU:
+        nvml = self.nvml
+        try:
+            fan_speed = nvml.nvmlDeviceGetFanSpeed(handle) # type: ignore
+        except Exception:
+            # Laptops and passively cooled cards don't report a fan
+            fan_speed = None
+
+        return GPU(
+            name = name,
+            temperature = nvml.nvmlDeviceGetTemperature(handle, nvml.NVML_TEMPERATURE_GPU), # type: ignore
+            usage = float(nvml.nvmlDeviceGetUtilizationRates(handle).gpu), # type: ignore
+            clock = nvml.nvmlDeviceGetClockInfo(handle, nvml.NVML_CLOCK_GRAPHICS), # type: ignore
+            memory_clock = nvml.nvmlDeviceGetClockInfo(handle, nvml.NVML_CLOCK_MEM), # type: ignore
+            fan_speed = fan_speed,
+        )
+
+    def _decode(self, name) -> str:
+        return name.decode() if isinstance(name, bytes) else name
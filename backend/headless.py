@@ -0,0 +1,153 @@
+import os, sys, json, time, argparse
+
+from typing import List, Optional, TextIO
+
+from .logger import Logger
+from .utils import Utils
+from .nyx_base import NyxBase
+from .scheduler import Scheduler
+from .tracer import tracer
+from .metrics_server import MetricsServer
+
+class HeadlessCollector:
+    # Seconds to wait for the first snapshot when no `duration` is given, shells can take a while to start
+    FIRST_SAMPLE_TIMEOUT = 30.0
+
+    def __init__(
+        self,
+        output: TextIO,
+        interval: float = 1.0,
+        keys: Optional[List[str]] = None,
+        nyx_path: Optional[str] = None,
+        metrics_port: Optional[int] = None,
+    ):
+        """Runs the sampling pipeline without a window and writes snapshots as JSON Lines.
+
+        Nothing in here imports PyQt5, so it runs on machines without a display.
+        Every line is one JSON object: `timestamp` (`time.time()`), `sequence` and `values`.
+
+        Args:
+        ---------
+            output (TextIO): Where the lines are written, flushed after every line.
+            interval (float): Seconds between lines, below a second source intervals shrink with it.
+            keys (list): The metric keys to write, everything if not given. Only the sources
+                these keys come from are sampled, a key no source publishes raises a ValueError.
+            nyx_path (str): The Nyx folder, used for the cached inventory.
+            metrics_port (int): Also serve the metrics in the OpenMetrics format on this port of localhost.
+        """
+        self.logger = Logger()
+        self.output = output
+        self.interval = interval
+        self.keys = keys
+        self.lines = 0
+
+        self.nyx_base = NyxBase.create(nyx_path = nyx_path)
+        self.scheduler = Scheduler()
+        for source in self.nyx_base.get_metric_sources():
+            self.scheduler.add_source(source)
+
+        allowed_sources = None
+        if keys:
+            # A key belongs to a source if it is the source key or the key of one of its fields
+            source_keys = {
+                source.key: {f"{source.key}.{name}" for name in source.fields} if source.fields else {source.key}
+                for source in self.scheduler.sources.values()
+            }
+            unknown_keys = set(keys).difference(*source_keys.values())
+            if unknown_keys:
+                self.nyx_base.close()
+                raise ValueError(f"Unknown metric keys: {', '.join(sorted(unknown_keys))}")
+            allowed_sources = frozenset(key for key, published in source_keys.items() if set(keys) & published)
+        # Lines faster than once a second get sources sampled faster too, so they don't just repeat values
+        self.scheduler.throttle(min(1.0, interval), allowed_sources)
+
+        if self.nyx_base.inventory is not None:
+            self.scheduler.seed(self.nyx_base.inventory.cached())
+
+        self.metrics_server = MetricsServer(self.scheduler, port = metrics_port) if metrics_port else None
+
+    def write(self, timestamp: float):
+        values = self.scheduler.snapshot.values
+        if self.keys:
+            values = {key: value for key, value in values.items() if key in self.keys}
+
+        line = json.dumps({
+            "timestamp": round(timestamp, 3),
+            "sequence": self.scheduler.snapshot.sequence,
+            "values": values,
+        }, separators = (",", ":"), default = str)
+        self.output.write(line + "\n")
+        self.output.flush()
+        self.lines += 1
+
+    def run(self, count: Optional[int] = None, duration: Optional[float] = None):
+        """Sample and write lines until `count` lines were written, `duration` seconds passed or Ctrl+C."""
+        start_time = time.monotonic()
+        self.scheduler.start()
+        if self.metrics_server is not None:
+            self.metrics_server.start()
+
+        try:
+            # The first line goes out as soon as the first snapshot is in, later ones on the grid
+            first_sample_deadline = start_time + min(duration if duration is not None else self.FIRST_SAMPLE_TIMEOUT, self.FIRST_SAMPLE_TIMEOUT)
+            while self.scheduler.snapshot.sequence == 0 and time.monotonic() < first_sample_deadline:
+                time.sleep(0.005)
+            if self.scheduler.snapshot.sequence == 0:
+                self.logger.warning(f"No sample after {time.monotonic() - start_time:.1f}s, writing what is known")
+            else:
+                self.logger.debug(f"First sample after {(time.monotonic() - start_time) * 1000:.0f}ms")
+                tracer.mark("first-real-value")
+
+            next_time = time.monotonic()
+            while True:
+                self.write(time.time())
+                if count is not None and self.lines >= count:
+                    break
+
+                next_time += self.interval
+                if duration is not None and next_time - start_time > duration:
+                    break
+                time.sleep(max(0, next_time - time.monotonic()))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if self.metrics_server is not None:
+                self.metrics_server.stop()
+            self.scheduler.stop(timeout = 1)
+            self.nyx_base.close()
+            tracer.export()
+
+def main(argv: List[str]) -> int:
+    """The `collect` command, e.g. `python main.py collect --interval 0.5 --output metrics.jsonl`.
+
+    Returns:
+    ----------
+    int:
+        The exit code."""
+    parser = argparse.ArgumentParser(prog = "nyx collect", description = "Stream Nyx metrics as JSON Lines without a window.")
+    parser.add_argument("--interval", type = float, default = 1.0, help = "seconds between lines (default: 1)")
+    parser.add_argument("--output", help = "the file to append the lines to (default: stdout)")
+    parser.add_argument("--keys", help = "comma separated metric keys to write, e.g. cpu.usage,gpu.temperature (default: all)")
+    parser.add_argument("--count", type = int, help = "stop after this many lines")
+    parser.add_argument("--duration", type = float, help = "stop after this many seconds")
+    parser.add_argument("--metrics-port", type = int, help = "also serve OpenMetrics at http://127.0.0.1:<port>/metrics")
+    arguments = parser.parse_args(argv)
+
+    # Stdout belongs to the data, logs go to stderr
+    Logger.file = sys.stderr
+
+    nyx_path = Utils().create_nyx_folders()[0] if os.getenv("APPDATA") else None
+    keys = [key.strip() for key in arguments.keys.split(",") if key.strip()] if arguments.keys else None
+    output = open(arguments.output, "a", encoding = "utf-8") if arguments.output else sys.stdout
+
+    try:
+        try:
+            collector = HeadlessCollector(output, max(arguments.interval, 0.05), keys, nyx_path, arguments.metrics_port)
+        except ValueError as e:
+            parser.error(str(e))
+        collector.run(arguments.count, arguments.duration)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    return 0
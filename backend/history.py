@@ -0,0 +1,117 @@
+import math, threading
+import numpy as np
+
+from typing import List, Optional, Tuple
+
+from .objects import Snapshot
+
+class HistoryStore:
+    def __init__(self, keys: List[str], retention: float = 3600, resolution: float = 1.0):
+        """Keeps the recent history of numeric metrics in preallocated ring buffers.
+
+        There is one float64 timestamp column and one float64 value column per metric,
+        holding one row per `resolution` seconds. Every row is written twice, `capacity`
+        rows apart, so the newest rows are always one contiguous slice and readers get
+        NumPy views instead of copies. Memory use is fixed by `retention` and never grows.
+
+        Args:
+        ---------
+            keys (list): The metric keys to keep, values of other keys are ignored.
+            retention (float): How many seconds of history to keep.
+            resolution (float): The width of a row in seconds, newer values in the same row replace older ones.
+        """
+        self.keys = list(keys)
+        self.columns = {key: index for index, key in enumerate(self.keys)}
+        self.resolution = resolution
+        self.capacity = int(math.ceil(retention / resolution))
+        self.count = 0
+
+        self.timestamps = np.full(2 * self.capacity, np.nan, dtype = np.float64)
+        # Column-major so the history of a single metric is contiguous
+        self.values = np.full((2 * self.capacity, len(self.keys)), np.nan, dtype = np.float64, order = "F")
+
+        self._lock = threading.Lock()
+        self._row = np.full(len(self.keys), np.nan, dtype = np.float64)
+        self._last_slot: Optional[int] = None
+
+    @property
+    def size(self) -> int:
+        """The number of rows currently held."""
+        return min(self.count, self.capacity)
+
+    @property
+    def nbytes(self) -> int:
+        """The memory held by the buffers in bytes."""
+        return self.timestamps.nbytes + self.values.nbytes
+
+    def append(self, timestamp: float, row: np.ndarray):
+        """Add a row holding a value for every key, in O(1)."""
+        with self._lock:
+            position = self.count % self.capacity
+            self.timestamps[position] = self.timestamps[position + self.capacity] = timestamp
+            self.values[position] = self.values[position + self.capacity] = row
+            self.count += 1
+
+    def record(self, snapshot: Snapshot):
+        """Add the values of a snapshot, meant to be registered as a scheduler listener."""
+        row = self._row
+        for key, index in self.columns.items():
+            value = snapshot.values.get(key)
+            row[index] = value if isinstance(value, (int, float)) else np.nan
+
+        slot = int(snapshot.timestamp // self.resolution)
+        if slot == self._last_slot:
+            # Still inside the newest row, replace it with the newer values
+            with self._lock:
+                position = (self.count - 1) % self.capacity
+                self.timestamps[position] = self.timestamps[position + self.capacity] = snapshot.timestamp
+                self.values[position] = self.values[position + self.capacity] = row
+            return
+
+        self._last_slot = slot
+        self.append(snapshot.timestamp, row)
+
+    def latest(self, key: str, count: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the newest rows of a metric without copying.
+
+        The views are overwritten as new rows come in, copy them to keep them around.
+
+        Parameters:
+        ----------
+        key: str
+            The metric key.
+        count: int
+            How many rows to get, every row that is held if not given.
+
+        Returns:
+        ----------
+        tuple:
+            Views of the timestamps and the values, oldest first."""
+        with self._lock:
+            count = self.size if count is None else min(count, self.size)
+            end = self.count % self.capacity + self.capacity
+            return self.timestamps[end - count:end], self.values[end - count:end, self.columns[key]]
+
+    def rows(self, start: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Get every row from `start` (a `time.time()` timestamp) on, with a column per key, without copying.
+
+        Returns:
+        ----------
+        tuple:
+            Views of the timestamps and of the values (one column per key in `keys`), oldest first."""
+        with self._lock:
+            end = self.count % self.capacity + self.capacity
+            timestamps = self.timestamps[end - self.size:end]
+            first = end - self.size + int(np.searchsorted(timestamps, start, side = "left"))
+            return self.timestamps[first:end], self.values[first:end]
+
+    def since(self, key: str, start: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the rows of a metric from `start` (a `time.time()` timestamp) on, without copying.
+
+        Returns:
+        ----------
+        tuple:
+            Views of the timestamps and the values, oldest first."""
+        timestamps, values = self.latest(key)
+        first = int(np.searchsorted(timestamps, start, side = "left"))
+        return timestamps[first:], values[first:]
@@ -0,0 +1,342 @@
+import os, json, mmap, time, struct, hashlib, threading
+import numpy as np
+
+from typing import Dict, List, Optional, Tuple
+
+from .logger import Logger
+from .history import HistoryStore
+
+class ArchiveTier:
+    def __init__(
+        self,
+        name: str,
+        resolution: int,
+        segment_length: int,
+        retention: int,
+        fields: Tuple[str, ...],
+    ):
+        """A resolution the archive keeps history at.
+
+        Args:
+        ---------
+            name (str): The name of the tier and of its folder.
+            resolution (int): The width of a row in seconds.
+            segment_length (int): How many seconds of rows go into one segment file.
+            retention (int): How many seconds of segments to keep.
+            fields (tuple): The columns kept per metric, `value` for raw rows or `min`, `max` and `avg` for rollups.
+        """
+        self.name = name
+        self.resolution = resolution
+        self.segment_length = segment_length
+        self.retention = retention
+        self.fields = fields
+
+    def __str__(self):
+        return f"ArchiveTier: {self.name} | Resolution: {self.resolution}s | Segment: {self.segment_length}s | Retention: {self.retention}s"
+
+class Segment:
+    MAGIC = b"NYXH"
+    VERSION = 1
+    # Magic, version and the length of the JSON header that follows
+    PREFIX = struct.Struct("<4sHI")
+
+    def __init__(self, path: str, keys: List[str], fields: Tuple[str, ...]):
+        """An append-only file of fixed-width float64 rows.
+
+        A row is a timestamp followed by one column per field per key, a trailing partial
+        row left behind by a crash is ignored when reading and cut off when appending.
+
+        Args:
+        ---------
+            path (str): The path of the segment file.
+            keys (list): The metric keys of the columns.
+            fields (tuple): The fields of every key.
+        """
+        self.path = path
+        self.keys = keys
+        self.fields = fields
+        self.width = 1 + len(keys) * len(fields)
+        self.header_length = 0
+
+    @classmethod
+    def open(cls, path: str) -> "Segment":
+        """Open an existing segment and read its header."""
+        with open(path, "rb") as file:
+            magic, version, length = cls.PREFIX.unpack(file.read(cls.PREFIX.size))
+            if magic != cls.MAGIC or version != cls.VERSION:
+                raise ValueError(f"{path} is not a version {cls.VERSION} Nyx segment")
+            header = json.loads(file.read(length))
+
+        segment = cls(path, header["keys"], tuple(header["fields"]))
+        segment.header_length = cls.PREFIX.size + length
+        return segment
+
+    def create(self):
+        """Write the header of a new segment."""
+        header = json.dumps({"keys": self.keys, "fields": self.fields}).encode()
+        # Pad the header so the rows are aligned to 8 bytes
+        header += b" " * (-(self.PREFIX.size + len(header)) % 8)
+        with open(self.path, "wb") as file:
+            file.write(self.PREFIX.pack(self.MAGIC, self.VERSION, len(header)))
+            file.write(header)
+        self.header_length = self.PREFIX.size + len(header)
+
+    def column(self, key: str, field: str) -> Optional[int]:
+        """Get the index of a column in a row, None if the segment doesn't have it."""
+        if key not in self.keys or field not in self.fields:
+            return None
+        return 1 + self.keys.index(key) * len(self.fields) + self.fields.index(field)
+
+    def read(self) -> np.ndarray:
+        """Read every complete row through a memory map.
+
+        Returns:
+        ----------
+        np.ndarray:
+            A (rows, width) array, copied out of the map so the file isn't held open."""
+        row_bytes = self.width * 8
+        with open(self.path, "rb") as file:
+            size = os.fstat(file.fileno()).st_size
+            rows = (size - self.header_length) // row_bytes
+            if rows <= 0:
+                return np.empty((0, self.width), dtype = np.float64)
+
+            with mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ) as mapped:
+                data = np.frombuffer(mapped, dtype = np.float64, count = rows * self.width, offset = self.header_length)
+                copy = data.reshape(rows, self.width).copy()
+                # Drop the view before the map is closed
+                del data
+                return copy
+
+    def append(self, rows: np.ndarray):
+        """Append complete rows and make sure they reach the disk."""
+        row_bytes = self.width * 8
+        with open(self.path, "r+b") as file:
+            size = os.fstat(file.fileno()).st_size
+            # Cut off a partial row a crash may have left behind
+            end = self.header_length + (size - self.header_length) // row_bytes * row_bytes
+            if end != size:
+                file.truncate(end)
+            file.seek(end)
+            file.write(np.ascontiguousarray(rows, dtype = np.float64).tobytes())
+            file.flush()
+            os.fsync(file.fileno())
+
+class HistoryArchive:
+    TIERS = [
+        ArchiveTier("raw", 1, 3600, 2 * 86400, ("value",)),
+        ArchiveTier("1m", 60, 86400, 30 * 86400, ("min", "max", "avg")),
+        ArchiveTier("1h", 3600, 30 * 86400, 365 * 86400, ("min", "max", "avg")),
+    ]
+
+    def __init__(self, folder_path: str, store: HistoryStore, flush_interval: float = 10.0):
+        """Records the in-memory history to disk and keeps downsampled tiers of it.
+
+        A background thread copies the rows the HistoryStore has finished into segment
+        files of the raw tier every `flush_interval` seconds, rolls finished buckets up
+        into the coarser tiers and deletes segments past their retention. Nothing runs on
+        the sampling path.
+
+        Args:
+        ---------
+            folder_path (str): The folder the tiers are kept in, e.g. `Nyx/History`.
+            store (HistoryStore): The in-memory history to record.
+            flush_interval (float): How often in seconds rows are written.
+        """
+        self.logger = Logger()
+        self.folder_path = folder_path
+        self.store = store
+        self.keys = list(store.keys)
+        # Part of the segment names, a different set of metrics starts new segments
+        self.keys_id = hashlib.sha1(",".join(self.keys).encode()).hexdigest()[:8]
+        self.flush_interval = flush_interval
+        self.tiers: Dict[str, ArchiveTier] = {tier.name: tier for tier in self.TIERS}
+        self.last_timestamps: Dict[str, float] = {}
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        for tier in self.TIERS:
+            os.makedirs(os.path.join(self.folder_path, tier.name), exist_ok = True)
+            self.last_timestamps[tier.name] = self._find_last_timestamp(tier)
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target = self._run, name = "NyxArchive", daemon = True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread after writing what is left, the newest row included."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush(final = True)
+
+    def flush(self, final: bool = False):
+        """Write the finished rows, roll up finished buckets and apply retention."""
+        with self._lock:
+            try:
+                self._write_raw(final)
+                for source, target in zip(self.TIERS, self.TIERS[1:]):
+                    self._rollup(source, target)
+                for tier in self.TIERS:
+                    self._apply_retention(tier)
+            except Exception as e:
+                self.logger.error(f"An error occurred while writing the history archive: {e}")
+
+    def segments(self, tier: ArchiveTier, start: float = 0, end: float = float("inf")) -> List[str]:
+        """Get the segment files of a tier that may hold rows between `start` and `end`, oldest first."""
+        folder = os.path.join(self.folder_path, tier.name)
+        paths = []
+        for name in os.listdir(folder):
+            if not name.endswith(".nyx"):
+                continue
+            segment_start = int(name.split("_")[0])
+            if segment_start + tier.segment_length > start and segment_start <= end:
+                paths.append((segment_start, os.path.join(folder, name)))
+        return [path for _, path in sorted(paths)]
+
+    def read(self, tier_name: str, key: str, start: float = 0, end: float = float("inf")) -> Dict[str, np.ndarray]:
+        """Read the rows of a metric from one tier.
+
+        Parameters:
+        ----------
+        tier_name: str
+            The name of the tier, `raw`, `1m` or `1h`.
+        key: str
+            The metric key.
+        start: float
+            The first timestamp to include.
+        end: float
+            The timestamp to stop before.
+
+        Returns:
+        ----------
+        dict:
+            `timestamp` and every field of the tier mapped to arrays, oldest first."""
+        tier = self.tiers[tier_name]
+        columns = {name: [] for name in ("timestamp",) + tier.fields}
+
+        for path in self.segments(tier, start, end):
+            try:
+                segment = Segment.open(path)
+                rows = segment.read()
+            except Exception as e:
+                self.logger.error(f"An error occurred while reading {path}: {e}")
+                continue
+
+            rows = rows[(rows[:, 0] >= start) & (rows[:, 0] < end)]
+            columns["timestamp"].append(rows[:, 0])
+            for field in tier.fields:
+                index = segment.column(key, field)
+                columns[field].append(rows[:, index] if index is not None else np.full(len(rows), np.nan))
+
+        return {
+            name: np.concatenate(parts) if parts else np.empty(0, dtype = np.float64)
+            for name, parts in columns.items()
+        }
+
+    def _run(self):
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+
+    def _write_raw(self, final: bool):
+        tier = self.TIERS[0]
+        timestamps, values = self.store.rows(self.last_timestamps[tier.name] + 1e-6)
+        if not final:
+            # The newest row may still be replaced by the store, leave it for the next flush
+            timestamps, values = timestamps[:-1], values[:-1]
+        if len(timestamps) == 0:
+            return
+
+        self._append(tier, np.column_stack((timestamps, values)))
+
+    def _rollup(self, source: ArchiveTier, target: ArchiveTier):
+        # Only buckets whose source rows have all been written are finished
+        until = (self.last_timestamps[source.name] + source.resolution) // target.resolution * target.resolution
+        start = self.last_timestamps[target.name] + target.resolution
+        if until <= start:
+            return
+
+        rows = np.concatenate([
+            self._read_rows(path, source) for path in self.segments(source, start, until)
+        ] or [np.empty((0, 1 + len(self.keys) * len(source.fields)))])
+        rows = rows[(rows[:, 0] >= start) & (rows[:, 0] < until)]
+        if len(rows) == 0:
+            return
+
+        buckets = rows[:, 0] // target.resolution * target.resolution
+        starts = np.flatnonzero(np.diff(buckets, prepend = -1))
+        width = len(source.fields)
+
+        if source.fields == ("value",):
+            minimums = maximums = averages = rows[:, 1:]
+        else:
+            minimums = rows[:, 1 + source.fields.index("min")::width]
+            maximums = rows[:, 1 + source.fields.index("max")::width]
+            averages = rows[:, 1 + source.fields.index("avg")::width]
+
+        present = ~np.isnan(averages)
+        counts = np.add.reduceat(present, starts, axis = 0)
+        with np.errstate(invalid = "ignore", divide = "ignore"):
+            average = np.add.reduceat(np.where(present, averages, 0), starts, axis = 0) / counts
+
+        # Interleave min, max and avg per key to match the column layout of the target
+        rollup = np.empty((len(starts), 1 + len(self.keys) * 3), dtype = np.float64)
+        rollup[:, 0] = buckets[starts]
+        rollup[:, 1::3] = np.fmin.reduceat(minimums, starts, axis = 0)
+        rollup[:, 2::3] = np.fmax.reduceat(maximums, starts, axis = 0)
+        rollup[:, 3::3] = average
+        self._append(target, rollup)
+
+    def _append(self, tier: ArchiveTier, rows: np.ndarray):
+        segment_starts = rows[:, 0] // tier.segment_length * tier.segment_length
+        for segment_start in np.unique(segment_starts):
+            segment = self._segment_for(tier, int(segment_start))
+            segment.append(rows[segment_starts == segment_start])
+        self.last_timestamps[tier.name] = float(rows[-1, 0])
+
+    def _segment_for(self, tier: ArchiveTier, segment_start: int) -> Segment:
+        path = os.path.join(self.folder_path, tier.name, f"{segment_start}_{self.keys_id}.nyx")
+        if os.path.exists(path):
+            return Segment.open(path)
+        segment = Segment(path, self.keys, tier.fields)
+        segment.create()
+        return segment
+
+    def _read_rows(self, path: str, tier: ArchiveTier) -> np.ndarray:
+        segment = Segment.open(path)
+        rows = segment.read()
+        if segment.keys == self.keys:
+            return rows
+
+        # Written with another set of metrics, line its columns up with ours
+        aligned = np.full((len(rows), 1 + len(self.keys) * len(tier.fields)), np.nan)
+        aligned[:, 0] = rows[:, 0]
+        for key_index, key in enumerate(self.keys):
+            for field_index, field in enumerate(tier.fields):
+                column = segment.column(key, field)
+                if column is not None:
+                    aligned[:, 1 + key_index * len(tier.fields) + field_index] = rows[:, column]
+        return aligned
+
+    def _apply_retention(self, tier: ArchiveTier):
+        oldest = time.time() - tier.retention
+        for path in self.segments(tier, 0, oldest - tier.segment_length):
+            segment_start = int(os.path.basename(path).split("_")[0])
+            if segment_start + tier.segment_length < oldest:
+                os.remove(path)
+                self.logger.debug(f"Removed expired history segment {path}")
+
+    def _find_last_timestamp(self, tier: ArchiveTier) -> float:
+        for path in reversed(self.segments(tier)):
+            try:
+                rows = Segment.open(path).read()
+            except Exception as e:
+                self.logger.error(f"An error occurred while reading {path}: {e}")
+                continue
+            if len(rows):
+                return float(rows[-1, 0])
+        return 0.0
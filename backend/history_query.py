@@ -0,0 +1,151 @@
+import math, time
+import numpy as np
+
+from typing import Dict, Optional
+
+from .history import HistoryStore
+from .history_archive import HistoryArchive
+
+class HistoryQuery:
+    PERCENTILES = (50, 95, 99)
+
+    def __init__(self, store: HistoryStore, archive: Optional[HistoryArchive] = None):
+        """Answers windowed aggregate questions about the metric history.
+
+        Every query reads from the coarsest place that still has the requested resolution:
+        the in-memory store, or one of the archive tiers. Aggregates are computed with
+        NumPy over whole columns, never with a loop over rows or buckets.
+
+        Args:
+        ---------
+            store (HistoryStore): The in-memory history.
+            archive (HistoryArchive): The on-disk history, queries are limited to the store without it.
+        """
+        self.store = store
+        self.archive = archive
+
+    def choose_tier(self, start: float, end: float, bucket: float) -> str:
+        """Pick where to read from for a query between `start` and `end` with buckets of `bucket` seconds.
+
+        The coarsest place with a fine enough resolution that holds the whole range wins.
+        Archive tiers trail behind by up to a row, so recent ranges usually end up in memory.
+
+        Returns:
+        ----------
+        str:
+            `memory`, or the name of an archive tier."""
+        now = time.time()
+        # (name, resolution, oldest, newest) of every place that holds history
+        tiers = [("memory", self.store.resolution, now - self.store.capacity * self.store.resolution, now)]
+        if self.archive is not None:
+            tiers += [
+                (tier.name, tier.resolution, now - tier.retention, self.archive.last_timestamps[tier.name] + tier.resolution)
+                for tier in self.archive.TIERS
+            ]
+
+        usable = [tier for tier in tiers if tier[1] <= bucket] or [min(tiers, key = lambda tier: tier[1])]
+        holding_start = [tier for tier in usable if tier[2] <= start]
+        holding_range = [tier for tier in holding_start if tier[3] >= min(end, now)]
+
+        if holding_range:
+            # The store wins ties with the raw tier because it doesn't touch the disk
+            return max(holding_range, key = lambda tier: (tier[1], tier[0] == "memory"))[0]
+        if holding_start:
+            return max(holding_start, key = lambda tier: (tier[3], tier[1]))[0]
+        return min(usable, key = lambda tier: tier[2])[0]
+
+    def query(self, key: str, start: float, end: float, bucket: float) -> Dict[str, np.ndarray]:
+        """Get min/max/mean/p50/p95/p99 of a metric per bucket.
+
+        Parameters:
+        ----------
+        key: str
+            The metric key, e.g. `cpu.temperature`.
+        start: float
+            The `time.time()` timestamp of the first bucket.
+        end: float
+            The timestamp to stop before.
+        bucket: float
+            The width of a bucket in seconds.
+
+        Returns:
+        ----------
+        dict:
+            `timestamp` (bucket starts), `count`, `min`, `max`, `mean`, `p50`, `p95` and `p99` mapped
+            to arrays with one entry per bucket, NaN for empty buckets, plus the `tier` that was read.
+            Percentiles of archive rollups are computed over their per-row averages."""
+        tier = self.choose_tier(start, end, bucket)
+
+        if tier == "memory":
+            timestamps, values = self.store.since(key, start)
+            minimums = maximums = values
+        else:
+            rows = self.archive.read(tier, key, start, end) # type: ignore
+            timestamps = rows["timestamp"]
+            values = rows.get("value", rows.get("avg"))
+            minimums = rows.get("value", rows.get("min"))
+            maximums = rows.get("value", rows.get("max"))
+
+        result = self.aggregate(timestamps, values, minimums, maximums, start, end, bucket)
+        result["tier"] = tier # type: ignore
+        return result
+
+    def summary(self, key: str, start: float, end: float) -> Dict[str, float]:
+        """Get min/max/mean/p50/p95/p99 of a metric over a whole range, e.g. a game session.
+
+        Returns:
+        ----------
+        dict:
+            The aggregates as floats, NaN if there was no data."""
+        result = self.query(key, start, end, end - start)
+        return {name: (values if name == "tier" else float(values[0])) for name, values in result.items()}
+
+    def aggregate(
+        self,
+        timestamps: np.ndarray,
+        values: np.ndarray,
+        minimums: np.ndarray,
+        maximums: np.ndarray,
+        start: float,
+        end: float,
+        bucket: float,
+    ) -> Dict[str, np.ndarray]:
+        """Aggregate rows into buckets, the rows have to be sorted by timestamp."""
+        bucket_count = max(1, math.ceil((end - start) / bucket))
+
+        keep = (timestamps >= start) & (timestamps < end) & ~np.isnan(values)
+        timestamps, values = timestamps[keep], values[keep]
+        minimums, maximums = minimums[keep], maximums[keep]
+        buckets = ((timestamps - start) // bucket).astype(np.int64)
+
+        counts = np.bincount(buckets, minlength = bucket_count)
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        filled = counts > 0
+
+        result = {
+            "timestamp": start + np.arange(bucket_count) * bucket,
+            "count": counts,
+        }
+
+        with np.errstate(invalid = "ignore", divide = "ignore"):
+            result["mean"] = np.bincount(buckets, weights = values, minlength = bucket_count) / counts
+
+        # Rows are sorted by time, so each filled bucket is one run that reduceat can fold
+        for name, data, ufunc in (("min", minimums, np.fmin), ("max", maximums, np.fmax)):
+            column = np.full(bucket_count, np.nan)
+            if len(data):
+                column[filled] = ufunc.reduceat(data, offsets[filled])
+            result[name] = column
+
+        # Sort by value inside every bucket, the percentiles are then plain index lookups
+        ordered = values[np.lexsort((values, buckets))]
+        for percentile in self.PERCENTILES:
+            column = np.full(bucket_count, np.nan)
+            if len(ordered):
+                position = offsets[filled] + (counts[filled] - 1) * (percentile / 100)
+                lower = np.floor(position).astype(np.int64)
+                upper = np.ceil(position).astype(np.int64)
+                column[filled] = ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+            result[f"p{percentile}"] = column
+
+        return result
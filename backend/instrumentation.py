@@ -0,0 +1,158 @@
+import time, threading
+
+from typing import List, Optional
+from contextvars import ContextVar
+
+# Values below 2 ** SUB_BUCKET_BITS get a bucket each, above that every power of two is split
+# into 2 ** (SUB_BUCKET_BITS - 1) buckets, so a bucket is never wider than 1/8 of its values
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << (SUB_BUCKET_BITS - 1)
+
+# The source being read on each thread, set by the scheduler around every reading
+context = threading.local()
+context.stats = None
+
+class LatencyHistogram:
+    def __init__(self, highest: int = 1 << 40):
+        """Counts latencies in nanoseconds in logarithmic buckets, like an HDR histogram.
+
+        Recording is a few integer operations on a preallocated list. Percentiles are exact
+        to the width of a bucket (12.5%), up to `highest` nanoseconds (about 18 minutes),
+        higher values land in the last bucket.
+
+        Args:
+        ---------
+            highest (int): The highest latency in nanoseconds that gets its own bucket.
+        """
+        self.highest = highest
+        self.counts: List[int] = [0] * (self.index(highest) + 1)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @staticmethod
+    def index(value: int) -> int:
+        shift = value.bit_length() - SUB_BUCKET_BITS
+        if shift <= 0:
+            return value
+        return (shift + 1) * SUB_BUCKETS + (value >> shift) - SUB_BUCKETS
+
+    @staticmethod
+    def upper_bound(index: int) -> int:
+        """The highest value the bucket `index` holds."""
+        if index < 2 * SUB_BUCKETS:
+            return index
+        shift = index // SUB_BUCKETS - 1
+        return ((index % SUB_BUCKETS + SUB_BUCKETS + 1) << shift) - 1
+
+    def record(self, value: int):
+        # `index` inlined, this runs for every reading
+        shift = value.bit_length() - SUB_BUCKET_BITS
+        try:
+            self.counts[value if shift <= 0 else (shift + 1) * SUB_BUCKETS + (value >> shift) - SUB_BUCKETS] += 1
+        except IndexError:
+            value = self.highest
+            self.counts[-1] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, fraction: float) -> int:
+        """Get the latency `fraction` (0 to 1) of the recordings are at or below, 0 if there are none."""
+        if not self.count:
+            return 0
+        rank = max(1, round(fraction * self.count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.upper_bound(index), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+class SourceStats:
+    def __init__(self):
+        """What the readings of one metric source cost and how they went, since the start.
+
+        An error is a reading that raised, or one whose function reported a failure it
+        handled itself through `record_error`. Timeouts are errors caused by a deadline.
+        Spawns and child CPU time are the shells started for the readings and the CPU time
+        they spent answering them.
+        """
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.timeouts = 0
+        self.spawns = 0
+        self.child_cpu_time = 0.0
+        self.last_error: Optional[str] = None
+        self.last_error_time: Optional[float] = None
+
+    @property
+    def calls(self) -> int:
+        return self.latency.count
+
+    def record_error(self, error: BaseException):
+        self.errors += 1
+        if isinstance(error, TimeoutError):
+            self.timeouts += 1
+        self.last_error = f"{type(error).__name__}: {error}"
+        self.last_error_time = time.time()
+
+    def to_dict(self) -> dict:
+        latency = self.latency
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "spawns": self.spawns,
+            "child_cpu_time": self.child_cpu_time,
+            "last_error": self.last_error,
+            "last_error_time": self.last_error_time,
+            "latency_us": {
+                "mean": latency.mean / 1000,
+                "p50": latency.percentile(0.50) / 1000,
+                "p90": latency.percentile(0.90) / 1000,
+                "p99": latency.percentile(0.99) / 1000,
+                "max": latency.max / 1000,
+            },
+        }
+
+# The probe being read in each asyncio task, set by AsyncNyxBase around every probe
+task_stats: "ContextVar[Optional[SourceStats]]" = ContextVar("task_stats", default = None)
+
+def current_stats() -> Optional[SourceStats]:
+    """The stats of the source being read on this thread, or in this asyncio task."""
+    stats = getattr(context, "stats", None)
+    return stats if stats is not None else task_stats.get()
+
+def record_error(error: BaseException):
+    """Count a failure that was handled, against the source being read."""
+    stats = current_stats()
+    if stats is not None:
+        stats.record_error(error)
+
+def record_spawn():
+    """Count a started process against the source being read."""
+    stats = current_stats()
+    if stats is not None:
+        stats.spawns += 1
+
+def record_child_cpu_time(seconds: float):
+    """Count CPU time a shell spent answering a query against the source being read."""
+    stats = current_stats()
+    if stats is not None:
+        stats.child_cpu_time += seconds
+
+def process_cpu_time(process) -> Optional[float]:
+    """The CPU time a `psutil.Process` and the children it waited for used so far in seconds, None once it's gone."""
+    if process is None:
+        return None
+    try:
+        times = process.cpu_times()
+    except Exception:
+        return None
+    return times.user + times.system + times.children_user + times.children_system
@@ -0,0 +1,134 @@
+import os, json, psutil, hashlib, platform, threading
+
+from typing import Callable, Dict
+
+from .logger import Logger
+from .capabilities import UNAVAILABLE
+
+class Inventory:
+    def __init__(self, nyx_path: str, probes: Dict[str, Callable], file_name: str = "inventory.json"):
+        """Remembers hardware values that don't change while the machine is running.
+
+        Values are kept in the Nyx folder, so they can be shown the moment Nyx starts. A
+        different hardware fingerprint throws them away, a different boot keeps showing
+        them but probes each one again the first time it's asked for. A probe that came back
+        UNAVAILABLE is never remembered, it's probed again the next time.
+
+        Args:
+        ---------
+            nyx_path (str): The Nyx folder in AppData.
+            probes (dict): Inventory keys mapped to the functions that read them.
+            file_name (str): The name of the file in the Nyx folder.
+        """
+        self.logger = Logger()
+        self.path = os.path.join(nyx_path, file_name)
+        self.probes = probes
+        self.values = {}
+        self.stale = set()
+        self.boot_id = self.get_boot_id()
+        self.fingerprint = self.get_fingerprint()
+
+        self._lock = threading.Lock()
+
+        self.load()
+
+    def get_boot_id(self) -> str:
+        """Get an ID that changes every time the machine boots.
+
+        Returns:
+        ----------
+        str:
+            The boot time, rounded because Windows reports it with a second of jitter."""
+        return str(round(psutil.boot_time() / 10) * 10)
+
+    def get_fingerprint(self) -> str:
+        """Get a hash of the parts of the machine that are cheap to look at.
+
+        Returns:
+        ----------
+        str:
+            The hardware fingerprint."""
+        parts = [
+            platform.node(),
+            platform.machine(),
+            platform.processor(),
+            str(psutil.cpu_count()),
+            str(psutil.virtual_memory().total),
+        ]
+        return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+    def load(self):
+        """Load the values saved by an earlier run."""
+        try:
+            with open(self.path, "r") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            self.logger.error(f"An error occurred while loading the inventory: {e}")
+            return
+
+        if data.get("fingerprint") != self.fingerprint:
+            self.logger.debug("Hardware changed, discarding the inventory")
+            return
+
+        self.values = {
+            key: value for key, value in data.get("values", {}).items()
+            if key in self.probes and value != UNAVAILABLE
+        }
+        if data.get("boot_id") != self.boot_id:
+            self.stale = set(self.values)
+        self.logger.debug(f"Loaded {len(self.values)} inventory values ({len(self.stale)} stale)")
+
+    def save(self):
+        """Write the values to the Nyx folder."""
+        data = {
+            "boot_id": self.boot_id,
+            "fingerprint": self.fingerprint,
+            "values": self.values,
+        }
+        try:
+            # Write next to the file and swap it in, a crash can't leave half a file behind
+            temporary_path = f"{self.path}.tmp"
+            with open(temporary_path, "w") as file:
+                json.dump(data, file, indent = 4)
+            os.replace(temporary_path, self.path)
+        except Exception as e:
+            self.logger.error(f"An error occurred while saving the inventory: {e}")
+
+    def get(self, key: str):
+        """Get an inventory value, probing it if it isn't known for this boot yet.
+
+        Parameters:
+        ----------
+        key: str
+            The inventory key.
+
+        Returns:
+        ----------
+        Any:
+            The value."""
+        with self._lock:
+            if key in self.values and key not in self.stale:
+                return self.values[key]
+
+        value = self.probes[key]()
+        # The probe failed and said so, the next ask should try again
+        if value == UNAVAILABLE:
+            return value
+
+        with self._lock:
+            self.values[key] = value
+            self.stale.discard(key)
+            self.save()
+        return value
+
+    def cached(self) -> dict:
+        """Get every value that is known, including stale ones, without probing anything.
+
+        Returns:
+        ----------
+        dict:
+            Inventory keys mapped to their values."""
+        with self._lock:
+            return dict(self.values)
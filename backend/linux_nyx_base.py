@@ -0,0 +1,132 @@
+from typing import Optional
+
+from .instrumentation import record_error
+from .gpu_telemetry import GPUTelemetry
+from .snapshot_cache import SnapshotCache
+from .linux_sources import LinuxSystemSources
+from .nyx_base import NyxBase
+
+class LinuxNyxBase(NyxBase):
+    METRIC_SOURCES = NyxBase.METRIC_SOURCES + (
+        ("cpu.clock", "get_cpu_clock", (), 1000, None),
+    )
+
+    def __init__(
+        self,
+        nvml = None,
+        nyx_path: Optional[str] = None,
+        sources: Optional[LinuxSystemSources] = None,
+        cache: Optional[SnapshotCache] = None,
+        gpu_telemetry: Optional[GPUTelemetry] = None,
+    ):
+        """NyxBase for Linux, the same objects and metric sources read from procfs and sysfs.
+
+        What NyxBase asks PowerShell, the registry and the Windows API comes from the files
+        LinuxSystemSources keeps open, nothing is ever spawned. GPUs are read through NVML like
+        on Windows. `Wi-Fi` and `Ethernet` stand for the first wireless and wired interface.
+        """
+        super().__init__(nvml, nyx_path, sources if sources is not None else LinuxSystemSources(nvml), cache, gpu_telemetry)
+        self._cpu_times: Optional[tuple] = None
+
+    def close(self):
+        super().close()
+        self.sources.close()
+
+    def get_cpu_temperature(self):
+        """Get CPU package temperature from hwmon or the thermal zones.
+
+        Returns:
+        ----------
+        float:
+            CPU temperature in Celsius."""
+        return self.sources.cpu_temperature()
+
+    def get_cpu_usage(self):
+        """Get CPU usage from the growth of the /proc/stat times since the last call.
+
+        Returns:
+        ----------
+        float:
+            CPU usage in percentage, since boot on the first call."""
+        try:
+            busy, total = self.sources.cpu_times()
+            previous_busy, previous_total = self._cpu_times or (0, 0)
+            self._cpu_times = busy, total
+            if total <= previous_total:
+                return 0
+            return round((busy - previous_busy) / (total - previous_total) * 100, 1)
+        except Exception as e:
+            self.logger.error(f"An error occurred while retrieving CPU usage: {e}")
+            record_error(e)
+            return 0
+
+    def get_cpu_clock(self):
+        """Get the average clock of the CPU cores from cpufreq.
+
+        Returns:
+        ----------
+        float:
+            CPU clock in MHz, 0 without cpufreq."""
+        frequencies = self.sources.cpu_frequencies()
+        return round(sum(frequencies) / len(frequencies)) if frequencies else 0
+
+    def get_cpu_name(self):
+        """Get CPU name from /proc/cpuinfo.
+
+        Returns:
+        ----------
+        str:
+            CPU name."""
+        return self.sources.cpu_name()
+
+    def get_drive_type(self):
+        """Get the drive type from the rotational flag of the physical disks.
+
+        Returns:
+        ----------
+        str:
+            SSD if any physical disk is an SSD, HDD otherwise."""
+        return "SSD" if self.sources.has_solid_state_disk() else "HDD"
+
+    def get_computer_model(self):
+        """Get computer model from DMI or the device tree.
+
+        Returns:
+        ----------
+        str:
+            Computer model."""
+        try:
+            return self.sources.product_name()
+        except Exception as e:
+            self.logger.error(f"An error occurred while retrieving computer model: {e}")
+            record_error(e)
+            return "N/A"
+
+    def get_power_plan(self):
+        """Get the ACPI platform profile, or the CPU frequency governor.
+
+        Returns:
+        ----------
+        str:
+            Power plan, e.g. balanced or powersave."""
+        try:
+            return self.sources.power_profile()
+        except Exception as e:
+            self.logger.error(f"An error occurred while retrieving power plan: {e}")
+            record_error(e)
+            return "N/A"
+
+    def get_idle_time(self):
+        """Linux has no input idle time outside of a desktop session, so it's never idle.
+
+        Returns:
+        ----------
+        float:
+            Always 0."""
+        return 0.0
+
+    def get_network_speed(self, interface: str):
+        """Get network speed of the first wireless interface for `Wi-Fi`, of the first wired one for `Ethernet`.
+
+        See NyxBase.get_network_speed."""
+        return super().get_network_speed(self.sources.network_interfaces().get(interface, interface))
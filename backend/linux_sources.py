@@ -0,0 +1,351 @@
+import os, glob, threading
+
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
+
+from .system_sources import SystemSources
+
+# The shapes psutil returns, with the fields NyxBase reads
+svmem = namedtuple("svmem", ["total", "available", "percent", "used", "free"])
+sdiskpart = namedtuple("sdiskpart", ["device", "mountpoint", "fstype", "opts"])
+sdiskusage = namedtuple("sdiskusage", ["total", "used", "free", "percent"])
+sdiskio = namedtuple("sdiskio", ["read_count", "write_count", "read_bytes", "write_bytes", "read_time", "write_time"])
+snetio = namedtuple("snetio", ["bytes_sent", "bytes_recv", "packets_sent", "packets_recv", "errin", "errout", "dropin", "dropout"])
+sbattery = namedtuple("sbattery", ["percent", "secsleft", "power_plugged"])
+
+# hwmon drivers of CPU sensors and the label of the reading that stands for the whole package, best first
+CPU_HWMON = {"coretemp": "Package id 0", "k10temp": "Tctl", "zenpower": "Tctl", "cpu_thermal": None, "acpitz": None}
+# Thermal zone types that measure the CPU, best first
+CPU_THERMAL_ZONES = ["x86_pkg_temp", "cpu-thermal", "cpu_thermal", "acpitz"]
+
+# Block devices that aren't disks of their own
+VIRTUAL_DISKS = ("loop", "ram", "zram", "dm-", "md", "sr")
+
+class PinnedFile:
+    def __init__(self, path: str, size: int = 4096, whole: bool = True):
+        """A procfs or sysfs file that stays open and is read from the start into the same buffer.
+
+        The kernel regenerates these files whenever they are read from offset 0, so every
+        `read` is a fresh reading for a single `preadv`, without opening the file again.
+
+        Args:
+        ---------
+            path (str): The file.
+            size (int): The buffer size in bytes, it grows when the file doesn't fit.
+            whole (bool): False if only the first `size` bytes are ever needed, e.g. the first line of /proc/stat.
+        """
+        self.path = path
+        self.whole = whole
+        self.reads = 0
+        self.fd = os.open(path, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+        self.buffer = bytearray(size)
+
+        self._lock = threading.Lock()
+
+    def read(self) -> bytes:
+        with self._lock:
+            while True:
+                length = os.preadv(self.fd, [self.buffer], 0)
+                if length < len(self.buffer) or not self.whole:
+                    break
+                # It filled the buffer, there may be more
+                self.buffer = bytearray(len(self.buffer) * 2)
+            self.reads += 1
+            return bytes(memoryview(self.buffer)[:length])
+
+    def read_int(self) -> int:
+        return int(self.read())
+
+    def close(self):
+        os.close(self.fd)
+
+def read_text(path: str, default: Optional[str] = None) -> Optional[str]:
+    """Read a small file once, e.g. a value that can't change while the machine runs."""
+    try:
+        with open(path) as file:
+            return file.read().strip()
+    except OSError:
+        return default
+
+class LinuxSystemSources(SystemSources):
+    def __init__(self, nvml = None, root: str = "/"):
+        """SystemSources for Linux, read from procfs and sysfs instead of psutil, the registry and shells.
+
+        The sensors and counters are looked up once, on the first reading, and their files stay
+        open. Every reading after that is one `preadv` per file into a buffer that is reused, so
+        a whole tick costs a handful of system calls and never starts a process.
+
+        Args:
+        ---------
+            nvml: The NVML module to use, `pynvml` (imported by GPUTelemetry) if not given.
+            root (str): Where / of the machine to read is, e.g. the host's filesystem mounted into a container.
+        """
+        super().__init__(nvml)
+        self.root = root
+        self.files: Dict[str, PinnedFile] = {}
+        # Sensor files by `driver/label`, e.g. `coretemp/Package id 0` or `thermal/x86_pkg_temp`
+        self.temperatures: Dict[str, PinnedFile] = {}
+        self.fans: Dict[str, PinnedFile] = {}
+        self.frequencies: List[PinnedFile] = []
+        self.cpu_temperature_key: Optional[str] = None
+        self.disks: List[str] = []
+        self.interfaces: Dict[str, str] = {}
+        self.battery: Optional[str] = None
+        self.mains: Optional[str] = None
+        self.discovered = False
+
+        self._lock = threading.Lock()
+        self._disk_names: frozenset = frozenset()
+
+    def path(self, *parts: str) -> str:
+        return os.path.join(self.root, *parts)
+
+    def discover(self):
+        """Find and open every counter and sensor file, once."""
+        with self._lock:
+            if self.discovered:
+                return
+
+            # Only the first line, the total of every CPU, is read
+            self.files["stat"] = PinnedFile(self.path("proc/stat"), 256, whole = False)
+            self.files["meminfo"] = PinnedFile(self.path("proc/meminfo"))
+            self.files["net_dev"] = PinnedFile(self.path("proc/net/dev"))
+            self.files["diskstats"] = PinnedFile(self.path("proc/diskstats"), 8192)
+
+            for hwmon in sorted(glob.glob(self.path("sys/class/hwmon/hwmon*"))):
+                driver = read_text(os.path.join(hwmon, "name"), os.path.basename(hwmon))
+                for kind, sensors in (("temp", self.temperatures), ("fan", self.fans)):
+                    for input_path in sorted(glob.glob(os.path.join(hwmon, f"{kind}*_input"))):
+                        label = read_text(input_path[:-len("input")] + "label", os.path.basename(input_path)[:-len("_input")])
+                        self._pin(sensors, f"{driver}/{label}", input_path)
+
+            for zone in sorted(glob.glob(self.path("sys/class/thermal/thermal_zone*"))):
+                zone_type = read_text(os.path.join(zone, "type"), os.path.basename(zone))
+                self._pin(self.temperatures, f"thermal/{zone_type}", os.path.join(zone, "temp"))
+
+            for path in sorted(glob.glob(self.path("sys/devices/system/cpu/cpu[0-9]*/cpufreq/scaling_cur_freq"))):
+                try:
+                    self.frequencies.append(PinnedFile(path, 32))
+                except OSError:
+                    pass
+
+            self.cpu_temperature_key = self._find_cpu_temperature()
+
+            self.disks = [
+                os.path.basename(disk) for disk in sorted(glob.glob(self.path("sys/block/*")))
+                if not os.path.basename(disk).startswith(VIRTUAL_DISKS) and os.path.exists(os.path.join(disk, "device"))
+            ]
+            self._disk_names = frozenset(disk.encode() for disk in self.disks)
+
+            for interface in sorted(glob.glob(self.path("sys/class/net/*"))):
+                if not os.path.exists(os.path.join(interface, "device")):
+                    # Loopback, bridges, tunnels and the like
+                    continue
+                wireless = os.path.exists(os.path.join(interface, "wireless")) or os.path.exists(os.path.join(interface, "phy80211"))
+                self.interfaces.setdefault("Wi-Fi" if wireless else "Ethernet", os.path.basename(interface))
+
+            for supply in sorted(glob.glob(self.path("sys/class/power_supply/*"))):
+                supply_type = read_text(os.path.join(supply, "type"))
+                if supply_type == "Battery" and self.battery is None:
+                    self.battery = supply
+                elif supply_type == "Mains" and self.mains is None:
+                    self.mains = supply
+            if self.battery is not None:
+                self.files["battery_capacity"] = PinnedFile(os.path.join(self.battery, "capacity"), 32)
+                # Whether the charger is in, straight from it if there is one
+                if self.mains is not None:
+                    self.files["power_plugged"] = PinnedFile(os.path.join(self.mains, "online"), 32)
+                else:
+                    self.files["power_plugged"] = PinnedFile(os.path.join(self.battery, "status"), 32)
+
+            self.discovered = True
+
+    def _pin(self, sensors: Dict[str, PinnedFile], key: str, path: str):
+        if key in sensors:
+            key = f"{key} ({os.path.basename(os.path.dirname(path))})"
+        try:
+            sensors[key] = PinnedFile(path, 32)
+        except OSError:
+            # Some sensors can't be read without root
+            pass
+
+    def _find_cpu_temperature(self) -> Optional[str]:
+        for driver, label in CPU_HWMON.items():
+            keys = [key for key in self.temperatures if key.startswith(f"{driver}/")]
+            if label is not None and f"{driver}/{label}" in keys:
+                return f"{driver}/{label}"
+            if keys:
+                return keys[0]
+        for zone_type in CPU_THERMAL_ZONES:
+            if f"thermal/{zone_type}" in self.temperatures:
+                return f"thermal/{zone_type}"
+        return None
+
+    def close(self):
+        """Close every file kept open."""
+        with self._lock:
+            for pinned in [*self.files.values(), *self.temperatures.values(), *self.fans.values(), *self.frequencies]:
+                pinned.close()
+            self.files, self.temperatures, self.fans, self.frequencies = {}, {}, {}, []
+            self.discovered = False
+
+    def read(self, name: str) -> bytes:
+        if not self.discovered:
+            self.discover()
+        return self.files[name].read()
+
+    def virtual_memory(self):
+        fields = {}
+        for line in self.read("meminfo").splitlines():
+            name, _, value = line.partition(b":")
+            if name in (b"MemTotal", b"MemFree", b"MemAvailable", b"Buffers", b"Cached", b"SReclaimable"):
+                fields[name] = int(value.split()[0]) * 1024
+                if len(fields) == 6:
+                    break
+
+        total, free = fields[b"MemTotal"], fields[b"MemFree"]
+        available = fields.get(b"MemAvailable", free)
+        # What psutil counts as used
+        used = total - free - fields.get(b"Buffers", 0) - fields.get(b"Cached", 0) - fields.get(b"SReclaimable", 0)
+        if used < 0:
+            used = total - free
+        return svmem(total, available, (total - available) / total * 100, used, free)
+
+    def disk_partitions(self):
+        partitions = []
+        for line in (read_text(self.path("proc/self/mounts")) or "").splitlines():
+            device, mountpoint, fstype, opts = line.split()[:4]
+            if device.startswith("/dev/"):
+                partitions.append(sdiskpart(device, mountpoint.replace("\\040", " "), fstype, opts))
+        # The root partition is the primary one
+        partitions.sort(key = lambda partition: partition.mountpoint != "/")
+        return partitions
+
+    def disk_usage(self, path: str):
+        stat = os.statvfs(self.path(path.lstrip("/")))
+        total = stat.f_blocks * stat.f_frsize
+        free = stat.f_bavail * stat.f_frsize
+        used = (stat.f_blocks - stat.f_bfree) * stat.f_frsize
+        return sdiskusage(total, used, free, used / (used + free) * 100 if used + free else 0)
+
+    def disk_io_counters(self):
+        if not self.discovered:
+            self.discover()
+        if not self.disks:
+            return None
+
+        disk_names = self._disk_names
+        totals = [0, 0, 0, 0, 0, 0]
+        for line in self.read("diskstats").splitlines():
+            fields = line.split()
+            if len(fields) < 11 or fields[2] not in disk_names:
+                continue
+            # Sectors are 512 bytes in diskstats, whatever the disk uses
+            totals[0] += int(fields[3])
+            totals[1] += int(fields[7])
+            totals[2] += int(fields[5]) * 512
+            totals[3] += int(fields[9]) * 512
+            totals[4] += int(fields[6])
+            totals[5] += int(fields[10])
+        return sdiskio(*totals)
+
+    def net_io_counters(self, pernic: bool = False):
+        counters = {}
+        # The first two lines are headers
+        for line in self.read("net_dev").splitlines()[2:]:
+            name, _, values = line.partition(b":")
+            fields = values.split()
+            counters[name.strip().decode()] = snetio(
+                int(fields[8]), int(fields[0]), int(fields[9]), int(fields[1]),
+                int(fields[2]), int(fields[10]), int(fields[3]), int(fields[11]),
+            )
+        if pernic:
+            return counters
+        return snetio(*(sum(column) for column in zip(*counters.values())))
+
+    def sensors_battery(self):
+        if not self.discovered:
+            self.discover()
+        if self.battery is None:
+            return None
+
+        percent = float(self.read("battery_capacity"))
+        plugged = self.read("power_plugged").strip()
+        power_plugged = plugged == b"1" if self.mains is not None else plugged != b"Discharging"
+        # -1 is psutil's "unknown" for the time left
+        return sbattery(percent, -1, power_plugged)
+
+    def read_registry(self, path: str, name: str):
+        raise FileNotFoundError(f"Linux has no registry to read {path}\\{name} from")
+
+    def cpu_times(self) -> Tuple[int, int]:
+        """Get the time every CPU spent busy and in total since boot, in clock ticks."""
+        # cpu  user nice system idle iowait irq softirq steal guest guest_nice
+        fields = [int(value) for value in self.read("stat").split(b"\n", 1)[0].split()[1:9]]
+        total = sum(fields)
+        return total - fields[3] - fields[4], total
+
+    def cpu_temperature(self) -> float:
+        """Get the CPU package temperature in Celsius.
+
+        Raises:
+        ----------
+        FileNotFoundError:
+            If the machine has no CPU temperature sensor."""
+        if not self.discovered:
+            self.discover()
+        if self.cpu_temperature_key is None:
+            raise FileNotFoundError("No CPU temperature sensor was found in hwmon or the thermal zones")
+        return self.temperatures[self.cpu_temperature_key].read_int() / 1000
+
+    def cpu_frequencies(self) -> List[float]:
+        """Get the clock of every CPU core in MHz, an empty list without cpufreq."""
+        if not self.discovered:
+            self.discover()
+        return [pinned.read_int() / 1000 for pinned in self.frequencies]
+
+    def fan_speeds(self) -> Dict[str, int]:
+        """Get the speed of every fan hwmon knows, in RPM."""
+        if not self.discovered:
+            self.discover()
+        return {key: pinned.read_int() for key, pinned in self.fans.items()}
+
+    def cpu_name(self) -> str:
+        for line in (read_text(self.path("proc/cpuinfo")) or "").splitlines():
+            name, _, value = line.partition(":")
+            # x86 calls it model name, some ARM kernels only have Hardware
+            if name.strip() in ("model name", "Hardware"):
+                return value.strip()
+        raise FileNotFoundError("/proc/cpuinfo names no CPU")
+
+    def product_name(self) -> str:
+        name = read_text(self.path("sys/class/dmi/id/product_name")) or read_text(self.path("proc/device-tree/model"))
+        if not name:
+            raise FileNotFoundError("Neither DMI nor the device tree names this machine")
+        return name.strip("\x00")
+
+    def has_solid_state_disk(self) -> bool:
+        """Whether any physical disk doesn't rotate."""
+        if not self.discovered:
+            self.discover()
+        return any(read_text(self.path("sys/block", disk, "queue/rotational")) == "0" for disk in self.disks)
+
+    def power_profile(self) -> str:
+        """Get the ACPI platform profile, or the frequency governor of the first CPU on machines without one.
+
+        Raises:
+        ----------
+        FileNotFoundError:
+            If the machine has neither."""
+        profile = read_text(self.path("sys/firmware/acpi/platform_profile")) or read_text(
+            self.path("sys/devices/system/cpu/cpu0/cpufreq/scaling_governor")
+        )
+        if not profile:
+            raise FileNotFoundError("Neither a platform profile nor a CPU frequency governor was found")
+        return profile
+
+    def network_interfaces(self) -> Dict[str, str]:
+        """Get the first physical wireless and wired interface, as `Wi-Fi` and `Ethernet` like on Windows."""
+        if not self.discovered:
+            self.discover()
+        return self.interfaces
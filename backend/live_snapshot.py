@@ -0,0 +1,117 @@
+import sys, json, time, argparse
+
+from typing import List, Optional
+
+from .snapshot_ring import SnapshotRing
+
+# The segment the running instance publishes its snapshots in, it also tells a second instance Nyx is running
+SEGMENT_NAME = "nyx_live_snapshot"
+
+def is_alive(pid: int) -> bool:
+    import psutil
+    return psutil.pid_exists(pid)
+
+def find_running() -> Optional[SnapshotRing]:
+    """Map the live snapshot of the running instance.
+
+    A segment left behind by an instance that crashed is removed.
+
+    Returns:
+    ----------
+    SnapshotRing:
+        The ring, None if no instance is running.
+
+    Raises:
+    ----------
+    ValueError:
+        If the segment was created by a different version of Nyx or is still being set up."""
+    try:
+        ring = SnapshotRing.attach(SEGMENT_NAME)
+    except FileNotFoundError:
+        return None
+
+    if not is_alive(ring.pid):
+        ring.close(unlink = True)
+        return None
+    return ring
+
+def publish(keys: List[str], capacity: int = 64) -> Optional[SnapshotRing]:
+    """Create the live snapshot, which marks this process as the running instance.
+
+    Returns:
+    ----------
+    SnapshotRing:
+        The ring to write snapshots to, None if another instance is running."""
+    try:
+        running = find_running()
+    except ValueError:
+        # Either way another instance runs
+        return None
+    if running is not None:
+        running.close()
+        return None
+
+    try:
+        return SnapshotRing.create(keys, capacity, name = SEGMENT_NAME)
+    except FileExistsError:
+        # Another instance started at the same time
+        return None
+
+def print_values(values: dict, keys: Optional[List[str]], as_json: bool, timestamp: float):
+    if keys:
+        values = {key: values[key] for key in keys if key in values}
+    if as_json:
+        print(json.dumps({"timestamp": round(timestamp, 3), "values": values}, separators = (",", ":")), flush = True)
+        return
+    width = max((len(key) for key in values), default = 0)
+    for key, value in values.items():
+        print(f"{key:<{width}}  {value}")
+    print(flush = True)
+
+def main(argv: List[str]) -> int:
+    """The `read` command, prints the values of the running instance without sampling anything,
+    e.g. `python main.py read --keys cpu.usage,gpu.temperature --json`.
+
+    Returns:
+    ----------
+    int:
+        The exit code, 1 if no instance is running."""
+    parser = argparse.ArgumentParser(prog = "nyx read", description = "Print the metrics of the running Nyx instance.")
+    parser.add_argument("--keys", help = "comma separated metric keys to print (default: all)")
+    parser.add_argument("--json", action = "store_true", help = "print JSON Lines instead of a table")
+    parser.add_argument("--watch", type = float, metavar = "SECONDS", help = "keep printing new values, checking this often")
+    arguments = parser.parse_args(argv)
+
+    try:
+        ring = find_running()
+    except ValueError as e:
+        print(f"Can't read the running instance: {e}", file = sys.stderr)
+        return 1
+    if ring is None:
+        print("Nyx is not running.", file = sys.stderr)
+        return 1
+
+    keys = [key.strip() for key in arguments.keys.split(",") if key.strip()] if arguments.keys else None
+    try:
+        snapshot = ring.read_latest()
+        if snapshot is not None:
+            print_values(snapshot.values, keys, arguments.json, snapshot.timestamp)
+        if arguments.watch is None:
+            return 0
+
+        sequence = ring.write_sequence
+        values = dict(snapshot.values) if snapshot is not None else {}
+        while is_alive(ring.pid):
+            time.sleep(arguments.watch)
+            snapshots = ring.read(sequence)
+            if not snapshots:
+                continue
+            sequence = snapshots[-1][0]
+            for _, snapshot in snapshots:
+                values.update(snapshot.values)
+            print_values(values, keys, arguments.json, snapshots[-1][1].timestamp)
+        return 0
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        ring.close()
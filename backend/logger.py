@@ -2,6 +2,9 @@ from rich import print
 from time import strftime
 
 class Logger:
+    # Where messages go, the console by default. Headless mode moves them off stdout.
+    file = None
+
     def __init__(self):
         pass
 
@@ -12,7 +15,7 @@ class Logger:
         ---------
         message (str): The message to log.
         """
-        print(f"[bold white][{strftime('%H:%M:%S')}][/bold white] {message}")
+        print(f"[bold white][{strftime('%H:%M:%S')}][/bold white] {message}", file = self.file)
     
     def success(self, message: str):
         """Logs a success message to the console.
@@ -0,0 +1,187 @@
+import os, threading
+
+from typing import Dict, List, Optional, Tuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .logger import Logger
+from .objects import Snapshot
+from .scheduler import Scheduler
+from .capabilities import CircuitBreaker
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Snapshot keys of the interfaces NyxBase samples, the name of the interface each was read from is under `<key>.interface`
+NETWORK_INTERFACES = ("net.wifi", "net.lan")
+
+# Labels whose value in FAMILIES is the snapshot key of the actual value, e.g. the interface NyxBase resolved
+VALUE_LABELS = {"interface"}
+
+# Family name, type, help and the snapshot keys it is made of, with their labels and a factor to base units
+FAMILIES: List[Tuple[str, str, str, List[Tuple[str, Dict[str, str], float]]]] = [
+    ("nyx_cpu_usage_percent", "gauge", "CPU usage.", [("cpu.usage", {}, 1)]),
+    ("nyx_cpu_temperature_celsius", "gauge", "CPU temperature.", [("cpu.temperature", {}, 1)]),
+    ("nyx_cpu_clock_hertz", "gauge", "Average CPU core clock.", [("cpu.clock", {}, 1e6)]),
+    ("nyx_gpu_usage_percent", "gauge", "GPU usage.", [("gpu.usage", {}, 1)]),
+    ("nyx_gpu_temperature_celsius", "gauge", "GPU temperature.", [("gpu.temperature", {}, 1)]),
+    ("nyx_gpu_clock_hertz", "gauge", "GPU clocks.", [
+        ("gpu.clock", {"clock": "graphics"}, 1e6),
+        ("gpu.memory_clock", {"clock": "memory"}, 1e6),
+    ]),
+    ("nyx_ram_total_bytes", "gauge", "Installed RAM.", [("ram.total", {}, 1024 ** 3)]),
+    ("nyx_ram_used_percent", "gauge", "RAM in use.", [("ram.used_percent", {}, 1)]),
+    ("nyx_disk_used_percent", "gauge", "Space used on the primary partition.", [("disk.used_percent", {}, 1)]),
+    ("nyx_disk_io_percent", "gauge", "Disk throughput relative to 500 MB/s.", [("disk.io_percent", {}, 1)]),
+    ("nyx_network_receive_bytes_per_second", "gauge", "Network download rate.", [
+        (f"{key}.download_rate", {"interface": f"{key}.interface"}, 1) for key in NETWORK_INTERFACES
+    ]),
+    ("nyx_network_transmit_bytes_per_second", "gauge", "Network upload rate.", [
+        (f"{key}.upload_rate", {"interface": f"{key}.interface"}, 1) for key in NETWORK_INTERFACES
+    ]),
+]
+
+# Text values published as labels of the nyx_info metric
+INFO_LABELS = {"computer_model": "computer_model", "cpu.name": "cpu", "gpu.name": "gpu", "power_plan": "power_plan"}
+
+def escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in labels.items()) + "}"
+
+def resolve_labels(labels: Dict[str, str], values: dict) -> Dict[str, str]:
+    return {name: values.get(value, "") if name in VALUE_LABELS else value for name, value in labels.items()}
+
+def is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def render(snapshot: Snapshot, scheduler: Optional[Scheduler] = None) -> bytes:
+    """Render a snapshot in the OpenMetrics text format.
+
+    Metrics without a value yet are left out. With a scheduler, the call, error and
+    timeout counts of every source are added.
+
+    Returns:
+    ----------
+    bytes:
+        The exposition, ending with `# EOF`."""
+    values = snapshot.values
+    lines = []
+
+    info = {label: values[key] for key, label in INFO_LABELS.items() if isinstance(values.get(key), str)}
+    lines.append("# TYPE nyx info")
+    lines.append("# HELP nyx Hardware Nyx runs on.")
+    lines.append(f"nyx_info{format_labels(info)} 1")
+
+    for name, metric_type, help_text, samples in FAMILIES:
+        rendered = [
+            f"{name}{format_labels(resolve_labels(labels, values))} {values[key] * factor}"
+            for key, labels, factor in samples if is_number(values.get(key))
+        ]
+        if rendered:
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.append(f"# HELP {name} {help_text}")
+            lines.extend(rendered)
+
+    lines.append("# TYPE nyx_snapshot_timestamp_seconds gauge")
+    lines.append("# HELP nyx_snapshot_timestamp_seconds When the snapshot was published.")
+    lines.append(f"nyx_snapshot_timestamp_seconds {snapshot.timestamp}")
+
+    if scheduler is not None:
+        diagnostics = scheduler.diagnostics()
+        for name, field, help_text in (
+            ("nyx_source_calls", "calls", "Readings of every metric source."),
+            ("nyx_source_errors", "errors", "Failed readings of every metric source."),
+            ("nyx_source_timeouts", "timeouts", "Readings of every metric source that missed a deadline."),
+        ):
+            lines.append(f"# TYPE {name} counter")
+            lines.append(f"# HELP {name} {help_text}")
+            lines.extend(f'{name}_total{{source="{escape(key)}"}} {stats[field]}' for key, stats in diagnostics.items())
+        lines.append("# TYPE nyx_source_up gauge")
+        lines.append("# HELP nyx_source_up Whether a metric source is sampled, 0 while it's unavailable or backing off.")
+        lines.extend(f'nyx_source_up{{source="{escape(key)}"}} {int(stats["state"] == CircuitBreaker.CLOSED)}' for key, stats in diagnostics.items())
+
+    lines.append("# EOF")
+    return ("\n".join(lines) + "\n").encode()
+
+class MetricsServer:
+    def __init__(self, scheduler: Scheduler, host: str = "127.0.0.1", port: int = 9877):
+        """Serves the latest snapshot in the OpenMetrics text format at `/metrics`.
+
+        Scrapes never sample anything, they read `scheduler.snapshot`. The exposition is
+        rendered once per snapshot sequence and every scrape of the same sequence gets the
+        same bytes, so any number of scrapers cost Nyx one render per snapshot.
+
+        Args:
+        ---------
+            scheduler (Scheduler): The scheduler whose snapshots are served.
+            host (str): The address to listen on, localhost only by default.
+            port (int): The port to listen on, 0 picks a free one.
+        """
+        self.logger = Logger()
+        self.scheduler = scheduler
+        self.host = host
+        self.port = port
+        self.scrapes = 0
+        self.renders = 0
+
+        self._lock = threading.Lock()
+        self._sequence = -1
+        self._body = b""
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def get_body(self) -> bytes:
+        """Get the exposition of the latest snapshot, rendering it only if the snapshot is new."""
+        snapshot = self.scheduler.snapshot
+        with self._lock:
+            self.scrapes += 1
+            if snapshot.sequence != self._sequence:
+                self._body = render(snapshot, self.scheduler)
+                self._sequence = snapshot.sequence
+                self.renders += 1
+            return self._body
+
+    def start(self):
+        if self._server is not None:
+            return
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = server.get_body()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target = self._server.serve_forever, name = "NyxMetrics", daemon = True)
+        self._thread.start()
+        self.logger.debug(f"Serving metrics at http://{self.host}:{self.port}/metrics")
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        self._thread = None
+
+def get_port() -> Optional[int]:
+    """The port from the `NYX_METRICS_PORT` environment variable, None if the endpoint is disabled."""
+    value = os.getenv("NYX_METRICS_PORT")
+    if not value or value == "0":
+        return None
+    return int(value)
@@ -1,27 +1,134 @@
-import psutil, os, math, pynvml, time, winreg, ctypes
+import sys, math, ctypes, operator, functools
+
+from typing import Optional
 
 from .logger import Logger
+from .instrumentation import record_error
 from .objects import CPU, GPU, Harddisk, RAM, Network
+from .scheduler import MetricSource
+from .gpu_telemetry import GPUTelemetry
+from .system_sources import SystemSources
+from .rate_engine import RateEngine
+from .snapshot_cache import SnapshotCache
+from .inventory import Inventory
 
 class NyxBase:
-    def __init__(self):
+    # The keys of the values the inventory remembers across launches
+    INVENTORY_KEYS = ("computer_model", "cpu.name", "gpu.name", "ram.total", "disk.drive_type")
+
+    # The published fields of a network reading and the attributes they are read from
+    NETWORK_FIELDS = {
+        "download": "download_labelized",
+        "upload": "upload_labelized",
+        "download_rate": "download_rate",
+        "upload_rate": "upload_rate",
+        "interface": "interface",
+    }
+    # Every metric source Nyx samples: its key, the getter and the arguments it's called with, the
+    # interval in milliseconds (0 reads it only once) and, for getters returning an object, the
+    # attributes published as `key.field`. Platforms extend it, see get_metric_sources.
+    METRIC_SOURCES = (
+        ("computer_model", "get_inventory_value", ("computer_model",), 0, None),
+        ("cpu.name", "get_inventory_value", ("cpu.name",), 0, None),
+        ("cpu.usage", "get_cpu_usage", (), 1000, None),
+        ("cpu.temperature", "get_cpu_temperature", (), 2500, None),
+        ("gpu.name", "get_inventory_value", ("gpu.name",), 0, None),
+        ("gpu", "get_gpu", (), 1000, {
+            "usage": "usage",
+            "temperature": "temperature",
+            "clock": "clock",
+            "memory_clock": "memory_clock",
+        }),
+        ("ram.total", "get_inventory_value", ("ram.total",), 0, None),
+        ("ram", "get_ram_info", (), 1000, {"used_percent": "used_percent"}),
+        ("disk", "get_harddisk_info", (), 60 * 1000, {"label": "labelized", "used_percent": "used_percent"}),
+        ("disk.io_percent", "get_disk_io_percentage", (), 1000, None),
+        ("net.wifi", "get_network_speed", ("Wi-Fi",), 250, NETWORK_FIELDS),
+        ("net.lan", "get_network_speed", ("Ethernet",), 250, NETWORK_FIELDS),
+        ("power_plan", "get_power_plan", (), 0, None),
+    )
+
+    POWERSHELL = ["powershell.exe", "-NoLogo", "-NoProfile", "-NonInteractive", "-Command", "-"]
+    # The PowerShell queries behind the values read through the channel
+    QUERIES = {
+        "cpu.temperature": '(Get-CimInstance -ClassName Win32_PerfFormattedData_Counters_ThermalZoneInformation -Namespace "root/CIMV2").HighPrecisionTemperature / 10 - 273.15',
+        "cpu.usage": '(Get-CimInstance -ClassName Win32_Processor).LoadPercentage',
+        "disk.drive_type": 'Get-PhysicalDisk | Select-Object -ExpandProperty MediaType',
+        # Asking CIM instead of running powercfg keeps this inside the channel's process
+        "power_plan": '(Get-CimInstance -Namespace root/cimv2/power -ClassName Win32_PowerPlan -Filter "IsActive=\'True\'").ElementName',
+    }
+
+    def __init__(
+        self,
+        nvml = None,
+        nyx_path: Optional[str] = None,
+        sources: Optional[SystemSources] = None,
+        cache: Optional[SnapshotCache] = None,
+        gpu_telemetry: Optional[GPUTelemetry] = None,
+    ):
         self.logger = Logger()
+        # Everything read from outside the process goes through the sources, see benchmarks/fake_system_sources.py
+        self.sources = sources if sources is not None else SystemSources(nvml)
+        self.gpu_telemetry = gpu_telemetry if gpu_telemetry is not None else GPUTelemetry(self.sources.nvml)
+        self.powershell = self.sources.create_channel(self.POWERSHELL)
+        self.rates = RateEngine(window = 1.0)
+        self.cache = cache if cache is not None else SnapshotCache()
+
+        # Values that can't change while the machine is running, remembered across launches
+        self.inventory_probes = {
+            "computer_model": self.get_computer_model,
+            "cpu.name": self.get_cpu_name,
+            "gpu.name": self.get_gpu_name,
+            "ram.total": lambda: self.get_ram_info().total,
+            "disk.drive_type": self.get_drive_type,
+        }
+        self.inventory = Inventory(nyx_path, self.inventory_probes) if nyx_path else None
+
+    @classmethod
+    def platform(cls) -> type:
+        """Get the NyxBase class of the platform Nyx runs on, LinuxNyxBase on Linux."""
+        if sys.platform.startswith("linux"):
+            from .linux_nyx_base import LinuxNyxBase
+            return LinuxNyxBase
+        return cls
+
+    @classmethod
+    def create(cls, **kwargs) -> "NyxBase":
+        """Get the NyxBase of the platform Nyx runs on, LinuxNyxBase on Linux."""
+        return cls.platform()(**kwargs)
+
+    def close(self):
+        """Release the sessions NyxBase keeps open."""
+        self.gpu_telemetry.stop()
+        self.powershell.close()
+
+    def get_inventory_value(self, key: str):
+        """Get a hardware value from the inventory, or probe it if NyxBase has no inventory.
+
+        Parameters:
+        ----------
+        key: str
+            The inventory key, e.g. `cpu.name`.
+
+        Returns:
+        ----------
+        Any:
+            The value."""
+        if self.inventory is None:
+            return self.inventory_probes[key]()
+        return self.inventory.get(key)
 
     def get_cpu_temperature(self):
-        """Get CPU temperature using powershell command.
+        """Get CPU temperature through the PowerShell channel.
         
         Returns:
         ----------
         float:
             CPU temperature in Celsius."""
-        return float(
-            os.popen(
-                'powershell.exe "(Get-CimInstance -ClassName Win32_PerfFormattedData_Counters_ThermalZoneInformation -Namespace "root/CIMV2").HighPrecisionTemperature / 10 - 273.15"'
-            ).read().strip()
-        )
+        return float(self.powershell.query(self.QUERIES["cpu.temperature"]))
 
     def get_cpu_usage(self):
-        """Get CPU usage using powershell command.
+        """Get CPU usage through the PowerShell channel.
         
         Returns:
         ----------
@@ -29,15 +136,14 @@ class NyxBase:
             CPU usage in percentage."""
         
         try:
-            output = os.popen(
-                    'powershell.exe "(Get-CimInstance -ClassName Win32_Processor).LoadPercentage"'
-                ).read().strip()
+            output = self.powershell.query(self.QUERIES["cpu.usage"])
             usage = 0
             if len(output) > 0:
                 usage = float(output)
             return usage
         except Exception as e:
             self.logger.error(f"An error occurred while retrieving CPU usage: {e}")
+            record_error(e)
             return 0
 
     def get_cpu_name(self):
@@ -48,68 +154,76 @@ class NyxBase:
         str:
             CPU name."""
         # return cpuinfo.get_cpu_info()["brand_raw"]
-        key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"HARDWARE\DESCRIPTION\System\CentralProcessor\0")
-        return winreg.QueryValueEx(key, "ProcessorNameString")[0]
+        return self.sources.read_registry(r"HARDWARE\DESCRIPTION\System\CentralProcessor\0", "ProcessorNameString")
 
     def get_gpu_temperature(self):
-        """Get GPU temperature using nvidia-smi command.
+        """Get GPU temperature from the NVML session.
         
         Returns:
         ----------
         int:
             GPU temperature in Celsius."""
         try:
-            output = os.popen('nvidia-smi --query-gpu=temperature.gpu --format=csv,noheader,nounits').read().strip()
-            temperature = int(output)
-            return temperature
+            return self.gpu_telemetry.read().temperature
         except Exception as e:
             self.logger.error(f"An error occurred while retrieving GPU temperature: {e}")
+            record_error(e)
             return 0
     
     def get_gpu_usage(self):
-        """Get GPU usage using nvidia-smi command.
+        """Get GPU usage from the NVML session.
         
         Returns:
         ----------
-        int:
+        float:
             GPU usage in percentage."""
         try:
-            output = os.popen('nvidia-smi --query-gpu=utilization.gpu --format=csv,noheader,nounits').read().strip()
-            usage = 0
-            if len(output) > 0:
-                usage = float(output)
-            return usage
+            return self.gpu_telemetry.read().usage
         except Exception as e:
             self.logger.error(f"An error occurred while retrieving GPU usage: {e}")
+            record_error(e)
             return 0
 
     def get_gpu_clock(self):
-        """Get GPU clock using nvidia-smi command.
+        """Get GPU clock from the NVML session.
         
         Returns:
         ----------
         int:
             GPU clock in MHz."""
         try:
-            output = os.popen('nvidia-smi --query-gpu=clocks.gr --format=csv,noheader,nounits').read().strip()
-            clock = int(output)
-            return clock
+            return self.gpu_telemetry.read().clock
         except Exception as e:
             self.logger.error(f"An error occurred while retrieving GPU clock: {e}")
+            record_error(e)
+            return 0
+
+    def get_vram_clock(self):
+        """Get VRAM clock from the NVML session.
+        
+        Returns:
+        ----------
+        int:
+            VRAM clock in MHz."""
+        try:
+            return self.gpu_telemetry.read().memory_clock
+        except Exception as e:
+            self.logger.error(f"An error occurred while retrieving VRAM clock: {e}")
+            record_error(e)
             return 0
     
     def get_gpu_name(self):
-        """Get GPU name using nvidia-smi command.
+        """Get GPU name from the NVML session.
         
         Returns:
         ----------
         str:
             GPU name."""
         try:
-            output = os.popen('nvidia-smi --query-gpu=name --format=csv,noheader,nounits').read().strip()
-            return output
+            return self.gpu_telemetry.read().name
         except Exception as e:
             self.logger.error(f"An error occurred while retrieving GPU name: {e}")
+            record_error(e)
             return "N/A"
 
     def get_cpu(self):
@@ -132,21 +246,21 @@ class NyxBase:
         )
     
     def get_gpu(self):
-        """Get GPU object.
+        """Get GPU object, every field comes from a single NVML reading.
         
         Returns:
         ----------
         GPU:
-            GPU object containing name, temperature, usage and clock."""
-        return GPU(
-            name = self.get_gpu_name(),
-            temperature = self.get_gpu_temperature(),
-            usage = self.get_gpu_usage(),
-            clock = self.get_gpu_clock(),
-        )
+            GPU object containing name, temperature, usage, clock, VRAM clock and fan speed."""
+        try:
+            return self.gpu_telemetry.read()
+        except Exception as e:
+            self.logger.error(f"An error occurred while retrieving GPU information: {e}")
+            record_error(e)
+            return GPU("N/A", 0, 0, 0)
 
     def get_harddisk_info(self):
-        """Get hard disk information using os.popen PowerShell command.
+        """Get hard disk information through the PowerShell channel.
         
         Returns:
         ----------
@@ -154,15 +268,12 @@ class NyxBase:
             Hard disk object."""
             
         try:
-            power_shell_command = 'powershell.exe "Get-PhysicalDisk | Format-Table -AutoSize"'
-            disk_info = os.popen(power_shell_command).read().strip()
-            
-            drive_type = "SSD" if "ssd" in disk_info.lower() else "HDD"
-            
-            partitions = psutil.disk_partitions()
+            drive_type = self.get_inventory_value("disk.drive_type")
+
+            partitions = self.cache.get("disk_partitions", self.sources.disk_partitions)
             primary_partition = partitions[0]
             
-            usage = psutil.disk_usage(primary_partition.mountpoint)
+            usage = self.cache.get("disk_usage", lambda: self.sources.disk_usage(primary_partition.mountpoint))
             total_gb = usage.total / (1024.0 ** 3)
             free_gb = usage.free / (1024.0 ** 3)
             
@@ -170,24 +281,32 @@ class NyxBase:
             return harddisk
         except Exception as e:
             self.logger.error(f"An error occurred while retrieving hard disk information: {e}")
+            record_error(e)
             return Harddisk(0, 0, "N/A")
 
+    def get_drive_type(self):
+        """Get the drive type through the PowerShell channel.
+
+        Returns:
+        ----------
+        str:
+            SSD if any physical disk is an SSD, HDD otherwise."""
+        disk_info = self.powershell.query(self.QUERIES["disk.drive_type"])
+        return "SSD" if "ssd" in disk_info.lower() else "HDD"
+
     def get_disk_io_percentage(self):
-        """Get disk I/O percentage using psutil.disk_io_counters().
+        """Get disk I/O percentage from the growth of psutil.disk_io_counters() since the last call.
 
         Returns:
         ----------
         float:
-            Disk I/O percentage."""
-        initial_counters = psutil.disk_io_counters()
-        time.sleep(1)
-        final_counters = psutil.disk_io_counters()
-        if not final_counters or not initial_counters:
+            Disk I/O percentage, 0 on the first call."""
+        # Rates are measured between the times the counters were read, not when they were handed out
+        read_at, counters = self.cache.get_timed("disk_io_counters", self.sources.disk_io_counters)
+        if not counters:
             return 0
-        read_bytes_delta = final_counters.read_bytes - initial_counters.read_bytes
-        write_bytes_delta = final_counters.write_bytes - initial_counters.write_bytes
-        total_bytes = read_bytes_delta + write_bytes_delta
-        io_speed = total_bytes / 1 # 1 second
+        rates = self.rates.update("disk", {"read": counters.read_bytes, "write": counters.write_bytes}, now = read_at)
+        io_speed = rates["read"] + rates["write"]
         max_io_speed = 500 * 1024 * 1024  # 500 MB/s in bytes
         io_percentage = (io_speed / max_io_speed) * 100
         
@@ -198,20 +317,17 @@ class NyxBase:
         
         Returns:
         ----------
-        tuple:
-            Tuple containing total, available and used RAM."""
-        ram = psutil.virtual_memory()
+        RAM:
+            RAM object containing total, available and used RAM."""
+        ram = self.cache.get("virtual_memory", self.sources.virtual_memory)
         total = math.ceil(ram.total / (1024.0 ** 3))
         available = ram.available / (1024.0 ** 3)
         used = ram.used / (1024.0 ** 3)
-        
-        # Get VRAM clock
-        vram_clock = os.popen('nvidia-smi --query-gpu=clocks.mem --format=csv,noheader,nounits').read().strip()
 
-        return RAM(total, available, used, float(vram_clock))
+        return RAM(total, available, used)
 
     def get_fans(self):
-        """Get fan speeds using the NVIDIA Management Library (pynvml).
+        """Get fan speeds from the NVML session.
         
         Returns:
         ----------
@@ -219,59 +335,72 @@ class NyxBase:
             A list of dictionaries containing fan speeds in percentage.
         """
         try:
-            pynvml.nvmlInit()
-            device_count = pynvml.nvmlDeviceGetCount()
-            fans = []
-
-            for i in range(device_count):
-                handle = pynvml.nvmlDeviceGetHandleByIndex(i)
-                fan_speed = pynvml.nvmlDeviceGetFanSpeed(handle)
-                fans.append({'fan': i + 1, 'speed': fan_speed})
-            
-            pynvml.nvmlShutdown()
-            return fans
-
-        except pynvml.NVMLError as e:
-            self.logger.error(f"An error occurred while retrieving fan speeds: {e}")
-            return []
-
+            return [
+                {'fan': i + 1, 'speed': gpu.fan_speed}
+                for i, gpu in enumerate(self.gpu_telemetry.read_all())
+                if gpu.fan_speed is not None
+            ]
         except Exception as e:
-            self.logger.error(f"An unexpected error occurred: {e}")
+            self.logger.error(f"An error occurred while retrieving fan speeds: {e}")
+            record_error(e)
             return []
 
     def get_computer_model(self):
-        """Get computer model using os.popen command.
+        """Get computer model from the registry.
         
         Returns:
         ----------
         str:
             Computer model."""
         try:
-            key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"HARDWARE\DESCRIPTION\System\BIOS")
-            model, _ = winreg.QueryValueEx(key, "SystemProductName")
-            winreg.CloseKey(key)
-            return model
+            return self.sources.read_registry(r"HARDWARE\DESCRIPTION\System\BIOS", "SystemProductName")
         except Exception as e:
             self.logger.error(f"An error occurred while retrieving computer model: {e}")
+            record_error(e)
             return "N/A"
         
     def get_power_plan(self):
-        """Get power plan using os.popen command.
+        """Get power plan through the PowerShell channel.
         
         Returns:
         ----------
         str:
             Power plan."""
         try:
-            power_plan = os.popen('powercfg /getactivescheme').read().strip()
-            power_plan = power_plan[power_plan.find("(") + 1:power_plan.find(")")]
-            return power_plan
+            return self.powershell.query(self.QUERIES["power_plan"])
         except Exception as e:
             self.logger.error(f"An error occurred while retrieving power plan: {e}")
+            record_error(e)
             return "N/A"
-        
+
+    def is_on_battery(self):
+        """Check whether the computer runs on battery using psutil.sensors_battery().
+
+        Returns:
+        ----------
+        bool:
+            True if it's on battery, False if it's plugged in or has no battery."""
+        battery = self.sources.sensors_battery()
+        return battery is not None and not battery.power_plugged
+
+    def get_idle_time(self):
+        """Get the time since the last keyboard or mouse input using ctypes.windll command.
+
+        Returns:
+        ----------
+        float:
+            Seconds since the last input."""
+        class LASTINPUTINFO(ctypes.Structure):
+            _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]
+
+        last_input = LASTINPUTINFO()
+        last_input.cbSize = ctypes.sizeof(LASTINPUTINFO)
+        ctypes.windll.user32.GetLastInputInfo(ctypes.byref(last_input))
+        # Both are milliseconds since boot in 32 bits, so they wrap together
+        return ((ctypes.windll.kernel32.GetTickCount() - last_input.dwTime) & 0xFFFFFFFF) / 1000
+
     def get_network_speed(self, interface: str):
-        """Get network speed using psutil.net_io_counters().
+        """Get network speed from the growth of psutil.net_io_counters() since the last call.
 
         Parameters:
         ----------
@@ -280,14 +409,15 @@ class NyxBase:
         
         Returns:
         ----------
-        tuple:
-            Tuple containing download and upload speed."""
-        net_io_1 = psutil.net_io_counters(pernic=True)[interface]
-        time.sleep(1)
-        net_io_2 = psutil.net_io_counters(pernic=True)[interface]
+        Network:
+            Network object containing download and upload speed, 0 on the first call."""
+        # Every interface shares one reading of all of them
+        read_at, net_io_counters = self.cache.get_timed("net_io_counters", lambda: self.sources.net_io_counters(pernic=True))
+        net_io = net_io_counters[interface]
+        rates = self.rates.update(f"net.{interface}", {"sent": net_io.bytes_sent, "recv": net_io.bytes_recv}, now = read_at)
 
         sent_unit = "Bytes/s"
-        sent_speed = (net_io_2.bytes_sent - net_io_1.bytes_sent)
+        sent_speed = rates["sent"]
         # Convert to KB or MB
         if sent_speed > 1024:
             sent_speed = sent_speed / 1024
@@ -297,7 +427,7 @@ class NyxBase:
             sent_unit = "MB/s"
         
         recv_unit = "Bytes/s"
-        recv_speed = (net_io_2.bytes_recv - net_io_1.bytes_recv)
+        recv_speed = rates["recv"]
         # Convert to KB or MB
         if recv_speed > 1024:
             recv_speed = recv_speed / 1024
@@ -306,9 +436,66 @@ class NyxBase:
             recv_speed = recv_speed / 1024
             recv_unit = "MB/s"
 
-        return Network(interface, round(recv_speed, 1), round(sent_speed, 1), recv_unit, sent_unit)
+        return Network(interface, round(recv_speed, 1), round(sent_speed, 1), recv_unit, sent_unit, rates["recv"], rates["sent"])
+
+    def get_metric_sources(self):
+        """Get every metric source of `METRIC_SOURCES`, reading through this NyxBase.
+
+        Returns:
+        ----------
+        list:
+            A list of MetricSource objects to register on a Scheduler."""
+        sources = []
+        for key, getter, arguments, interval, fields in self.METRIC_SOURCES:
+            function = getattr(self, getter)
+            if arguments:
+                function = functools.partial(function, *arguments)
+            extractors = None
+            if fields is not None:
+                extractors = {name: operator.attrgetter(attribute) for name, attribute in fields.items()}
+            sources.append(MetricSource(key, function, interval, fields = extractors))
+        return sources
+
+    @classmethod
+    def get_metric_keys(cls):
+        """Get every metric key the sources of `get_metric_sources` publish, without creating a NyxBase.
+
+        Returns:
+        ----------
+        list:
+            A list of metric keys."""
+        return [
+            f"{key}.{name}" if fields is not None else key
+            for key, _, _, _, fields in cls.METRIC_SOURCES
+            for name in (fields if fields is not None else [None])
+        ]
+
+    @staticmethod
+    def get_history_keys():
+        """Get the metric keys with numeric values worth keeping a history of.
+
+        Returns:
+        ----------
+        list:
+            A list of metric keys."""
+        return [
+            "cpu.usage",
+            "cpu.temperature",
+            "gpu.usage",
+            "gpu.temperature",
+            "gpu.clock",
+            "gpu.memory_clock",
+            "ram.used_percent",
+            "disk.used_percent",
+            "disk.io_percent",
+            "net.wifi.download_rate",
+            "net.wifi.upload_rate",
+            "net.lan.download_rate",
+            "net.lan.upload_rate",
+        ]
 
-    def get_dpi(self):
+    @staticmethod
+    def get_dpi():
         """Get DPI settings using ctypes.windll command.
 
         Returns:
@@ -324,7 +511,8 @@ class NyxBase:
         
         return dpi_x
 
-    def get_screen_resolution(self):
+    @staticmethod
+    def get_screen_resolution():
         """Get screen resolution using ctypes.windll command.
 
         Returns:
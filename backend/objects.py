@@ -4,7 +4,7 @@ class CPU:
     def __init__(
         self,
         processor: str,
-        temperature: float,
+        temperature: Optional[float],
         usage: float,
     ):
         self.processor = processor
@@ -12,9 +12,9 @@ class CPU:
         self.usage = usage
     
     def __str__(self):
-        return f"CPU: {self.processor} | Temperature: {self.temperature:.2f}C | Usage: {self.usage:.2f}%"
+        return f"CPU: {self.processor} | Temperature: {'N/A' if self.temperature is None else f'{self.temperature:.2f}C'} | Usage: {self.usage:.2f}%"
 
-# GPU add name, temperature, usage and clock
+# GPU add name, temperature, usage, clock, VRAM clock and fan speed
 class GPU:
     def __init__(
         self,
@@ -22,14 +22,18 @@ class GPU:
         temperature: float,
         usage: float,
         clock: float,
+        memory_clock: float = 0,
+        fan_speed: Optional[float] = None,
     ):
         self.name = name
         self.temperature = temperature
         self.usage = usage
         self.clock = clock
+        self.memory_clock = memory_clock
+        self.fan_speed = fan_speed
     
     def __str__(self):
-        return f"GPU: {self.name} | Temperature: {self.temperature:.2f}C | Usage: {self.usage:.2f}% | Clock: {self.clock:.2f}MHz"
+        return f"GPU: {self.name} | Temperature: {self.temperature:.2f}C | Usage: {self.usage:.2f}% | Clock: {self.clock:.2f}MHz | VRAM Clock: {self.memory_clock:.2f}MHz | Fan: {'N/A' if self.fan_speed is None else f'{self.fan_speed}%'}"
 
 # Harddisk add name, total, free space
 class Harddisk:
@@ -41,7 +45,7 @@ class Harddisk:
     ):
         self.total = total
         self.free = free
-        self.used_percent = (total - free) / total * 100
+        self.used_percent = (total - free) / total * 100 if total else 0
         self.drive_type = drive_type
         # label must be like SSD (1 TB) or SSD (750 GB) or HDD (1 TB) etc
         self.labelized = f"{drive_type} ({total/1024:.0f} TB)" if total > 1024 else f"{drive_type} ({total:.0f} GB)"
@@ -49,23 +53,21 @@ class Harddisk:
     def __str__(self):
         return f"Drive type: {self.drive_type} | Total: {self.total:.2f}GB | Free: {self.free:.2f}GB | Used Space: {self.used_percent:.2f}% | Labelized: {self.labelized}"
 
-# RAM add total, available, used and VRAM clock
+# RAM add total, available and used
 class RAM:
     def __init__(
         self,
         total: float,
         available: float,
         used: float,
-        clock: float,
     ):
         self.total = total
         self.available = available
         self.used = used
         self.used_percent = used / total * 100
-        self.clock = clock
     
     def __str__(self):
-        return f"RAM: Total: {self.total}GB | Available: {self.available:.2f}GB | Used: {self.used:.2f}GB | Used Percent: {self.used_percent:.2f}% | Clock: {self.clock:.2f}MHz"
+        return f"RAM: Total: {self.total}GB | Available: {self.available:.2f}GB | Used: {self.used:.2f}GB | Used Percent: {self.used_percent:.2f}%"
 
 class Row:
     def __init__(
@@ -91,14 +93,35 @@ class Network:
         upload_speed: float,
         download_unit: str,
         upload_unit: str,
+        download_rate: float = 0,
+        upload_rate: float = 0,
     ):
         self.interface = interface
         self.download_speed = download_speed
         self.upload_speed = upload_speed
         self.download_unit = download_unit
         self.upload_unit = upload_unit
+        # The unscaled speeds in bytes per second
+        self.download_rate = download_rate
+        self.upload_rate = upload_rate
         self.download_labelized = f"{download_speed} {download_unit}"
         self.upload_labelized = f"{upload_speed} {upload_unit}"
 
     def __str__(self):
-        return f"Network: {self.interface} | Download Speed: {self.download_speed} {self.download_unit} | Upload Speed: {self.upload_speed} {self.upload_unit}"
\ No newline at end of file
+        return f"Network: {self.interface} | Download Speed: {self.download_speed} {self.download_unit} | Upload Speed: {self.upload_speed} {self.upload_unit}"
+
+class Snapshot:
+    def __init__(
+        self,
+        sequence: int,
+        timestamp: float,
+        values: dict,
+        updated: frozenset,
+    ):
+        self.sequence = sequence
+        self.timestamp = timestamp
+        self.values = values
+        self.updated = updated
+
+    def __str__(self):
+        return f"Snapshot: #{self.sequence} | Timestamp: {self.timestamp:.3f} | Metrics: {len(self.values)} | Updated: {', '.join(sorted(self.updated))}"
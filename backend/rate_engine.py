@@ -0,0 +1,114 @@
+import time, threading
+
+from collections import deque
+from typing import Dict, Optional
+
+class RateEngine:
+    def __init__(self, window: float = 1.0, max_gap: float = 30.0, min_interval: float = 0.05):
+        """Turns cumulative counters into per-second rates without sleeping.
+
+        Every source keeps its previous readings, a rate is the growth of the counter over
+        the readings inside the smoothing window divided by the `time.monotonic()` time
+        between them.
+
+        Args:
+        ---------
+            window (float): The smoothing window in seconds, 0 compares against the previous reading only.
+            max_gap (float): Readings further apart than this many seconds (e.g. after sleep) start over.
+            min_interval (float): Readings closer together than this reuse the last rates instead of dividing by ~0.
+        """
+        self.window = window
+        self.max_gap = max_gap
+        self.min_interval = min_interval
+        self.resets = 0
+        self.wraps = 0
+
+        self._lock = threading.Lock()
+        self._raw: Dict[str, dict] = {}
+        self._totals: Dict[str, dict] = {}
+        self._samples: Dict[str, deque] = {}
+        self._rates: Dict[str, dict] = {}
+
+    def update(self, source: str, counters: Dict[str, int], now: Optional[float] = None, bits: Optional[int] = None) -> Dict[str, float]:
+        """Feed the current counter values of a source and get its rates.
+
+        Parameters:
+        ----------
+        source: str
+            The name of the source, e.g. `net.Wi-Fi`.
+        counters: dict
+            Counter names mapped to their cumulative values.
+        now: float
+            The `time.monotonic()` time of the reading, taken now if not given.
+        bits: int
+            The width of the counters if they wrap around, e.g. 32. None for counters that never
+            do, like psutil's with `nowrap`, every decrease of those is a reset.
+
+        Returns:
+        ----------
+        dict:
+            Counter names mapped to their growth per second, 0 until a source has two readings."""
+        now = time.monotonic() if now is None else now
+
+        with self._lock:
+            samples = self._samples.get(source)
+            previous = self._raw.get(source)
+
+            if samples is None or previous is None or now - samples[-1][0] > self.max_gap or counters.keys() != previous.keys():
+                return self._rebase(source, counters, now)
+
+            if now - samples[-1][0] < self.min_interval:
+                return self._rates[source]
+
+            totals = dict(self._totals[source])
+            for name, value in counters.items():
+                delta = self._delta(previous[name], value, bits)
+                if delta is None:
+                    # The counter started over (resume from sleep, NIC re-plugged), nothing to compare against
+                    self.resets += 1
+                    return self._rebase(source, counters, now)
+                totals[name] += delta
+
+            self._raw[source] = dict(counters)
+            self._totals[source] = totals
+            samples.append((now, totals))
+
+            # Keep the newest reading that is at least a full window old as the baseline
+            while len(samples) > 2 and now - samples[1][0] >= self.window:
+                samples.popleft()
+
+            start_time, start_totals = samples[0]
+            elapsed = now - start_time
+            rates = {name: (totals[name] - start_totals[name]) / elapsed for name in totals}
+            self._rates[source] = rates
+            return rates
+
+    def reset(self, source: Optional[str] = None):
+        """Forget the readings of a source, or of every source if none is given."""
+        with self._lock:
+            for store in (self._raw, self._totals, self._samples, self._rates):
+                if source is None:
+                    store.clear()
+                else:
+                    store.pop(source, None)
+
+    def _rebase(self, source: str, counters: Dict[str, int], now: float) -> Dict[str, float]:
+        totals = {name: 0 for name in counters}
+        self._raw[source] = dict(counters)
+        self._totals[source] = totals
+        self._samples[source] = deque([(now, totals)])
+        self._rates[source] = {name: 0.0 for name in counters}
+        return self._rates[source]
+
+    def _delta(self, previous: int, current: int, bits: Optional[int]) -> Optional[int]:
+        if current >= previous:
+            return current - previous
+
+        # A counter in the upper half of its width that comes back small has wrapped around
+        if bits is not None:
+            width = 2 ** bits
+            if width // 2 <= previous < width and current < width // 2:
+                self.wraps += 1
+                return width - previous + current
+
+        return None
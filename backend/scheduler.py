@@ -0,0 +1,354 @@
+import math, time, threading
+
+from typing import Callable, Dict, FrozenSet, List, Optional
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from .logger import Logger
+from .objects import Snapshot
+from .instrumentation import SourceStats, context
+from .capabilities import UNAVAILABLE, CapabilityRegistry, CircuitBreaker
+
+class MetricSource:
+    def __init__(
+        self,
+        key: str,
+        function: Callable,
+        interval: int,
+        fields: Optional[Dict[str, Callable]] = None,
+    ):
+        """A single thing the scheduler knows how to sample.
+
+        Args:
+        ---------
+            key (str): The metric key the value is published under.
+            function (Callable): The function that reads the value.
+            interval (int): How often to sample in milliseconds, 0 samples only once.
+            fields (dict): Optional extractors, when given the result of `function` is
+                published as `key.field` for every field instead of under `key`.
+        """
+        self.key = key
+        self.function = function
+        self.interval = interval
+        self.fields = fields
+
+        self.next_due = 0.0
+        self.in_flight = False
+        self.finished = False
+
+        # Set by a governor, multiplies `interval`
+        self.scale = 1.0
+        # Smoothed cost of a reading in seconds and relative change of the values per reading
+        self.calls = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.volatility = 0.0
+        # Latencies, failures and spawns of every reading, see Scheduler.diagnostics
+        self.stats = SourceStats()
+        # Set by the scheduler, stops sampling a source that is missing or keeps failing
+        self.breaker: Optional[CircuitBreaker] = None
+        self._previous: Dict[str, float] = {}
+
+    def extract(self, result) -> dict:
+        """Turn the result of the source function into published values.
+
+        Returns:
+        ----------
+        dict:
+            Metric keys mapped to their new values."""
+        if self.fields is None:
+            return {self.key: result}
+        return {f"{self.key}.{name}": extractor(result) for name, extractor in self.fields.items()}
+
+    def unavailable(self) -> dict:
+        """The values published while the source can't be read, every metric key mapped to UNAVAILABLE."""
+        if self.fields is None:
+            return {self.key: UNAVAILABLE}
+        return {f"{self.key}.{name}": UNAVAILABLE for name in self.fields}
+
+    def record(self, values: dict, wall_time: float, cpu_time: float, smoothing: float = 0.2):
+        """Account for a finished reading, its cost and how much its values moved."""
+        numbers = {key: value for key, value in values.items() if isinstance(value, (int, float)) and not isinstance(value, bool)}
+        changes = [
+            abs(value - self._previous[key]) / max(abs(value), abs(self._previous[key]), 1)
+            for key, value in numbers.items() if key in self._previous
+        ]
+        self._previous = numbers
+
+        if self.calls == 0:
+            self.wall_time, self.cpu_time = wall_time, cpu_time
+        else:
+            self.wall_time += (wall_time - self.wall_time) * smoothing
+            self.cpu_time += (cpu_time - self.cpu_time) * smoothing
+        if changes:
+            change = sum(changes) / len(changes)
+            self.volatility = change if self.calls <= 1 else self.volatility + (change - self.volatility) * smoothing
+        self.calls += 1
+
+    def __str__(self):
+        return f"MetricSource: {self.key} | Interval: {self.interval}ms | Scale: {self.scale} | In flight: {self.in_flight}"
+
+class Scheduler:
+    def __init__(self, tick: int = 250, workers: int = 4, capabilities: Optional[CapabilityRegistry] = None):
+        """Samples every registered source on one shared, aligned clock.
+
+        Every `tick` milliseconds the scheduler wakes up once, hands the sources that
+        are due to a small worker pool and publishes a single snapshot with everything
+        that finished. A source that is still running is never submitted twice.
+
+        Readings until the first success probe a source. A source that keeps failing them
+        isn't on this machine, UNAVAILABLE is published for its keys and it's only probed
+        again every few minutes. A source that fails later on is left alone for longer and
+        longer, see CircuitBreaker. One-off sources are read again until they succeed.
+
+        Args:
+        ---------
+            tick (int): The tick length in milliseconds, source intervals are rounded up to it.
+            workers (int): The size of the worker pool.
+            capabilities (CapabilityRegistry): Where the breakers of the sources are kept.
+        """
+        self.logger = Logger()
+        self.tick = tick
+        self.workers = workers
+        self.capabilities = capabilities if capabilities is not None else CapabilityRegistry()
+        self.sources: Dict[str, MetricSource] = {}
+        self.snapshot = Snapshot(0, 0.0, {}, frozenset())
+        self.paused = False
+        self.interval_scale = 1.0
+        self.allowed_sources: Optional[FrozenSet[str]] = None
+        # Times the scheduler thread woke up and readings it handed out, for wakeups/s figures
+        self.wakeups = 0
+        self.samples = 0
+
+        self._lock = threading.Lock()
+        self._completed = {}
+        self._subscribers: Dict[str, List[Callable]] = {}
+        self._listeners: List[Callable] = []
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def add_source(self, source: MetricSource) -> MetricSource:
+        """Register a source, it is sampled on the next tick."""
+        assert source.key not in self.sources, f"Source {source.key} is already registered"
+        source.breaker = self.capabilities.register(source.key)
+        self.sources[source.key] = source
+        self._wake_event.set()
+        return source
+
+    def remove_source(self, key: str):
+        """Unregister a source, a reading that is already running is dropped."""
+        self.sources.pop(key, None)
+
+    def seed(self, values: dict):
+        """Make values known before the first tick, e.g. ones cached by an earlier run.
+
+        Nobody is notified, subscribers that join later can read them from `snapshot`."""
+        self.snapshot = Snapshot(self.snapshot.sequence, time.time(), {**self.snapshot.values, **values}, frozenset())
+
+    def throttle(self, interval_scale: float = 1.0, allowed_sources: Optional[FrozenSet[str]] = None):
+        """Slow down or limit sampling, the change applies from the next tick.
+
+        Parameters:
+        ----------
+        interval_scale: float
+            Every source interval is multiplied by this.
+        allowed_sources: frozenset
+            The keys of the only sources to sample, every source is sampled if None."""
+        self.interval_scale = interval_scale
+        self.allowed_sources = allowed_sources
+
+        # Sources that are due earlier now shouldn't wait out a sleep planned for the old intervals
+        now = time.monotonic()
+        for source in list(self.sources.values()):
+            source.next_due = min(source.next_due, now + source.interval * source.scale * interval_scale / 1000)
+            # Except for the ones a breaker holds back
+            if source.breaker is not None and source.breaker.state != CircuitBreaker.CLOSED:
+                source.next_due = max(source.next_due, source.breaker.retry_at)
+        self._wake_event.set()
+
+    def subscribe(self, key: str, callback: Callable):
+        """Call `callback(value)` every time the metric `key` gets a new value.
+
+        Callbacks run on the scheduler thread, GUI code has to hop threads itself."""
+        self._subscribers.setdefault(key, []).append(callback)
+
+    def add_listener(self, callback: Callable):
+        """Call `callback(snapshot)` for every published snapshot."""
+        self._listeners.append(callback)
+
+    def diagnostics(self) -> Dict[str, dict]:
+        """Get the latency percentiles, call, error, timeout and spawn counts, the last error and the breaker state of every source.
+
+        Returns:
+        ----------
+        dict:
+            Source keys mapped to `SourceStats.to_dict()` and a `state`, in the order they were added."""
+        return {
+            key: {**source.stats.to_dict(), "state": source.breaker.state if source.breaker else CircuitBreaker.CLOSED}
+            for key, source in list(self.sources.items())
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+
+        self._stop_event.clear()
+        self._executor = ThreadPoolExecutor(max_workers = self.workers, thread_name_prefix = "NyxSampler")
+        self._thread = threading.Thread(target = self._run, name = "NyxScheduler", daemon = True)
+        self._thread.start()
+        self.logger.debug(f"Started scheduler with {len(self.sources)} sources and {self.workers} workers")
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop ticking and wait for the scheduler thread, readings in flight are abandoned."""
+        self._stop_event.set()
+        self._wake_event.set()
+        self._resume_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait = False, cancel_futures = True)
+            self._executor = None
+        self.logger.debug("Stopped scheduler")
+
+    def pause(self):
+        self.paused = True
+        self._resume_event.clear()
+
+    def resume(self):
+        self.paused = False
+        self._resume_event.set()
+
+    def _run(self):
+        tick = self.tick / 1000
+
+        while True:
+            self._resume_event.wait()
+            if self._stop_event.is_set():
+                break
+
+            self.wakeups += 1
+            tick_time = round(time.monotonic() / tick) * tick
+            self._tick(tick_time)
+
+            # Sleep until the boundary of the grid the next source is due at, so every wakeup is shared
+            wake_time = math.ceil(round(self._next_due(tick_time + tick) / tick, 6)) * tick
+            self._wake_event.wait(max(0, wake_time - time.monotonic()))
+            self._wake_event.clear()
+            if self._stop_event.is_set():
+                break
+
+    def _is_allowed(self, source: MetricSource) -> bool:
+        return self.allowed_sources is None or source.key in self.allowed_sources
+
+    def _next_due(self, next_tick: float) -> float:
+        due = [
+            # Readings still running get published on the next tick
+            next_tick if source.in_flight else source.next_due
+            for source in list(self.sources.values())
+            if not source.finished and self._is_allowed(source)
+        ]
+        return min(due, default = next_tick + 60)
+
+    def _tick(self, tick_time: float):
+        tick = self.tick / 1000
+        futures = []
+
+        for source in list(self.sources.values()):
+            if source.in_flight or source.finished or source.next_due > tick_time or not self._is_allowed(source):
+                continue
+
+            source.in_flight = True
+            source.next_due = tick_time + source.interval * source.scale * self.interval_scale / 1000
+            self.samples += 1
+            futures.append(self._executor.submit(self._collect, source)) # type: ignore
+
+        if futures:
+            # Give the readings most of the tick, stragglers are published on a later one
+            wait(futures, timeout = max(0, tick_time + tick * 0.9 - time.monotonic()))
+
+        self._publish()
+
+    def _collect(self, source: MetricSource):
+        values = {}
+        stats = source.stats
+        errors, timeouts, child_cpu_time = stats.errors, stats.timeouts, stats.child_cpu_time
+        # Failures the source handles itself and processes it starts are counted against it
+        context.stats = stats
+        start_time, start_cpu_time = time.perf_counter_ns(), time.thread_time()
+        try:
+            values = source.extract(source.function())
+        except Exception as e:
+            self.logger.error(f"An error occurred while sampling {source.key}: {e}")
+            stats.record_error(e)
+        finally:
+            wall_time = time.perf_counter_ns() - start_time
+            context.stats = None
+            stats.latency.record(wall_time)
+            # The shells that answered the reading worked for it too
+            cpu_time = time.thread_time() - start_cpu_time + stats.child_cpu_time - child_cpu_time
+            source.record(values, wall_time / 1e9, cpu_time)
+            failed = stats.errors > errors
+            unavailable = self._trip(source, failed, stats.timeouts > timeouts, wall_time / 1e9)
+            with self._lock:
+                if source.key in self.sources:
+                    self._completed.update(source.unavailable() if unavailable else values)
+                source.in_flight = False
+                source.finished = source.interval == 0 and not failed
+
+    def _trip(self, source: MetricSource, failed: bool, timed_out: bool, wall_time: float) -> bool:
+        """Feed a finished reading to the breaker of `source` and hold the source back while it's open.
+
+        Returns:
+        ----------
+        bool:
+            Whether the source is unavailable or left alone for now, its values are UNAVAILABLE then."""
+        breaker = source.breaker
+        if breaker is None:
+            return False
+
+        previous = breaker.state
+        state = breaker.record(failed, timed_out, wall_time)
+        if state != CircuitBreaker.CLOSED:
+            source.next_due = max(source.next_due, breaker.retry_at)
+        if state == CircuitBreaker.UNAVAILABLE:
+            # Probing it again fails quietly, the source logs its own errors
+            if previous != CircuitBreaker.UNAVAILABLE:
+                self.logger.warning(f"{source.key} isn't available on this machine, probing it again in {breaker.retry_at - time.monotonic():.0f}s: {source.stats.last_error}")
+        elif state == CircuitBreaker.OPEN:
+            self.logger.warning(f"{source.key} failed {breaker.failures} times in a row, retrying in {breaker.retry_at - time.monotonic():.1f}s")
+        elif previous != CircuitBreaker.CLOSED:
+            self.logger.info(f"{source.key} is available again")
+        return state != CircuitBreaker.CLOSED
+
+    def _publish(self):
+        with self._lock:
+            completed, self._completed = self._completed, {}
+
+        if not completed:
+            return
+
+        values = dict(self.snapshot.values)
+        values.update(completed)
+        snapshot = Snapshot(self.snapshot.sequence + 1, time.time(), values, frozenset(completed))
+        self.snapshot = snapshot
+
+        for listener in self._listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                self.logger.error(f"An error occurred while publishing snapshot {snapshot.sequence}: {e}")
+
+        for key, value in completed.items():
+            for callback in self._subscribers.get(key, ()):
+                try:
+                    callback(value)
+                except Exception as e:
+                    self.logger.error(f"An error occurred while publishing {key}: {e}")
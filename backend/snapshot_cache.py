@@ -0,0 +1,98 @@
+import time, threading
+
+from typing import Callable, Dict, Optional
+
+class SnapshotCache:
+    # How long in seconds a system-wide reading is shared before it's taken again
+    DEFAULT_TTLS = {
+        "net_io_counters": 0.2,
+        "disk_io_counters": 0.2,
+        "virtual_memory": 0.5,
+        "disk_usage": 5.0,
+        "disk_partitions": 60.0,
+    }
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, default_ttl: float = 0.2):
+        """Makes every expensive system call at most once per TTL and hands out the same result.
+
+        Callers asking for the same entry at the same time wait for one call instead of
+        making their own.
+
+        Args:
+        ---------
+            ttls (dict): Entry names mapped to their TTL in seconds, on top of `DEFAULT_TTLS`.
+            default_ttl (float): The TTL of entries that aren't in `ttls`.
+        """
+        self.ttls = dict(self.DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self.default_ttl = default_ttl
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+
+        self._lock = threading.Lock()
+        self._entry_locks: Dict[str, threading.Lock] = {}
+        self._entries: Dict[str, tuple] = {}
+
+    def get(self, name: str, function: Callable, ttl: Optional[float] = None):
+        """Get the cached result of `function`, calling it if the entry is older than its TTL.
+
+        Parameters:
+        ----------
+        name: str
+            The name of the entry, callers with the same name share results.
+        function: Callable
+            The function that takes a fresh reading.
+        ttl: float
+            Overrides the configured TTL of the entry.
+
+        Returns:
+        ----------
+        Any:
+            The shared result, callers must not modify it."""
+        return self.get_timed(name, function, ttl)[1]
+
+    def get_timed(self, name: str, function: Callable, ttl: Optional[float] = None) -> tuple:
+        """Like `get`, but also says when the result was read, e.g. to turn counters into rates.
+
+        Returns:
+        ----------
+        tuple:
+            The `time.monotonic()` time the result was read at and the shared result."""
+        ttl = self.ttls.get(name, self.default_ttl) if ttl is None else ttl
+
+        with self._lock:
+            entry_lock = self._entry_locks.get(name)
+            if entry_lock is None:
+                entry_lock = self._entry_locks[name] = threading.Lock()
+
+        with entry_lock:
+            entry = self._entries.get(name)
+            if entry is not None and time.monotonic() - entry[0] < ttl:
+                self.hits[name] = self.hits.get(name, 0) + 1
+                return entry
+
+            value = function()
+            entry = self._entries[name] = (time.monotonic(), value)
+            self.misses[name] = self.misses.get(name, 0) + 1
+            return entry
+
+    def invalidate(self, name: Optional[str] = None):
+        """Drop an entry, or every entry if none is given."""
+        if name is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(name, None)
+
+    def stats(self) -> Dict[str, dict]:
+        """Get the hits and misses of every entry.
+
+        Returns:
+        ----------
+        dict:
+            Entry names mapped to their hits, misses and hit ratio."""
+        stats = {}
+        for name in sorted(set(self.hits) | set(self.misses)):
+            hits = self.hits.get(name, 0)
+            misses = self.misses.get(name, 0)
+            stats[name] = {"hits": hits, "misses": misses, "hit_ratio": hits / (hits + misses)}
+        return stats
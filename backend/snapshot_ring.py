@@ -0,0 +1,270 @@
+import os, json, time, multiprocessing
+import numpy as np
+
+from typing import List, Optional, Tuple
+from multiprocessing import shared_memory
+
+from .objects import Snapshot
+
+MAGIC = b"NYXR"
+VERSION = 1
+
+# How a slot holds its value
+KIND_MISSING, KIND_FLOAT, KIND_INT, KIND_TEXT, KIND_BOOL, KIND_NONE = range(6)
+
+HEADER = np.dtype([
+    ("magic", "S4"),
+    ("version", "<u4"),
+    ("capacity", "<u4"),
+    ("key_count", "<u4"),
+    ("text_size", "<u4"),
+    ("layout_size", "<u4"),
+    ("write_sequence", "<u8"),
+    ("heartbeat", "<f8"),
+    ("pid", "<u4"),
+    ("reserved", "<u4"),
+], align = True)
+
+def record_dtype(key_count: int, text_size: int) -> np.dtype:
+    return np.dtype([
+        # Odd while the writer is in the record, twice the ring sequence once it's done
+        ("lock", "<u8"),
+        ("sequence", "<u8"),
+        ("timestamp", "<f8"),
+        ("numbers", "<f8", (key_count,)),
+        ("kinds", "u1", (key_count,)),
+        ("updated", "u1", (key_count,)),
+        ("texts", f"S{text_size}", (key_count,)),
+    ], align = True)
+
+# Segments this process created, it stays responsible for removing them however often it maps them
+created = set()
+
+def open_segment(name: str) -> shared_memory.SharedMemory:
+    """Map an existing segment without taking responsibility for removing it."""
+    try:
+        return shared_memory.SharedMemory(name, track = False) # type: ignore
+    except TypeError:
+        # Before Python 3.13 every process that maps a segment removes it when it exits, unless told otherwise
+        memory = shared_memory.SharedMemory(name)
+        if untracked(memory):
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(memory._name, "shared_memory") # type: ignore
+        return memory
+
+def untracked(memory: shared_memory.SharedMemory) -> bool:
+    """Whether `open_segment` took the segment away from this process' resource tracker."""
+    # Children of the creator share its resource tracker, which holds the segment once however often it's mapped
+    return (
+        getattr(memory, "_track", True)
+        and os.name == "posix"
+        and multiprocessing.parent_process() is None
+        and memory.name not in created
+    )
+
+class SnapshotRing:
+    def __init__(self, memory: shared_memory.SharedMemory, keys: List[str], capacity: int, text_size: int, owner: bool):
+        """A ring of snapshots with a fixed layout in shared memory, one writer and any number of readers.
+
+        The segment starts with a header and the key table as JSON, then `capacity` records,
+        each holding a number, a kind, an updated flag and a text of at most `text_size`
+        bytes for every key. Readers map the segment and copy records out of it, nothing is
+        pickled. Every record is guarded by a seqlock, a reader that overlapped a write
+        notices and reads again.
+
+        Use `create` in the writing process and `attach` in the readers.
+        """
+        self.memory = memory
+        self.name = memory.name
+        self.keys = keys
+        self.capacity = capacity
+        self.text_size = text_size
+        self.owner = owner
+
+        layout = json.dumps(keys).encode()
+        self.layout_size = len(layout)
+        self.header = np.ndarray((), HEADER, memory.buf, 0)
+        self.dtype = record_dtype(len(keys), text_size)
+        records_offset = self.records_offset(self.layout_size)
+        self.records = np.ndarray((capacity,), self.dtype, memory.buf, records_offset)
+
+        # Field views, writing through them touches the shared memory directly
+        self.locks = self.records["lock"]
+        self.numbers = self.records["numbers"]
+        self.kinds = self.records["kinds"]
+        self.updated = self.records["updated"]
+        self.texts = self.records["texts"]
+        self.columns = {key: index for index, key in enumerate(keys)}
+
+    @staticmethod
+    def records_offset(layout_size: int) -> int:
+        # Records start on a cache line after the key table
+        return (HEADER.itemsize + layout_size + 63) // 64 * 64
+
+    @classmethod
+    def create(cls, keys: List[str], capacity: int = 64, text_size: int = 64, name: Optional[str] = None) -> "SnapshotRing":
+        """Create a ring for the metric `keys`, in a new shared memory segment."""
+        layout = json.dumps(keys).encode()
+        size = cls.records_offset(len(layout)) + capacity * record_dtype(len(keys), text_size).itemsize
+        memory = shared_memory.SharedMemory(name, create = True, size = size)
+        created.add(memory.name)
+
+        ring = cls(memory, keys, capacity, text_size, owner = True)
+        memory.buf[HEADER.itemsize:HEADER.itemsize + len(layout)] = layout
+        ring.records[...] = np.zeros((), ring.dtype)
+        header = ring.header
+        header["capacity"] = capacity
+        header["key_count"] = len(keys)
+        header["text_size"] = text_size
+        header["layout_size"] = len(layout)
+        header["write_sequence"] = 0
+        header["heartbeat"] = time.time()
+        header["pid"] = os.getpid()
+        header["version"] = VERSION
+        # Last, readers check it to know the rest is there
+        header["magic"] = MAGIC
+        return ring
+
+    @classmethod
+    def attach(cls, name: str) -> "SnapshotRing":
+        """Map an existing ring by the name of its segment.
+
+        Raises:
+        ----------
+        ValueError:
+            If the segment doesn't hold a ring of this version."""
+        memory = open_segment(name)
+        header = np.ndarray((), HEADER, memory.buf, 0)
+        if bytes(header["magic"]) != MAGIC or int(header["version"]) != VERSION:
+            memory.close()
+            raise ValueError(f"{name} doesn't hold a version {VERSION} snapshot ring")
+
+        layout_size, capacity, text_size = int(header["layout_size"]), int(header["capacity"]), int(header["text_size"])
+        keys = json.loads(bytes(memory.buf[HEADER.itemsize:HEADER.itemsize + layout_size]))
+        del header
+        return cls(memory, keys, capacity, text_size, owner = False)
+
+    @property
+    def pid(self) -> int:
+        """The process that created the ring."""
+        return int(self.header["pid"])
+
+    @property
+    def write_sequence(self) -> int:
+        """How many snapshots were written, the newest one is this number."""
+        return int(self.header["write_sequence"])
+
+    @property
+    def heartbeat(self) -> float:
+        """When the writer last said it's alive, as `time.time()`."""
+        return float(self.header["heartbeat"])
+
+    def beat(self):
+        self.header["heartbeat"] = time.time()
+
+    def write(self, snapshot: Snapshot):
+        """Write a snapshot into the next record, meant to be registered as a scheduler listener.
+
+        Values of keys outside the layout are dropped, texts are cut to `text_size` bytes."""
+        sequence = self.write_sequence + 1
+        index = (sequence - 1) % self.capacity
+        numbers, kinds, updated, texts = self.numbers[index], self.kinds[index], self.updated[index], self.texts[index]
+
+        self.locks[index] = 2 * sequence - 1
+        kinds[:] = KIND_MISSING
+        updated[:] = 0
+        for key, value in snapshot.values.items():
+            column = self.columns.get(key)
+            if column is None:
+                continue
+            if isinstance(value, bool):
+                kinds[column], numbers[column] = KIND_BOOL, value
+            elif isinstance(value, int):
+                kinds[column], numbers[column] = KIND_INT, value
+            elif isinstance(value, float):
+                kinds[column], numbers[column] = KIND_FLOAT, value
+            elif value is None:
+                kinds[column] = KIND_NONE
+            else:
+                kinds[column], texts[column] = KIND_TEXT, str(value).encode()[:self.text_size]
+            updated[column] = key in snapshot.updated
+        self.records["sequence"][index] = snapshot.sequence
+        self.records["timestamp"][index] = snapshot.timestamp
+        self.locks[index] = 2 * sequence
+
+        self.header["write_sequence"] = sequence
+
+    def read(self, after: int = 0) -> List[Tuple[int, Snapshot]]:
+        """Get the snapshots written after the ring sequence `after`, oldest first.
+
+        Only the newest `capacity` are still there, and a record that got overwritten
+        while it was copied is left out.
+
+        Returns:
+        ----------
+        list:
+            Ring sequences and their snapshots, `sequence` of a snapshot is the writer's."""
+        newest = self.write_sequence
+        snapshots = []
+        for sequence in range(max(after + 1, newest - self.capacity + 1), newest + 1):
+            index = (sequence - 1) % self.capacity
+            lock = int(self.locks[index])
+            if lock != 2 * sequence:
+                # Being written, or already overwritten by a newer one
+                continue
+            record = self.records[index].copy()
+            if int(self.locks[index]) == lock:
+                snapshots.append((sequence, self.decode(record)))
+        return snapshots
+
+    def read_latest(self) -> Optional[Snapshot]:
+        """Get the newest snapshot, None if nothing was written yet."""
+        for _ in range(3):
+            newest = self.write_sequence
+            if newest == 0:
+                return None
+            snapshots = self.read(newest - 1)
+            if snapshots:
+                return snapshots[-1][1]
+        return None
+
+    def decode(self, record) -> Snapshot:
+        values = {}
+        updated = []
+        numbers, kinds, texts, flags = record["numbers"].tolist(), record["kinds"].tolist(), record["texts"], record["updated"]
+        for column, key in enumerate(self.keys):
+            kind = kinds[column]
+            if kind == KIND_MISSING:
+                continue
+            if kind == KIND_FLOAT:
+                value = numbers[column]
+            elif kind == KIND_INT:
+                value = int(numbers[column])
+            elif kind == KIND_TEXT:
+                value = texts[column].decode(errors = "ignore")
+            elif kind == KIND_BOOL:
+                value = bool(numbers[column])
+            else:
+                value = None
+            values[key] = value
+            if flags[column]:
+                updated.append(key)
+        return Snapshot(int(record["sequence"]), float(record["timestamp"]), values, frozenset(updated))
+
+    def close(self, unlink: Optional[bool] = None):
+        """Unmap the segment and remove it, by default only if this process created it.
+
+        A reader removes it when the writer can't anymore, e.g. after killing it."""
+        # The views have to go before the mapping can be closed
+        self.header = self.records = self.locks = self.numbers = self.kinds = self.updated = self.texts = None # type: ignore
+        self.memory.close()
+        if self.owner if unlink is None else unlink:
+            if untracked(self.memory):
+                # unlink() tells the resource tracker it's gone, which has to know it then
+                from multiprocessing import resource_tracker
+                resource_tracker.register(self.memory._name, "shared_memory") # type: ignore
+            try:
+                self.memory.unlink()
+            except FileNotFoundError:
+                pass
+            created.discard(self.name)
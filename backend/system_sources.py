@@ -0,0 +1,80 @@
+from typing import List, Optional
+
+from .command_channel import CommandChannel
+from .async_command_channel import AsyncCommandChannel
+
+class SystemSources:
+    def __init__(self, nvml = None):
+        """Everything NyxBase reads from outside the process: psutil, the registry, shells and NVML.
+
+        NyxBase never touches those directly, so the `FakeSystemSources` of the benchmarks can
+        stand in for the machine on systems without Windows or a GPU. psutil and winreg are
+        imported the first time they are needed.
+
+        Args:
+        ---------
+            nvml: The NVML module to use, `pynvml` (imported by GPUTelemetry) if not given.
+        """
+        self.nvml = nvml
+        self._psutil = None
+
+    @property
+    def psutil(self):
+        if self._psutil is None:
+            import psutil
+            self._psutil = psutil
+        return self._psutil
+
+    def virtual_memory(self):
+        return self.psutil.virtual_memory()
+
+    def disk_partitions(self):
+        return self.psutil.disk_partitions()
+
+    def disk_usage(self, path: str):
+        return self.psutil.disk_usage(path)
+
+    def disk_io_counters(self):
+        return self.psutil.disk_io_counters()
+
+    def net_io_counters(self, pernic: bool = False):
+        return self.psutil.net_io_counters(pernic = pernic)
+
+    def sensors_battery(self):
+        # Not every platform has batteries in psutil
+        sensors_battery = getattr(self.psutil, "sensors_battery", None)
+        return sensors_battery() if sensors_battery is not None else None
+
+    def read_registry(self, path: str, name: str):
+        """Read a value under HKEY_LOCAL_MACHINE.
+
+        Parameters:
+        ----------
+        path: str
+            The key path, e.g. `HARDWARE\\DESCRIPTION\\System\\BIOS`.
+        name: str
+            The value name.
+
+        Returns:
+        ----------
+        Any:
+            The value."""
+        import winreg
+
+        key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, path)
+        try:
+            return winreg.QueryValueEx(key, name)[0]
+        finally:
+            winreg.CloseKey(key)
+
+    def create_channel(self, command: List[str], timeout: Optional[float] = None) -> CommandChannel:
+        """Get a persistent shell, see CommandChannel."""
+        if timeout is None:
+            return CommandChannel(command)
+        return CommandChannel(command, timeout = timeout)
+
+    def create_async_channel(self, command: List[str], timeout: Optional[float] = None, size: int = 2) -> AsyncCommandChannel:
+        """Get up to `size` persistent shells for asyncio, see AsyncCommandChannel."""
+        if timeout is None:
+            return AsyncCommandChannel(command, size = size)
+        return AsyncCommandChannel(command, timeout = timeout, size = size)
@@ -0,0 +1,150 @@
+import time
+
+from typing import Callable, Dict, FrozenSet, Optional
+
+from .logger import Logger
+from .scheduler import Scheduler, MetricSource
+
+class ThrottleProfile:
+    def __init__(
+        self,
+        name: str,
+        title: str,
+        interval_scale: float,
+        allowed_sources: Optional[FrozenSet[str]] = None,
+    ):
+        """How hard the scheduler samples while the profile is active.
+
+        Args:
+        ---------
+            name (str): The name the profile is known by.
+            title (str): The name shown to the user.
+            interval_scale (float): Every source interval is multiplied by this.
+            allowed_sources (frozenset): The keys of the only sources to sample, every source if None.
+        """
+        self.name = name
+        self.title = title
+        self.interval_scale = interval_scale
+        self.allowed_sources = allowed_sources
+
+    def __str__(self):
+        return f"ThrottleProfile: {self.name} | Interval scale: {self.interval_scale} | Sources: {'all' if self.allowed_sources is None else len(self.allowed_sources)}"
+
+class ThrottlePolicy:
+    # The sources that are needed to notice overheating and memory pressure
+    ALERT_SOURCES = frozenset({"cpu.temperature", "gpu", "ram"})
+    # What the source of `get_metric_source` publishes
+    METRIC_KEYS = ("throttle.profile", "throttle.wakeups_per_second", "throttle.samples_per_second")
+    PROFILES = {
+        "full": ThrottleProfile("full", "Full", 1.0),
+        "reduced": ThrottleProfile("reduced", "Reduced", 4.0),
+        "alerts": ThrottleProfile("alerts", "Alerts only", 2.0, ALERT_SOURCES),
+    }
+
+    def __init__(
+        self,
+        scheduler: Scheduler,
+        is_on_battery: Callable[[], bool],
+        get_idle_time: Callable[[], float],
+        idle_after: float = 300,
+        interval: int = 5000,
+    ):
+        """Switches the scheduler between sampling profiles depending on what the user can see.
+
+        - The window is hidden: only what alerts need is sampled.
+        - The window is shown, but the computer is on battery or the user is idle: everything is sampled, slower.
+        - Otherwise: everything is sampled at full rate.
+
+        The policy samples the power and idle state itself through the `throttle` source,
+        which also publishes the active profile and the scheduler's wakeups per second.
+
+        Args:
+        ---------
+            scheduler (Scheduler): The scheduler to throttle.
+            is_on_battery (Callable): Tells whether the computer runs on battery.
+            get_idle_time (Callable): Gets the seconds since the last user input.
+            idle_after (float): The seconds without input after which the user counts as idle.
+            interval (int): How often the power and idle state are checked in milliseconds.
+        """
+        self.logger = Logger()
+        self.scheduler = scheduler
+        self.is_on_battery = is_on_battery
+        self.get_idle_time = get_idle_time
+        self.idle_after = idle_after
+        self.interval = interval
+
+        self.visible = True
+        self.on_battery = False
+        self.idle = False
+        self.profile = self.PROFILES["full"]
+
+        self._last_wakeups = scheduler.wakeups
+        self._last_samples = scheduler.samples
+        self._last_time = time.monotonic()
+
+    def get_metric_source(self) -> MetricSource:
+        """Get the source that keeps the policy up to date, to register on the scheduler."""
+        return MetricSource("throttle", self.update, self.interval, fields = {
+            "profile": lambda status: status["profile"],
+            "wakeups_per_second": lambda status: status["wakeups_per_second"],
+            "samples_per_second": lambda status: status["samples_per_second"],
+        })
+
+    def set_visible(self, visible: bool):
+        """Tell the policy whether the window is shown, meant to be called when it's hidden or shown."""
+        self.visible = visible
+        self.apply()
+
+    def choose(self) -> ThrottleProfile:
+        if not self.visible:
+            return self.PROFILES["alerts"]
+        if self.on_battery or self.idle:
+            return self.PROFILES["reduced"]
+        return self.PROFILES["full"]
+
+    def apply(self):
+        """Switch to the profile the current state calls for, if it isn't active already."""
+        profile = self.choose()
+        if profile is self.profile:
+            return
+
+        self.profile = profile
+        # The policy has to keep running to notice when to switch back
+        allowed_sources = None if profile.allowed_sources is None else profile.allowed_sources | {"throttle"}
+        self.scheduler.throttle(profile.interval_scale, allowed_sources)
+        self.logger.debug(f"Switched to the {profile.name} sampling profile")
+
+    def update(self) -> Dict[str, object]:
+        """Check the power and idle state, switch profiles if needed and measure the wakeup rate.
+
+        Returns:
+        ----------
+        dict:
+            The `profile` title, `wakeups_per_second` and `samples_per_second`."""
+        try:
+            self.on_battery = self.is_on_battery()
+        except Exception as e:
+            self.logger.error(f"An error occurred while retrieving the power source: {e}")
+            self.on_battery = False
+
+        try:
+            self.idle = self.get_idle_time() >= self.idle_after
+        except Exception as e:
+            self.logger.error(f"An error occurred while retrieving the idle time: {e}")
+            self.idle = False
+
+        self.apply()
+        return self.get_status()
+
+    def get_status(self) -> Dict[str, object]:
+        now = time.monotonic()
+        elapsed = max(now - self._last_time, 1e-9)
+        wakeups = self.scheduler.wakeups - self._last_wakeups
+        samples = self.scheduler.samples - self._last_samples
+        self._last_wakeups, self._last_samples, self._last_time = self.scheduler.wakeups, self.scheduler.samples, now
+
+        return {
+            "profile": self.profile.title,
+            "wakeups_per_second": round(wakeups / elapsed, 2),
+            "samples_per_second": round(samples / elapsed, 2),
+        }
@@ -1,15 +1,18 @@
-from time import time
+from time import perf_counter_ns
 from .logger import Logger
+from .tracer import tracer
 
 class Timer:
     def __init__(self, class_name: str):
         self.class_name = class_name
 
     def __enter__(self):
-        self.start_time = time()
         self.logger = Logger()
+        self.span = tracer.span(self.class_name).__enter__()
+        self.start_time = perf_counter_ns()
         return self
-    
+
     def __exit__(self, exc_type, exc_val, exc_tb):
-        elapsed_time = time() - self.start_time
-        self.logger.debug(f"Finished initializing {self.class_name} in {elapsed_time:.2f}s")
+        elapsed_time = (perf_counter_ns() - self.start_time) / 1e6
+        self.span.__exit__(exc_type, exc_val, exc_tb)
+        self.logger.debug(f"Finished initializing {self.class_name} in {elapsed_time:.2f}ms")
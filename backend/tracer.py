@@ -0,0 +1,189 @@
+import os, sys, json, threading
+
+from time import perf_counter_ns
+from typing import List, Optional
+
+class _TracedLoader:
+    def __init__(self, loader, tracer: "Tracer"):
+        # Stands in for a module loader and times it, everything else goes to the real loader
+        self._loader = loader
+        self._tracer = tracer
+
+    def create_module(self, spec):
+        if not hasattr(self._loader, "create_module"):
+            return None
+        # Extension modules (e.g. PyQt5.QtCore) do most of their loading here
+        with self._tracer.span(f"{spec.name} (load)", "import"):
+            return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        with self._tracer.span(module.__name__, "import"):
+            self._loader.exec_module(module)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+class _ImportHook:
+    def __init__(self, tracer: "Tracer"):
+        self.tracer = tracer
+        self._local = threading.local()
+
+    def find_spec(self, name, path, target = None):
+        # Ask the rest of sys.meta_path, the hook only wraps what they find
+        if getattr(self._local, "finding", False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(name, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.finding = False
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TracedLoader(spec.loader, self.tracer)
+        return spec
+
+class _Span:
+    def __init__(self, tracer: "Tracer", name: str, category: str):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.end = perf_counter_ns()
+        self.tracer.add_span(self.name, self.category, self.start, self.end)
+
+class _NoSpan:
+    start = end = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+_NO_SPAN = _NoSpan()
+
+class Tracer:
+    def __init__(self, output_path: Optional[str] = None):
+        """Records nested spans and marks of the startup and exports them as a Chrome trace.
+
+        Tracing is enabled by giving it an output path, which `tracer` takes from the
+        `NYX_TRACE` environment variable (`1` writes `nyx_trace.json` in the working directory).
+        When disabled, spans cost an attribute check. Open the file in chrome://tracing or
+        https://ui.perfetto.dev, spans on the same thread nest by time.
+
+        Args:
+        ---------
+            output_path (str): Where `export` writes the trace, tracing is disabled if None.
+        """
+        self.output_path = output_path
+        self.enabled = output_path is not None
+        self.events: List[dict] = []
+        self.marks = {}
+        self.origin = perf_counter_ns()
+        self.export_after = set()
+
+        self._lock = threading.Lock()
+        self._hook: Optional[_ImportHook] = None
+
+    def install_import_hook(self):
+        """Time every import from now on, as `import` spans. Install it before the heavy imports."""
+        if self.enabled and self._hook is None:
+            self._hook = _ImportHook(self)
+            sys.meta_path.insert(0, self._hook)
+
+    def remove_import_hook(self):
+        if self._hook is not None:
+            sys.meta_path.remove(self._hook)
+            self._hook = None
+
+    def span(self, name: str, category: str = "startup"):
+        """Get a context manager that records the code it wraps as a span."""
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self, name, category)
+
+    def add_span(self, name: str, category: str, start: int, end: int):
+        """Record a span from `perf_counter_ns()` timestamps."""
+        if not self.enabled:
+            return
+        event = {
+            "name": name, "cat": category, "ph": "X",
+            "ts": (start - self.origin) / 1000, "dur": (end - start) / 1000,
+            "pid": os.getpid(), "tid": threading.get_ident(),
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def mark(self, name: str) -> bool:
+        """Record a moment, e.g. `first-paint`. Only the first mark of every name is kept.
+
+        Returns:
+        ----------
+        bool:
+            True if this was the first mark with that name."""
+        if not self.enabled or name in self.marks:
+            return False
+        timestamp = perf_counter_ns()
+        with self._lock:
+            if name in self.marks:
+                return False
+            self.marks[name] = timestamp
+            self.events.append({
+                "name": name, "cat": "mark", "ph": "i", "s": "g",
+                "ts": (timestamp - self.origin) / 1000,
+                "pid": os.getpid(), "tid": threading.get_ident(),
+            })
+            export = bool(self.export_after) and self.export_after <= self.marks.keys()
+
+        if export:
+            self.export_after = set()
+            self.export()
+        return True
+
+    def export_after_marks(self, *names: str):
+        """Export once every one of the marks `names` is recorded, e.g. when startup is over."""
+        self.export_after = set(names)
+
+    def export(self, output_path: Optional[str] = None) -> Optional[str]:
+        """Write everything recorded so far as a Chrome trace JSON file.
+
+        Returns:
+        ----------
+        str:
+            The path that was written, None if tracing is disabled."""
+        output_path = output_path or self.output_path
+        if not self.enabled or output_path is None:
+            return None
+
+        with self._lock:
+            events = list(self.events)
+        threads = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": thread.ident, "args": {"name": thread.name}}
+            for thread in threading.enumerate()
+        ]
+        metadata = {name: (timestamp - self.origin) / 1e6 for name, timestamp in self.marks.items()}
+
+        with open(output_path, "w", encoding = "utf-8") as file:
+            json.dump({"traceEvents": threads + events, "displayTimeUnit": "ms", "otherData": {"marks": metadata}}, file)
+        return output_path
+
+def _output_path() -> Optional[str]:
+    value = os.getenv("NYX_TRACE")
+    if not value or value == "0":
+        return None
+    return "nyx_trace.json" if value == "1" else value
+
+# The process-wide tracer, importing it has to stay cheap since it's imported first
+tracer = Tracer(_output_path())
@@ -0,0 +1,210 @@
+import os, sys, json, platform, argparse, tracemalloc
+
+from time import perf_counter_ns
+from typing import Callable, Dict, List, Optional
+
+from backend.logger import Logger
+from backend.nyx_base import NyxBase
+from backend.gpu_telemetry import GPUTelemetry
+from backend.snapshot_cache import SnapshotCache
+from .fake_system_sources import FakeSystemSources
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "nyx_base.json")
+
+# Every getter the scheduler samples, called the way its MetricSource calls it
+GETTERS: Dict[str, Callable[[NyxBase], object]] = {
+    "get_cpu_usage": lambda nyx_base: nyx_base.get_cpu_usage(),
+    "get_cpu_temperature": lambda nyx_base: nyx_base.get_cpu_temperature(),
+    "get_cpu_name": lambda nyx_base: nyx_base.get_cpu_name(),
+    "get_cpu": lambda nyx_base: nyx_base.get_cpu(),
+    "get_gpu": lambda nyx_base: nyx_base.get_gpu(),
+    "get_gpu_temperature": lambda nyx_base: nyx_base.get_gpu_temperature(),
+    "get_gpu_name": lambda nyx_base: nyx_base.get_gpu_name(),
+    "get_fans": lambda nyx_base: nyx_base.get_fans(),
+    "get_ram_info": lambda nyx_base: nyx_base.get_ram_info(),
+    "get_harddisk_info": lambda nyx_base: nyx_base.get_harddisk_info(),
+    "get_drive_type": lambda nyx_base: nyx_base.get_drive_type(),
+    "get_disk_io_percentage": lambda nyx_base: nyx_base.get_disk_io_percentage(),
+    "get_network_speed": lambda nyx_base: nyx_base.get_network_speed("Wi-Fi"),
+    "get_computer_model": lambda nyx_base: nyx_base.get_computer_model(),
+    "get_power_plan": lambda nyx_base: nyx_base.get_power_plan(),
+    "is_on_battery": lambda nyx_base: nyx_base.is_on_battery(),
+}
+
+# Counts are deterministic, any growth is a regression
+COUNTS = ("system_calls", "nvml_calls", "channel_queries", "spawns")
+
+def create_nyx_base() -> NyxBase:
+    """Get a NyxBase on fake sources that reads through on every call.
+
+    Nothing is cached, so every call pays for the readings it needs and the counts
+    don't depend on how fast the machine runs the benchmark."""
+    sources = FakeSystemSources()
+    return NyxBase(
+        sources = sources,
+        cache = SnapshotCache(ttls = {name: 0 for name in SnapshotCache.DEFAULT_TTLS}, default_ttl = 0),
+        gpu_telemetry = GPUTelemetry(sources.nvml, max_age = 0),
+    )
+
+def percentile(ordered: List[int], fraction: float) -> int:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def bench_getter(getter: Callable[[NyxBase], object], iterations: int, warmup: int) -> dict:
+    """Measure one getter on a fresh NyxBase.
+
+    Returns:
+    ----------
+    dict:
+        Latency percentiles in microseconds, allocations in bytes and counts per call."""
+    nyx_base = create_nyx_base()
+    sources: FakeSystemSources = nyx_base.sources # type: ignore
+
+    # Sessions are opened and shells spawned here, the counts below are for steady state
+    for _ in range(warmup):
+        getter(nyx_base)
+    system_calls = sum(sources.calls.values())
+    nvml_calls = sum(sources.nvml.calls.values())
+    channel_queries = sources.queries
+    spawns = sources.spawns
+
+    latencies = []
+    for _ in range(iterations):
+        start = perf_counter_ns()
+        getter(nyx_base)
+        latencies.append(perf_counter_ns() - start)
+    latencies.sort()
+
+    counts = {
+        "system_calls": (sum(sources.calls.values()) - system_calls) / iterations,
+        "nvml_calls": (sum(sources.nvml.calls.values()) - nvml_calls) / iterations,
+        "channel_queries": (sources.queries - channel_queries) / iterations,
+        "spawns": sources.spawns - spawns,
+    }
+
+    # Allocations are measured on their own, tracemalloc slows every allocation down
+    peaks = []
+    tracemalloc.start()
+    start_size = tracemalloc.get_traced_memory()[0]
+    for _ in range(min(iterations, 200)):
+        tracemalloc.reset_peak()
+        size = tracemalloc.get_traced_memory()[0]
+        getter(nyx_base)
+        peaks.append(tracemalloc.get_traced_memory()[1] - size)
+    retained = tracemalloc.get_traced_memory()[0] - start_size
+    tracemalloc.stop()
+    peaks.sort()
+
+    nyx_base.close()
+    return {
+        "latency_us": {
+            "p50": percentile(latencies, 0.50) / 1000,
+            "p95": percentile(latencies, 0.95) / 1000,
+            "p99": percentile(latencies, 0.99) / 1000,
+            "max": latencies[-1] / 1000,
+        },
+        "allocated_bytes": {
+            "p50": percentile(peaks, 0.50),
+            "max": peaks[-1],
+            "retained": retained,
+        },
+        **counts,
+    }
+
+def run(iterations: int = 2000, warmup: int = 50, names: Optional[List[str]] = None) -> dict:
+    getters = {name: GETTERS[name] for name in names} if names else GETTERS
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "iterations": iterations,
+        "getters": {name: bench_getter(getter, iterations, warmup) for name, getter in getters.items()},
+    }
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.5, slack: float = 20.0) -> List[str]:
+    """Compare results against a baseline.
+
+    Latencies and allocations regress when they grow by more than `tolerance` (a fraction)
+    plus `slack` (microseconds, or bytes for allocations), counts regress on any growth.
+
+    Returns:
+    ----------
+    list:
+        A description of every regression, empty if there is none."""
+    regressions = []
+    for name, result in results["getters"].items():
+        expected = baseline["getters"].get(name)
+        if expected is None:
+            continue
+
+        for percentile_name in ("p50", "p95"):
+            value = result["latency_us"][percentile_name]
+            limit = expected["latency_us"][percentile_name] * (1 + tolerance) + slack
+            if value > limit:
+                regressions.append(f"{name}: {percentile_name} latency is {value:.1f}us, the limit is {limit:.1f}us")
+
+        value = result["allocated_bytes"]["p50"]
+        limit = expected["allocated_bytes"]["p50"] * (1 + tolerance) + slack
+        if value > limit:
+            regressions.append(f"{name}: allocates {value} bytes per call, the limit is {limit:.0f} bytes")
+
+        for count in COUNTS:
+            if result[count] > expected[count]:
+                regressions.append(f"{name}: {count} went from {expected[count]} to {result[count]} per call")
+
+    return regressions
+
+def print_results(results: dict, file = sys.stdout):
+    header = f"{'getter':<24}{'p50 us':>9}{'p95 us':>9}{'p99 us':>9}{'max us':>10}{'alloc B':>9}{'sys':>6}{'nvml':>6}{'query':>6}{'spawn':>6}"
+    print(header, file = file)
+    print("-" * len(header), file = file)
+    for name, result in results["getters"].items():
+        latency = result["latency_us"]
+        print(
+            f"{name:<24}{latency['p50']:>9.1f}{latency['p95']:>9.1f}{latency['p99']:>9.1f}{latency['max']:>10.1f}"
+            f"{result['allocated_bytes']['p50']:>9}{result['system_calls']:>6g}{result['nvml_calls']:>6g}"
+            f"{result['channel_queries']:>6g}{result['spawns']:>6}",
+            file = file,
+        )
+
+def main(argv: List[str]) -> int:
+    """Benchmark the NyxBase getters on fake system sources, e.g.
+    `python -m benchmarks.bench_nyx_base --compare` to check against the stored baseline.
+
+    Returns:
+    ----------
+    int:
+        The exit code, 1 if a comparison found regressions."""
+    parser = argparse.ArgumentParser(prog = "bench_nyx_base", description = "Benchmark the NyxBase getters on fake system sources.")
+    parser.add_argument("--iterations", type = int, default = 2000, help = "measured calls per getter (default: 2000)")
+    parser.add_argument("--getters", help = "comma separated getters to run (default: all)")
+    parser.add_argument("--output", help = "write the results as JSON to this file")
+    parser.add_argument("--save-baseline", action = "store_true", help = "write the results as the stored baseline")
+    parser.add_argument("--compare", nargs = "?", const = BASELINE_PATH, help = "fail on regressions against a baseline (default: the stored one)")
+    parser.add_argument("--tolerance", type = float, default = 0.5, help = "allowed latency and allocation growth as a fraction (default: 0.5)")
+    parser.add_argument("--slack", type = float, default = 20.0, help = "allowed growth on top, in microseconds or bytes (default: 20)")
+    arguments = parser.parse_args(argv)
+
+    # Stdout belongs to the table, logs go to stderr
+    Logger.file = sys.stderr
+
+    names = [name.strip() for name in arguments.getters.split(",") if name.strip()] if arguments.getters else None
+    results = run(arguments.iterations, names = names)
+    print_results(results)
+
+    for path in filter(None, (arguments.output, BASELINE_PATH if arguments.save_baseline else None)):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok = True)
+        with open(path, "w", encoding = "utf-8") as file:
+            json.dump(results, file, indent = 2)
+
+    if arguments.compare:
+        with open(arguments.compare, encoding = "utf-8") as file:
+            regressions = compare(results, json.load(file), arguments.tolerance, arguments.slack)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions against {arguments.compare}")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,100 @@
+from typing import List, Optional
+
+class FakeNVMLError(Exception):
+    pass
+
+class FakeUtilization:
+    def __init__(self, gpu: int, memory: int):
+        self.gpu = gpu
+        self.memory = memory
+
+class FakeDevice:
+    def __init__(
+        self,
+        name: str = "NVIDIA GeForce RTX 3060 Laptop GPU",
+        temperature: int = 54,
+        usage: int = 37,
+        clock: int = 1410,
+        memory_clock: int = 7001,
+        fan_speed: Optional[int] = 42,
+    ):
+        self.name = name
+        self.temperature = temperature
+        self.usage = usage
+        self.clock = clock
+        self.memory_clock = memory_clock
+        self.fan_speed = fan_speed
+
+class FakeNVML:
+    NVMLError = FakeNVMLError
+    NVML_TEMPERATURE_GPU = 0
+    NVML_CLOCK_GRAPHICS = 0
+    NVML_CLOCK_MEM = 2
+
+    def __init__(self, devices: Optional[List[FakeDevice]] = None, fail_init: bool = False):
+        """Stands in for the `pynvml` module on machines without an NVIDIA GPU.
+
+        Every call is counted in `calls` so callers can check how often NVML was hit.
+
+        Args:
+        ---------
+            devices (list): The fake GPUs, one default device if not given.
+            fail_init (bool): Make `nvmlInit` fail like it does when no driver is installed.
+        """
+        self.devices = [FakeDevice()] if devices is None else devices
+        self.fail_init = fail_init
+        self.initialized = False
+        self.calls = {}
+
+    def _count(self, name: str):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def _device(self, handle) -> FakeDevice:
+        if not self.initialized:
+            raise FakeNVMLError("Uninitialized")
+        return self.devices[handle]
+
+    def nvmlInit(self):
+        self._count("nvmlInit")
+        if self.fail_init:
+            raise FakeNVMLError("NVML Shared Library Not Found")
+        self.initialized = True
+
+    def nvmlShutdown(self):
+        self._count("nvmlShutdown")
+        self.initialized = False
+
+    def nvmlDeviceGetCount(self) -> int:
+        self._count("nvmlDeviceGetCount")
+        if not self.initialized:
+            raise FakeNVMLError("Uninitialized")
+        return len(self.devices)
+
+    def nvmlDeviceGetHandleByIndex(self, index: int):
+        self._count("nvmlDeviceGetHandleByIndex")
+        self._device(index)
+        return index
+
+    def nvmlDeviceGetName(self, handle) -> str:
+        self._count("nvmlDeviceGetName")
+        return self._device(handle).name
+
+    def nvmlDeviceGetTemperature(self, handle, sensor: int) -> int:
+        self._count("nvmlDeviceGetTemperature")
+        return self._device(handle).temperature
+
+    def nvmlDeviceGetUtilizationRates(self, handle) -> FakeUtilization:
+        self._count("nvmlDeviceGetUtilizationRates")
+        return FakeUtilization(self._device(handle).usage, 0)
+
+    def nvmlDeviceGetClockInfo(self, handle, clock_type: int) -> int:
+        self._count("nvmlDeviceGetClockInfo")
+        device = self._device(handle)
+        return device.memory_clock if clock_type == self.NVML_CLOCK_MEM else device.clock
+
+    def nvmlDeviceGetFanSpeed(self, handle) -> int:
+        self._count("nvmlDeviceGetFanSpeed")
+        fan_speed = self._device(handle).fan_speed
+        if fan_speed is None:
+            raise FakeNVMLError("Not Supported")
+        return fan_speed
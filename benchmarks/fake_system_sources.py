@@ -0,0 +1,185 @@
+import time, asyncio
+
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+from backend.instrumentation import record_spawn
+
+from .fake_nvml import FakeNVML
+
+# The shapes psutil returns, with the fields NyxBase reads
+svmem = namedtuple("svmem", ["total", "available", "percent", "used", "free"])
+sdiskpart = namedtuple("sdiskpart", ["device", "mountpoint", "fstype", "opts"])
+sdiskusage = namedtuple("sdiskusage", ["total", "used", "free", "percent"])
+sdiskio = namedtuple("sdiskio", ["read_count", "write_count", "read_bytes", "write_bytes", "read_time", "write_time"])
+snetio = namedtuple("snetio", ["bytes_sent", "bytes_recv", "packets_sent", "packets_recv", "errin", "errout", "dropin", "dropout"])
+sbattery = namedtuple("sbattery", ["percent", "secsleft", "power_plugged"])
+
+class FakeCommandChannel:
+    # Replies of the PowerShell queries NyxBase runs, matched by a part of the query
+    DEFAULT_REPLIES = {
+        "ThermalZoneInformation": "51.85",
+        "Win32_Processor": "23",
+        "Get-PhysicalDisk": "SSD",
+        "Win32_PowerPlan": "Balanced",
+    }
+
+    def __init__(self, command: List[str], replies: Optional[Dict[str, str]] = None, latency: float = 0.0):
+        """Stands in for a CommandChannel, answering queries from a table instead of a shell.
+
+        The shell counts as spawned on the first query, like the real channel.
+
+        Args:
+        ---------
+            command (list): The shell the real channel would start.
+            replies (dict): Parts of queries mapped to their replies, on top of `DEFAULT_REPLIES`.
+            latency (float): Seconds every query takes, like a real shell would.
+        """
+        self.command = command
+        self.replies = dict(self.DEFAULT_REPLIES)
+        self.replies.update(replies or {})
+        self.latency = latency
+        self.spawns = 0
+        self.queries = 0
+        self.timeouts = 0
+        self.started = False
+
+    @property
+    def alive(self) -> bool:
+        return self.started
+
+    def start(self):
+        self.started = True
+        self.spawns += 1
+        record_spawn()
+
+    def close(self):
+        self.started = False
+
+    def query(self, command: str, timeout: Optional[float] = None) -> str:
+        if not self.started:
+            self.start()
+        self.queries += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return self.reply(command)
+
+    def reply(self, command: str) -> str:
+        for part, reply in self.replies.items():
+            if part in command:
+                return reply
+        raise RuntimeError(f"The fake channel has no reply for: {command}")
+
+class FakeAsyncCommandChannel(FakeCommandChannel):
+    """Stands in for an AsyncCommandChannel, queries wait out their latency without blocking the loop."""
+
+    async def close(self): # type: ignore
+        self.started = False
+
+    async def query(self, command: str, timeout: Optional[float] = None) -> str: # type: ignore
+        if not self.started:
+            self.start()
+        self.queries += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.reply(command)
+
+class FakeSystemSources:
+    def __init__(
+        self,
+        nvml: Optional[FakeNVML] = None,
+        registry: Optional[Dict[str, object]] = None,
+        replies: Optional[Dict[str, str]] = None,
+        on_battery: bool = False,
+        latency: float = 0.0,
+    ):
+        """Stands in for SystemSources with fixed, deterministic readings.
+
+        Counters grow by the same amount on every call, so rates are stable, and every call
+        is counted in `calls`, so callers can check how often the system would have been hit.
+
+        Args:
+        ---------
+            nvml (FakeNVML): The NVML stand-in, one default GPU if not given.
+            registry (dict): `path\\name` mapped to registry values, on top of the defaults.
+            replies (dict): Replies of the fake shells, see FakeCommandChannel.
+            on_battery (bool): Whether the fake machine runs on battery.
+            latency (float): Seconds every query of the fake shells takes.
+        """
+        self.nvml = nvml if nvml is not None else FakeNVML()
+        self.registry = {
+            "HARDWARE\\DESCRIPTION\\System\\BIOS\\SystemProductName": "GF63 Thin 10SC",
+            "HARDWARE\\DESCRIPTION\\System\\CentralProcessor\\0\\ProcessorNameString": "Intel(R) Core(TM) i5-10500H CPU @ 2.50GHz",
+        }
+        self.registry.update(registry or {})
+        self.replies = replies
+        self.on_battery = on_battery
+        self.latency = latency
+        self.channels: List[FakeCommandChannel] = []
+        self.calls: Dict[str, int] = {}
+
+        self._disk_io = 0
+        self._net_io = 0
+
+    def _count(self, name: str):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    @property
+    def spawns(self) -> int:
+        """The shells the channels would have started."""
+        return sum(channel.spawns for channel in self.channels)
+
+    @property
+    def queries(self) -> int:
+        """The queries the channels would have run."""
+        return sum(channel.queries for channel in self.channels)
+
+    def virtual_memory(self):
+        self._count("virtual_memory")
+        total = 16 * 1024 ** 3
+        available = 9 * 1024 ** 3
+        return svmem(total, available, 43.75, total - available, available)
+
+    def disk_partitions(self):
+        self._count("disk_partitions")
+        return [sdiskpart("C:\\", "C:\\", "NTFS", "rw,fixed")]
+
+    def disk_usage(self, path: str):
+        self._count("disk_usage")
+        total = 512 * 1024 ** 3
+        free = 200 * 1024 ** 3
+        return sdiskusage(total, total - free, free, 60.9)
+
+    def disk_io_counters(self):
+        self._count("disk_io_counters")
+        self._disk_io += 1
+        return sdiskio(self._disk_io * 10, self._disk_io * 5, self._disk_io * 1024 ** 2, self._disk_io * 512 * 1024, 0, 0)
+
+    def net_io_counters(self, pernic: bool = False):
+        self._count("net_io_counters")
+        self._net_io += 1
+        counters = snetio(self._net_io * 64 * 1024, self._net_io * 256 * 1024, self._net_io * 50, self._net_io * 200, 0, 0, 0, 0)
+        if not pernic:
+            return counters
+        return {"Wi-Fi": counters, "Ethernet": snetio(0, 0, 0, 0, 0, 0, 0, 0)}
+
+    def sensors_battery(self):
+        self._count("sensors_battery")
+        return sbattery(80, 7200, not self.on_battery)
+
+    def read_registry(self, path: str, name: str):
+        self._count("read_registry")
+        try:
+            return self.registry[f"{path}\\{name}"]
+        except KeyError:
+            raise FileNotFoundError(f"The fake registry has no value {path}\\{name}")
+
+    def create_channel(self, command: List[str], timeout: Optional[float] = None) -> FakeCommandChannel:
+        channel = FakeCommandChannel(command, self.replies, self.latency)
+        self.channels.append(channel)
+        return channel
+
+    def create_async_channel(self, command: List[str], timeout: Optional[float] = None, size: int = 2) -> FakeAsyncCommandChannel:
+        channel = FakeAsyncCommandChannel(command, self.replies, self.latency)
+        self.channels.append(channel)
+        return channel
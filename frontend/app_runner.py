@@ -0,0 +1,221 @@
+import os
+import sys
+
+from PyQt5 import QtWidgets, QtCore
+from backend.logger import Logger
+from backend.error_dumper import ErrorDumper
+from backend.utils import Utils
+from backend.nyx_base import NyxBase
+from backend.inventory import Inventory
+from backend.collector_process import CollectorProcess, get_snapshot_keys
+from backend.live_snapshot import publish
+from backend.metrics_server import MetricsServer, get_port
+from backend.history import HistoryStore
+from backend.history_archive import HistoryArchive
+from backend.history_query import HistoryQuery
+from backend.timer import Timer
+from backend.tracer import tracer
+from frontend.nyx import Nyx
+from frontend.assets import Assets
+from frontend.pages.device_monitor import SnapshotBridge
+from frontend.pages.diagnostics import Diagnostics
+
+# Ensure high DPI scaling attributes are set before creating QApplication
+if hasattr(QtCore.Qt, 'AA_EnableHighDpiScaling'):
+    QtWidgets.QApplication.setAttribute(QtCore.Qt.ApplicationAttribute.AA_EnableHighDpiScaling, True)
+
+if hasattr(QtCore.Qt, 'AA_UseHighDpiPixmaps'):
+    QtWidgets.QApplication.setAttribute(QtCore.Qt.ApplicationAttribute.AA_UseHighDpiPixmaps, True)
+
+os.environ["QT_AUTO_SCREEN_SCALE_FACTOR"] = "1"
+
+class AppRunner:
+    def __init__(self):
+        # The live snapshot other tools read also tells whether an instance is running already
+        self.live_snapshot = publish(get_snapshot_keys())
+        if self.live_snapshot is None:
+            # Only show notification if this is the main instance
+            if not hasattr(sys, '_called_from_test'):
+                self.show_instance_notification()
+            sys.exit(0)  # Exit if another instance is running
+
+        with Timer(__class__.__name__):
+            self.app = QtWidgets.QApplication(sys.argv)
+            self.logger = Logger()
+            self.utils = Utils()
+            self.nyx_path, self.error_logs_path = self.utils.create_nyx_folders()
+            # Sampling runs in its own process, a slow probe can't hold up the window
+            self.collector = CollectorProcess(self.live_snapshot, self.nyx_path)
+            if tracer.enabled:
+                self.collector.add_listener(lambda snapshot: tracer.mark("first-real-value"))
+            with tracer.span("Inventory"):
+                # Only read what earlier runs saved, the collector does the probing
+                self.collector.seed(Inventory(self.nyx_path, dict.fromkeys(NyxBase.INVENTORY_KEYS)).cached())
+            with tracer.span("History"):
+                self.history = HistoryStore(NyxBase.get_history_keys())
+                self.collector.add_listener(self.history.record)
+                self.history_archive = HistoryArchive(os.path.join(self.nyx_path, "History"), self.history)
+                self.history_query = HistoryQuery(self.history, self.history_archive)
+            # Scrapable at http://127.0.0.1:<port>/metrics when NYX_METRICS_PORT is set
+            metrics_port = get_port()
+            self.metrics_server = MetricsServer(self.collector, port = metrics_port) if metrics_port else None
+            self.error_dumper = ErrorDumper(self.error_logs_path)
+            # Set the custom excepthook
+            sys.excepthook = self._custom_excepthook
+            self.tray_icon = None
+            self.diagnostics = None
+
+    def _custom_excepthook(self, exception_type, exception_value, traceback):
+        self.error_dumper.dump_error(exception_type.__name__, str(exception_value))
+
+    def show_instance_notification(self):
+        # Create a QApplication instance to show the notification
+        notification_app = QtWidgets.QApplication(sys.argv)
+        
+        # Create a QDialog to show the message
+        msg_box = QtWidgets.QMessageBox()
+        msg_box.setIcon(QtWidgets.QMessageBox.Warning)
+        msg_box.setText("Another instance of Nyx is already running.")
+        msg_box.setInformativeText("Check the system tray for the running instance.")
+        msg_box.setWindowTitle("Nyx Already Running")
+        msg_box.setModal(True)
+        msg_box.exec_()
+        
+        # Close the notification application
+        notification_app.quit()
+
+    def calculate_scale_factor(self, app):
+        screen = app.primaryScreen()
+        dpi = screen.logicalDotsPerInch()
+        base_dpi = NyxBase.get_dpi()
+        
+        # Calculate the DPI scale factor
+        dpi_scale_factor = dpi / base_dpi
+
+        # Get the screen's current resolution
+        screen_resolution = screen.size()
+        base_resolution = NyxBase.get_screen_resolution()
+
+        # Calculate the resolution scale factor
+        res_scale_factor_width = screen_resolution.width() / base_resolution[0]
+        res_scale_factor_height = screen_resolution.height() / base_resolution[1]
+
+        # Use the smaller scale factor to ensure proper scaling
+        res_scale_factor = min(res_scale_factor_width, res_scale_factor_height)
+
+        # Calculate the final scale factor
+        scale_factor = dpi_scale_factor * res_scale_factor
+
+        return scale_factor
+
+    def hide_window(self):
+        self.main_window.hide()
+        self.collector.set_visible(False)
+        if self.tray_icon:
+            self.tray_icon.setVisible(True)
+
+    def show_window(self):
+        self.main_window.showNormal()
+        self.main_window.activateWindow()
+        self.collector.set_visible(True)
+        if self.tray_icon:
+            self.tray_icon.setVisible(False)
+
+    def exit_app(self):
+        if self.tray_icon:
+            self.tray_icon.setVisible(False)
+        self.collector_timer.stop()
+        self.collector.stop(timeout = 1)
+        self.live_snapshot.close()
+        self.history_archive.stop()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        tracer.export()
+        QtWidgets.QApplication.quit()
+
+    def create_tray_icon(self):
+        # Load your custom icon
+        self.tray_icon = QtWidgets.QSystemTrayIcon(Assets.icon("nyx"), self.app)
+        
+        # Create the context menu
+        tray_menu = QtWidgets.QMenu()
+        show_action = tray_menu.addAction("Show")
+        diagnostics_action = tray_menu.addAction("Diagnostics")
+        exit_action = tray_menu.addAction("Exit Nyx")
+        
+        show_action.triggered.connect(self.show_window)
+        diagnostics_action.triggered.connect(self.show_diagnostics)
+        exit_action.triggered.connect(self.exit_app)
+        
+        self.tray_icon.setContextMenu(tray_menu)
+        
+        # Connect the activated signal to handle left-click event
+        self.tray_icon.activated.connect(self.on_tray_icon_activated)
+        
+        self.tray_icon.show()
+
+        # Show what sampling costs right now when hovering the tray icon
+        self.tray_bridge = SnapshotBridge(self.collector)
+        self.tray_bridge.subscribe("throttle.wakeups_per_second", self.update_tray_tooltip)
+
+    def update_tray_tooltip(self, wakeups_per_second: float):
+        profile = self.collector.snapshot.values.get("throttle.profile", "Full")
+        self.tray_icon.setToolTip(f"Nyx\nSampling: {profile} ({wakeups_per_second} wakeups/s)") # type: ignore
+
+    def show_diagnostics(self):
+        if self.diagnostics is None:
+            self.diagnostics = Diagnostics(self.collector)
+        self.diagnostics.show()
+        self.diagnostics.raise_()
+        self.diagnostics.activateWindow()
+
+    def on_tray_icon_activated(self, reason):
+        if reason == QtWidgets.QSystemTrayIcon.Trigger:
+            self.show_window()
+
+    def run(self):
+        self.logger.debug("Displaying main window")
+
+        try:
+            with tracer.span("calculate_scale_factor"):
+                self.scale_factor = self.calculate_scale_factor(self.app)
+            self.logger.debug(f"Successful scale factor: {self.scale_factor}")
+        except Exception as e:
+            self.scale_factor = 1
+            self.logger.debug(f"Default scale factor: {self.scale_factor}, Exception: {e}")
+
+        self.main_window = QtWidgets.QMainWindow()
+        ui = Nyx(self.app, self.scale_factor, self.collector, self.history)
+        ui.setupUi(self.main_window)
+        self.main_window.setWindowTitle("Nyx")
+        with tracer.span("show"):
+            self.main_window.show()
+        tracer.mark("window-shown")
+
+        # Start sampling only once every widget has subscribed to its metrics
+        self.collector.start()
+        # Snapshots are picked up from shared memory on the GUI thread, reading one takes microseconds
+        self.collector_timer = QtCore.QTimer()
+        self.collector_timer.timeout.connect(self.collector.poll)
+        self.collector_timer.start(50)
+        self.history_archive.start()
+        if self.metrics_server is not None:
+            self.metrics_server.start()
+
+        # Override the close event
+        self.main_window.closeEvent = self.close_event
+
+        # Connect the minimize event
+        self.main_window.changeEvent = self.change_event
+
+        self.create_tray_icon()
+        sys.exit(self.app.exec())
+
+    def close_event(self, event):
+        event.ignore()
+        self.hide_window()
+
+    def change_event(self, event):
+        if event.type() == QtCore.QEvent.WindowStateChange:
+            if self.main_window.isMinimized():
+                self.hide_window()
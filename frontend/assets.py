@@ -0,0 +1,88 @@
+import os, sys
+
+from typing import Dict
+
+from PyQt5 import QtGui
+
+from backend.logger import Logger
+
+class Assets:
+    # Font names mapped to their file, relative to the frontend folder
+    FONTS = {
+        "source_sans_3": "fonts/SourceSans3-Regular.ttf",
+        "source_sans_3_black": "fonts/SourceSans3-Black.ttf",
+    }
+
+    _font_families: Dict[str, str] = {}
+    _pixmaps: Dict[str, QtGui.QPixmap] = {}
+    _icons: Dict[str, QtGui.QIcon] = {}
+
+    @staticmethod
+    def path(relative_path: str) -> str:
+        """Get the absolute path of a file in the frontend folder, from source or from a PyInstaller build.
+
+        Parameters:
+        ----------
+        relative_path: str
+            The path relative to the frontend folder, e.g. `icons/nyx.png`.
+
+        Returns:
+        ----------
+        str:
+            The absolute path."""
+        base_path = getattr(sys, "_MEIPASS", None)
+        if base_path is not None:
+            return os.path.join(base_path, "frontend", relative_path)
+        return os.path.join(os.path.dirname(os.path.abspath(__file__)), relative_path)
+
+    @classmethod
+    def font_family(cls, name: str) -> str:
+        """Get the family of a bundled font, registering it with Qt the first time.
+
+        Qt reads the file itself, so the font never sits in a Python object.
+        Needs a QApplication.
+
+        Parameters:
+        ----------
+        name: str
+            A key of `FONTS`, e.g. `source_sans_3_black`.
+
+        Returns:
+        ----------
+        str:
+            The font family, to use with `QFont.setFamily`."""
+        family = cls._font_families.get(name)
+        if family is None:
+            font_id = QtGui.QFontDatabase.addApplicationFont(cls.path(cls.FONTS[name]))
+            families = QtGui.QFontDatabase.applicationFontFamilies(font_id)
+            if not families:
+                Logger().error(f"An error occurred while loading the {name} font")
+            family = cls._font_families[name] = families[0] if families else QtGui.QFont().family()
+        return family
+
+    @classmethod
+    def pixmap(cls, name: str) -> QtGui.QPixmap:
+        """Get a bundled icon as a QPixmap, loaded once and shared.
+
+        Parameters:
+        ----------
+        name: str
+            The icon name, the file name in `icons` without `.png`.
+
+        Returns:
+        ----------
+        QPixmap:
+            The icon, QPixmaps are implicitly shared so handing out the same one is cheap."""
+        pixmap = cls._pixmaps.get(name)
+        if pixmap is None:
+            pixmap = cls._pixmaps[name] = QtGui.QPixmap(cls.path(f"icons/{name}.png"))
+        return pixmap
+
+    @classmethod
+    def icon(cls, name: str) -> QtGui.QIcon:
+        """Get a bundled icon as a QIcon, built once from `pixmap(name)` and shared."""
+        icon = cls._icons.get(name)
+        if icon is None:
+            icon = cls._icons[name] = QtGui.QIcon()
+            icon.addPixmap(cls.pixmap(name), QtGui.QIcon.Mode.Normal, QtGui.QIcon.State.Off)
+        return icon
@@ -0,0 +1,112 @@
+import asyncio, threading
+
+from typing import Awaitable, Callable, List, Optional
+from concurrent.futures import Future
+
+from PyQt5 import QtCore
+
+from backend.logger import Logger
+
+class AsyncBridge(QtCore.QObject):
+    done_signal = QtCore.pyqtSignal(object, object)
+
+    def __init__(self, parent = None):
+        """Runs an asyncio event loop next to the Qt one and hands results back to the GUI thread.
+
+        Qt keeps the GUI thread, so coroutines run on a loop thread of their own. When one finishes,
+        its callback is called on the GUI thread through a signal, the same way SnapshotBridge
+        hands over snapshots. For example, to show an AsyncNyxBase reading every second:
+
+            bridge.every(1000, async_nyx_base.read_all, self.show_values)
+        """
+        super().__init__(parent)
+        self.logger = Logger()
+        self.loop = asyncio.new_event_loop()
+        self.timers: List[QtCore.QTimer] = []
+
+        # Futures are finished on the loop thread, the signal hands them over to the GUI thread
+        self.done_signal.connect(self.deliver)
+        self._thread = threading.Thread(target = self._run, name = "NyxAsyncLoop", daemon = True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, awaitable: Awaitable, callback: Optional[Callable] = None) -> Future:
+        """Run `awaitable` on the loop, `callback(result)` is called on the GUI thread once it's done.
+
+        Failures are logged instead, and nothing is called for an awaitable that got cancelled.
+
+        Returns:
+        ----------
+        Future:
+            The future of the result, `cancel()` cancels the awaitable wherever it is."""
+        future = asyncio.run_coroutine_threadsafe(self._await(awaitable), self.loop)
+        future.add_done_callback(lambda future: self.done_signal.emit(future, callback))
+        return future
+
+    @staticmethod
+    async def _await(awaitable: Awaitable):
+        return await awaitable
+
+    def every(self, interval: int, function: Callable[[], Awaitable], callback: Optional[Callable] = None) -> QtCore.QTimer:
+        """Run `function()` every `interval` milliseconds and pass its results to `callback` on the GUI thread.
+
+        A run that is still going when the next one is due is not started twice, like a source on the scheduler.
+
+        Returns:
+        ----------
+        QTimer:
+            The timer, stop it to stop running `function`."""
+        pending: List[Optional[Future]] = [None]
+
+        def start():
+            if pending[0] is None or pending[0].done():
+                pending[0] = self.submit(function(), callback)
+
+        timer = QtCore.QTimer(self)
+        timer.setInterval(interval)
+        timer.timeout.connect(start)
+        timer.start()
+        self.timers.append(timer)
+        start()
+        return timer
+
+    def deliver(self, future: Future, callback: Optional[Callable]):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self.logger.error(f"An error occurred while running a coroutine: {error}")
+            return
+        if callback is not None:
+            callback(future.result())
+
+    def run(self, awaitable: Awaitable, timeout: Optional[float] = None):
+        """Run `awaitable` on the loop and wait for its result, e.g. to close what runs on it."""
+        return asyncio.run_coroutine_threadsafe(self._await(awaitable), self.loop).result(timeout)
+
+    def stop(self, timeout: float = 1.0):
+        """Stop every timer, cancel everything still running on the loop and stop it."""
+        for timer in self.timers:
+            timer.stop()
+        self.timers = []
+
+        if not self.loop.is_running():
+            return
+
+        async def cancel_tasks():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions = True)
+
+        try:
+            self.run(cancel_tasks(), timeout)
+        except Exception as e:
+            self.logger.error(f"An error occurred while cancelling coroutines: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self.loop.close()
@@ -6,14 +6,18 @@ from .pages.device_monitor import DeviceMonitor
 
 from backend.logger import Logger
 from backend.timer import Timer
+from backend.collector_process import CollectorProcess
+from backend.history import HistoryStore
 
 # from .mini_dialog import NyxDialog
  
 class Nyx(object):
-    def __init__(self, app: QtWidgets.QApplication, scale_factor: float):
+    def __init__(self, app: QtWidgets.QApplication, scale_factor: float, collector: CollectorProcess, history: HistoryStore):
         super().__init__()
         self.app = app
         self.scale_factor = scale_factor
+        self.collector = collector
+        self.history = history
         self.logger = Logger()
         self.m_mouse_down = False
 
@@ -38,7 +42,7 @@ class Nyx(object):
 
             self.centralwidget.title_bar = self.title_bar
 
-            self.device_monitor_body = DeviceMonitor(self.centralwidget)
+            self.device_monitor_body = DeviceMonitor(self.centralwidget, self.collector, self.history)
 
             MainWindow.setCentralWidget(self.centralwidget)
 
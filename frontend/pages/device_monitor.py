@@ -1,46 +1,55 @@
-import time
-
 from typing import Optional, Callable
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 
-from backend.nyx_base import NyxBase
 from backend.utils import Utils
 from backend.logger import Logger
 from backend.timer import Timer
-from backend.objects import Row
-from backend.internal_data import InternalData
+from backend.tracer import tracer
+from backend.objects import Row, Snapshot
+from backend.collector_process import CollectorProcess
+from backend.capabilities import UNAVAILABLE
+from backend.history import HistoryStore
 
+from frontend.assets import Assets
 from frontend.widgets.round_progress_bar import QRoundProgressBar
 from frontend.widgets.textified_progress_bar import TextifiedProgressBar
+from frontend.widgets.sparkline import Sparkline
 
-class LabelUpdater(QtCore.QThread):
-    update_signal = QtCore.pyqtSignal(str)
+class SnapshotBridge(QtCore.QObject):
+    snapshot_signal = QtCore.pyqtSignal(object)
 
-    def __init__(self, function: Callable, interval: int, parent=None):
+    def __init__(self, collector: CollectorProcess, parent=None):
         super().__init__(parent)
-        self.function = function
-        self.interval = interval
+        self.collector = collector
+        self.subscribers = {}
+
+        # Snapshots may be published off the GUI thread, e.g. by a Scheduler, the signal hands them over to it
+        self.snapshot_signal.connect(self.dispatch)
+        collector.add_listener(self.snapshot_signal.emit)
 
-    def run(self):
-        while True:
-            value = self.function()
-            self.update_signal.emit(str(value))
-            self.msleep(self.interval)
+    def subscribe(self, key: str, callback: Callable):
+        self.subscribers.setdefault(key, []).append(callback)
 
-            if self.interval == 0: # Run only once when interval is 0
-                break
+        # Paint what is already known right away, e.g. values cached by an earlier run
+        if key in self.collector.snapshot.values:
+            callback(self.collector.snapshot.values[key])
+
+    def dispatch(self, snapshot: Snapshot):
+        for key in snapshot.updated:
+            for callback in self.subscribers.get(key, ()):
+                callback(snapshot.values[key])
 
 class DeviceMonitor(QtWidgets.QFrame):
-    def __init__(self, parent: QtWidgets.QWidget):
+    def __init__(self, parent: QtWidgets.QWidget, collector: CollectorProcess, history: HistoryStore):
         super().__init__()
         with Timer(__class__.__name__):
             self.logger = Logger()
             self.utils = Utils()
-            self.nyx_base = NyxBase()
+            self.bridge = SnapshotBridge(collector, self)
+            self.history = history
             self.title = "Device Monitor"
             self.information_rows = {}
-            self.threads = []
             
             self.setGeometry(QtCore.QRect(0, 110, 1411, 661))
             self.setStyleSheet("QFrame {background-color: #202120;}")
@@ -49,16 +58,12 @@ class DeviceMonitor(QtWidgets.QFrame):
             self.setObjectName("section_deviceMonitor")
             self.setParent(parent)
 
-            self.source_sans_3 = QtGui.QFontDatabase.applicationFontFamilies(
-                QtGui.QFontDatabase.addApplicationFontFromData(InternalData.source_sans_3)
-            )[0]
-            self.source_sans_3_black = QtGui.QFontDatabase.applicationFontFamilies(
-                QtGui.QFontDatabase.addApplicationFontFromData(InternalData.source_sans_3_black)
-            )[0]
+            self.source_sans_3 = Assets.font_family("source_sans_3")
+            self.source_sans_3_black = Assets.font_family("source_sans_3_black")
 
             self.computer_model = self.create_label(
                 50, 40, 241, 61, "Computer Model", self.source_sans_3_black, 16, True,
-                function = self.nyx_base.get_computer_model, timer_interval = 0
+                metric = "computer_model"
             )
             self.cpu_usage_label = self.create_label(
                 50, 100, 131, 51, "CPU Usage", self.source_sans_3, 15, True,
@@ -70,16 +75,15 @@ class DeviceMonitor(QtWidgets.QFrame):
             self.gpu_usage_progress = QRoundProgressBar(self, font_size = 30, default_color = QtGui.QColor(42, 43, 42, 255),
                 progress_color = QtGui.QColor(22, 23, 22, 255), inner_background_color = QtGui.QColor(32, 33, 32, 255), width = 0.175)
             self.gpu_usage_progress.setGeometry(QtCore.QRect(470, 160, 241, 241))
-            gpu_usage_updater = LabelUpdater(self.nyx_base.get_gpu_usage, 1000)
-            gpu_usage_updater.update_signal.connect(lambda value: self.gpu_usage_progress.set_value(int(float(value))))
-            gpu_usage_updater.start()
+            self.bridge.subscribe("gpu.usage", lambda value: self.gpu_usage_progress.set_value(value if value == UNAVAILABLE else int(value)))
 
             self.cpu_usage_progress = QRoundProgressBar(self, font_size = 30, default_color = QtGui.QColor(42, 43, 42, 255),
                 progress_color = QtGui.QColor(22, 23, 22, 255), inner_background_color = QtGui.QColor(32, 33, 32, 255), width = 0.175)
             self.cpu_usage_progress.setGeometry(QtCore.QRect(70, 160, 241, 241))
-            cpu_usage_updater = LabelUpdater(self.nyx_base.get_cpu_usage, 1000)
-            cpu_usage_updater.update_signal.connect(lambda value: self.cpu_usage_progress.set_value(int(float(value))))
-            cpu_usage_updater.start()
+            self.bridge.subscribe("cpu.usage", lambda value: self.cpu_usage_progress.set_value(value if value == UNAVAILABLE else int(value)))
+
+            self.gpu_usage_sparkline = self.create_sparkline(470, 405, 241, 40, "gpu.usage")
+            self.cpu_usage_sparkline = self.create_sparkline(70, 405, 241, 40, "cpu.usage")
 
             self.harddisk_bar = TextifiedProgressBar(
                 parent = self,
@@ -95,12 +99,8 @@ class DeviceMonitor(QtWidgets.QFrame):
                 progress_bar_width = 221,
                 progress_bar_height = 16,
             )
-            harddisk_bar_updater = LabelUpdater(lambda: self.nyx_base.get_harddisk_info().used_percent, 60 * 1000)
-            harddisk_bar_updater.update_signal.connect(lambda value: self.harddisk_bar.set_value(value))
-            harddisk_bar_updater.start()
-            harddisk_label_updater = LabelUpdater(lambda: self.nyx_base.get_harddisk_info().labelized, 0)
-            harddisk_label_updater.update_signal.connect(lambda value: self.harddisk_bar.label.setText(value))
-            harddisk_label_updater.start()
+            self.bridge.subscribe("disk.used_percent", self.harddisk_bar.set_value)
+            self.bridge.subscribe("disk.label", self.harddisk_bar.label.setText)
             self.memory_bar = TextifiedProgressBar(
                 parent = self,
                 value = -1,
@@ -115,9 +115,10 @@ class DeviceMonitor(QtWidgets.QFrame):
                 progress_bar_width = 221,
                 progress_bar_height = 16,
             )
-            memory_bar_updater = LabelUpdater(lambda: self.nyx_base.get_ram_info().used_percent, 1000)
-            memory_bar_updater.update_signal.connect(lambda value: self.memory_bar.set_value(value))
-            memory_bar_updater.start()
+            self.bridge.subscribe("ram.used_percent", self.memory_bar.set_value)
+
+            self.disk_io_sparkline = self.create_sparkline(80, 595, 221, 40, "disk.io_percent")
+            self.memory_sparkline = self.create_sparkline(480, 595, 221, 40, "ram.used_percent")
 
             # Creating the scrollable frame and area
             self.scroll_frame = self.create_frame(
@@ -139,32 +140,40 @@ class DeviceMonitor(QtWidgets.QFrame):
             self.scrollable_content_frame = self.create_frame(self.scrollable_content, 0, 0, 519, 658, "transparent")
             self.scrollable_content_frame.setMinimumSize(QtCore.QSize(0, 640))
 
-            cpu_info_row = self.create_info_row("Loading", function = self.nyx_base.get_cpu_name)
-            gpu_info_row = self.create_info_row("Loading", function = self.nyx_base.get_gpu_name)
+            cpu_info_row = self.create_info_row("Loading", metric = "cpu.name")
+            gpu_info_row = self.create_info_row("Loading", metric = "gpu.name")
             cpu_temperature_info_row = self.create_info_row(
                 "CPU Temperature", "?°C",
-                function = lambda: f"{round(self.nyx_base.get_cpu_temperature(), 1)}°C",
-                timer_interval = 2500)
+                metric = "cpu.temperature", formatter = lambda value: f"{round(value, 1)}°C")
             gpu_temperature_info_row = self.create_info_row(
                 "GPU Temperature", "?°C",
-                function = lambda: f"{round(self.nyx_base.get_gpu_temperature(), 1)}°C",
-                timer_interval = 2500)
-            ram_info_row = self.create_info_row("RAM", "Loading", function = lambda: f"{self.nyx_base.get_ram_info().total} GB")
-            disk_info_row = self.create_info_row("Disk", "Loading", function = lambda: f"{self.nyx_base.get_disk_io_percentage():.2f}%")
+                metric = "gpu.temperature", formatter = lambda value: f"{round(value, 1)}°C")
+            ram_info_row = self.create_info_row("RAM", "Loading", metric = "ram.total", formatter = lambda value: f"{value} GB")
+            disk_info_row = self.create_info_row("Disk", "Loading", metric = "disk.io_percent", formatter = lambda value: f"{value:.2f}%")
             # fan_1_info_row = self.create_info_row("Fan 1", "0 RPM")
             # fan_2_info_row = self.create_info_row("Fan 2", "0 RPM")
-            wifi_download_info_row = self.create_info_row("WiFi (Download)", "? Bytes/s", function = lambda: f"{self.nyx_base.get_network_speed('Wi-Fi').download_labelized}", timer_interval = 250)
-            wifi_upload_info_row = self.create_info_row("WiFi (Upload)", "? Bytes/s", function = lambda: f"{self.nyx_base.get_network_speed('Wi-Fi').upload_labelized}", timer_interval = 250)
-            lan_download_info_row = self.create_info_row("LAN (Download)", "? Bytes/s", function = lambda: f"{self.nyx_base.get_network_speed('Ethernet').download_labelized}", timer_interval = 250)
-            lan_upload_info_row = self.create_info_row("LAN (Upload)", "? Bytes/s", function = lambda: f"{self.nyx_base.get_network_speed('Ethernet').upload_labelized}", timer_interval = 250)
-            gpu_clock_info_row = self.create_info_row("GPU Clock", "? MHz", function = lambda: f"{self.nyx_base.get_gpu_clock()} MHZ", timer_interval = 10000)
-            vram_clock_info_row = self.create_info_row("VRAM Clock", "? MHz", function = lambda: f"{int(self.nyx_base.get_ram_info().clock)} MHZ", timer_interval = 10000)
-            power_plan_info_row = self.create_info_row("Power Plan", "Loading", function = self.nyx_base.get_power_plan)
+            wifi_download_info_row = self.create_info_row("WiFi (Download)", "? Bytes/s", metric = "net.wifi.download")
+            wifi_upload_info_row = self.create_info_row("WiFi (Upload)", "? Bytes/s", metric = "net.wifi.upload")
+            lan_download_info_row = self.create_info_row("LAN (Download)", "? Bytes/s", metric = "net.lan.download")
+            lan_upload_info_row = self.create_info_row("LAN (Upload)", "? Bytes/s", metric = "net.lan.upload")
+            gpu_clock_info_row = self.create_info_row("GPU Clock", "? MHz", metric = "gpu.clock", formatter = lambda value: f"{value} MHZ")
+            vram_clock_info_row = self.create_info_row("VRAM Clock", "? MHz", metric = "gpu.memory_clock", formatter = lambda value: f"{int(value)} MHZ")
+            power_plan_info_row = self.create_info_row("Power Plan", "Loading", metric = "power_plan")
+            sampling_info_row = self.create_info_row("Sampling", "Full", metric = "throttle.profile")
+            wakeups_info_row = self.create_info_row(
+                "Wakeups", "? /s", metric = "throttle.wakeups_per_second", formatter = lambda value: f"{value} /s")
+            overhead_info_row = self.create_info_row(
+                "Nyx Overhead", "?% of a core", metric = "governor.overhead", formatter = lambda value: f"{value}% of a core")
 
             # Adding the content frame to the layout
             self.vertical_layout.addWidget(self.scrollable_content_frame)
             self.scroll_area.setWidget(self.scrollable_content)
 
+    def paintEvent(self, event: QtGui.QPaintEvent):
+        super().paintEvent(event)
+        if tracer.enabled:
+            tracer.mark("first-paint")
+
     def create_label(
         self,
         x_position: int,
@@ -177,8 +186,8 @@ class DeviceMonitor(QtWidgets.QFrame):
         is_bold: bool = False,
         parent: Optional[QtWidgets.QWidget] = None,
         alignment:QtCore.Qt.AlignmentFlag =QtCore.Qt.AlignmentFlag.AlignCenter,
-        function: Optional[Callable] = None,
-        timer_interval: int = 0,
+        metric: Optional[str] = None,
+        formatter: Callable = str,
     ):
         label = QtWidgets.QLabel(parent or self)
         label.setGeometry(QtCore.QRect(x_position, y_position, width, height))
@@ -192,14 +201,28 @@ class DeviceMonitor(QtWidgets.QFrame):
         label.setAlignment(alignment)
         label.setText(text)
 
-        if function:
-            label_updater = LabelUpdater(function, timer_interval)
-            label_updater.update_signal.connect(lambda value: label.setText(value))
-            label_updater.start()
-            self.threads.append(label_updater)
+        if metric:
+            # A source that can't be read publishes UNAVAILABLE, which no formatter expects
+            self.bridge.subscribe(metric, lambda value: label.setText(value if value == UNAVAILABLE else formatter(value)))
 
         return label
 
+    def create_sparkline(
+        self,
+        x_position: int,
+        y_position: int,
+        width: int,
+        height: int,
+        metric: str,
+    ):
+        sparkline = Sparkline(self, self.history, metric)
+        sparkline.setGeometry(QtCore.QRect(x_position, y_position, width, height))
+
+        # Only repaint when the metric got a new value, the sparkline skips it if no row was added
+        self.bridge.subscribe(metric, lambda _: sparkline.refresh())
+
+        return sparkline
+
     def create_frame(
         self,
         parent,
@@ -226,8 +249,8 @@ class DeviceMonitor(QtWidgets.QFrame):
         label_text: str,
         value_text: str = "",
         index: int = -1,
-        function: Optional[Callable] = None,
-        timer_interval: int = 0,
+        metric: Optional[str] = None,
+        formatter: Callable = str,
     ):
         if index == -1:
             index = len(self.information_rows)
@@ -275,14 +298,9 @@ class DeviceMonitor(QtWidgets.QFrame):
                 alignment = QtCore.Qt.AlignmentFlag.AlignRight|QtCore.Qt.AlignmentFlag.AlignVCenter, # type: ignore
             )
         
-        if function:
-            label_updater = LabelUpdater(function, timer_interval)
-            if double_label:
-                label_updater.update_signal.connect(lambda value: second_label.setText(value))
-            else:
-                label_updater.update_signal.connect(lambda value: first_label.setText(value))
-            label_updater.start()  # Start the thread
-            self.threads.append(label_updater)
+        if metric:
+            value_label = second_label if double_label else first_label
+            self.bridge.subscribe(metric, lambda value: value_label.setText(value if value == UNAVAILABLE else formatter(value)))
 
         # Update scrollable_content height
         self.scrollable_content.setMinimumSize(QtCore.QSize(0, (index + 1) * 50 + 15))
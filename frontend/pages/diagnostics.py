@@ -0,0 +1,108 @@
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+from backend.collector_process import CollectorProcess
+
+from frontend.assets import Assets
+
+class Diagnostics(QtWidgets.QWidget):
+    COLUMNS = [
+        "Source", "State", "Calls", "Errors", "Timeouts", "Spawns", "p50", "p90", "p99", "Max",
+        "Interval", "Cost", "Governor", "Last error",
+    ]
+
+    def __init__(self, collector: CollectorProcess, refresh_interval: int = 1000):
+        """A window listing what every metric source costs, how often it failed and whether it's still sampled.
+
+        The table is filled from `CollectorProcess.diagnostics()` while the window is visible,
+        with the interval the governor picked for every source, the share of one core it costs
+        at that interval and why.
+
+        Args:
+        ---------
+            collector (CollectorProcess): The collector whose sources are listed.
+            refresh_interval (int): How often to refresh the table in milliseconds.
+        """
+        super().__init__()
+        self.collector = collector
+
+        self.setWindowTitle("Nyx Diagnostics")
+        self.setWindowIcon(Assets.icon("nyx"))
+        self.resize(1100, 480)
+        self.setStyleSheet(
+            "QWidget {background-color: #202120; color: white;}"
+            "QHeaderView::section {background-color: #2a2b2a; color: white; border: none; padding: 4px;}"
+            "QTableWidget {gridline-color: #2a2b2a; border: none;}"
+        )
+
+        font = QtGui.QFont(Assets.font_family("source_sans_3"))
+        font.setPointSize(10)
+        self.setFont(font)
+
+        self.table = QtWidgets.QTableWidget(0, len(self.COLUMNS), self)
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        self.table.horizontalHeader().setStretchLastSection(True)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.table)
+
+        self.refresh_timer = QtCore.QTimer(self)
+        self.refresh_timer.setInterval(refresh_interval)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event: QtGui.QShowEvent):
+        self.refresh()
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event: QtGui.QHideEvent):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        diagnostics = self.collector.diagnostics()
+        decisions = {decision["key"]: decision for decision in self.collector.governor_report()}
+        self.table.setRowCount(len(diagnostics))
+
+        for row, (key, stats) in enumerate(diagnostics.items()):
+            latency = stats["latency_us"]
+            # One-off sources, the governor and the throttle policy aren't governed
+            decision = decisions.get(key)
+            cells = [
+                key,
+                stats["state"],
+                str(stats["calls"]),
+                str(stats["errors"]),
+                str(stats["timeouts"]),
+                str(stats["spawns"]),
+                self.format_latency(latency["p50"]),
+                self.format_latency(latency["p90"]),
+                self.format_latency(latency["p99"]),
+                self.format_latency(latency["max"]),
+                f"{decision['interval']:.0f}ms (x{decision['scale']:.2f})" if decision else "",
+                f"{decision['cost'] * 100:.3f}%" if decision else "",
+                decision["reason"] if decision else "",
+                stats["last_error"] or "",
+            ]
+            for column, text in enumerate(cells):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QtWidgets.QTableWidgetItem()
+                    if 0 < column < len(cells) - 1:
+                        item.setTextAlignment(QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter) # type: ignore
+                    self.table.setItem(row, column, item)
+                if item.text() != text:
+                    item.setText(text)
+            # Sources that are failing right now stand out
+            last_cell = self.table.item(row, len(cells) - 1)
+            last_cell.setForeground(QtGui.QColor(235, 87, 87) if stats["errors"] else QtGui.QColor(255, 255, 255)) # type: ignore
+
+        self.table.resizeColumnsToContents()
+
+    def format_latency(self, microseconds: float) -> str:
+        if microseconds >= 1000:
+            return f"{microseconds / 1000:.1f}ms"
+        return f"{microseconds:.0f}µs"
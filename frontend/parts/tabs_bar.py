@@ -1,13 +1,13 @@
 from time import time
 from typing import Optional
-from base64 import b64decode
 
 from PyQt5 import QtWidgets, QtGui, QtCore
 
 from backend.logger import Logger
 from backend.timer import Timer
 from backend.utils import Utils
-from backend.internal_data import InternalData
+
+from frontend.assets import Assets
 
 class TabsBar(QtWidgets.QFrame):
     def __init__(
@@ -50,10 +50,7 @@ class TabsBar(QtWidgets.QFrame):
         button = QtWidgets.QPushButton(self)
         button.setGeometry(QtCore.QRect(x_position, y_position, width, height))
         font = QtGui.QFont()
-        source_sans_3_black = QtGui.QFontDatabase.applicationFontFamilies(
-            QtGui.QFontDatabase.addApplicationFontFromData(InternalData.source_sans_3_black)
-        )[0]
-        font.setFamily(source_sans_3_black)
+        font.setFamily(Assets.font_family("source_sans_3_black"))
         font.setPointSize(font_size)
         font.setBold(True)
         font.setWeight(75)
@@ -62,12 +59,8 @@ class TabsBar(QtWidgets.QFrame):
         button.setCursor(QtGui.QCursor(QtCore.Qt.CursorShape.PointingHandCursor))
 
         if icon_name:
-            pixmap = QtGui.QPixmap()
-            pixmap.loadFromData(b64decode(self.utils.get_icon_b64(icon_name))) # type: ignore
-            icon = QtGui.QIcon()
-            icon.addPixmap(pixmap, QtGui.QIcon.Mode.Normal, QtGui.QIcon.State.Off)
             button.setIconSize(QtCore.QSize(100, 100))
-            button.setIcon(icon)
+            button.setIcon(Assets.icon(icon_name))
 
         stylsheet = "QPushButton {\n	border: 0px;\n	border-bottom: 2px solid transparent;\n	color: white;\n	background-color: transparent;\n	font-weight: bold;\n}"
         if interactive_hover:
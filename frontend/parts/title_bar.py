@@ -5,8 +5,8 @@ from PyQt5 import QtWidgets, QtGui, QtCore
 
 from backend.logger import Logger
 from backend.timer import Timer
-from backend.internal_data import InternalData
 
+from frontend.assets import Assets
 from frontend.widgets.quit_button import QuitButton
 from frontend.widgets.minimize_button import MinimizeButton
 
@@ -64,10 +64,7 @@ class TitleBar(QtWidgets.QFrame):
         label = QtWidgets.QLabel(self)
         label.setGeometry(QtCore.QRect(x_position, y_position, width, height))
         font = QtGui.QFont()
-        source_sans_3_black = QtGui.QFontDatabase.applicationFontFamilies(
-            QtGui.QFontDatabase.addApplicationFontFromData(InternalData.source_sans_3_black)
-        )[0]
-        font.setFamily(source_sans_3_black)
+        font.setFamily(Assets.font_family("source_sans_3_black"))
         font.setPointSize(font_size)
         font.setBold(is_bold)
         font.setWeight(75 if is_bold else 50)
@@ -1,11 +1,9 @@
 from typing import Optional
-from base64 import b64decode
 
 from PyQt5.QtWidgets import QMainWindow, QLabel
-from PyQt5.QtGui import QPixmap
 from PyQt5.QtCore import Qt
 
-from backend.utils import Utils
+from frontend.assets import Assets
 
 class MinimizeButton(QLabel):
     def __init__(
@@ -17,14 +15,11 @@ class MinimizeButton(QLabel):
         self.father = father
         self.m_w = m_w
 
-        self.utils = Utils()
         self.clicked_and_hovering = False
         self.hovering = False
 
         self.setAlignment(Qt.AlignCenter) # type: ignore
-        pixmap = QPixmap()
-        pixmap.loadFromData(b64decode(self.utils.get_icon_b64("minus")))
-        self.setPixmap(pixmap)
+        self.setPixmap(Assets.pixmap("minus"))
 
     def mousePressEvent(self, event):
         if event.button() == Qt.RightButton: # type: ignore
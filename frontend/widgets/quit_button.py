@@ -1,11 +1,9 @@
 from typing import Optional
-from base64 import b64decode
 
 from PyQt5.QtWidgets import QMainWindow, QLabel
-from PyQt5.QtGui import QPixmap
 from PyQt5.QtCore import Qt
 
-from backend.utils import Utils
+from frontend.assets import Assets
 
 class QuitButton(QLabel):
     def __init__(
@@ -19,14 +17,11 @@ class QuitButton(QLabel):
         self.m_w = m_w
         self.auto_close = auto_close
 
-        self.utils = Utils()
         self.clicked_and_hovering = False
         self.hovering = False
 
         self.setAlignment(Qt.AlignCenter) # type: ignore
-        pixmap = QPixmap()
-        pixmap.loadFromData(b64decode(self.utils.get_icon_b64("title_bar_quit"))) # type: ignore
-        self.setPixmap(pixmap)
+        self.setPixmap(Assets.pixmap("title_bar_quit"))
 
     def mousePressEvent(self, event):
         if event.button() == Qt.RightButton: # type: ignore
@@ -1,8 +1,12 @@
-from PyQt5.QtCore import pyqtSlot, Qt, QRectF
-from PyQt5.QtGui import (QBrush, QColor, QFont, QPainter,
-                         QPen, QPainterPath, QImage, QPaintEvent)
+from time import perf_counter
+
+from PyQt5.QtCore import pyqtSlot, Qt, QRectF, QPointF
+from PyQt5.QtGui import (QBrush, QColor, QFont, QPainter, QPen,
+                         QPixmap, QPaintEvent, QStaticText)
 from PyQt5.QtWidgets import QWidget
 
+from backend.capabilities import UNAVAILABLE
+
 class QRoundProgressBar(QWidget):
     def __init__(
         self,
@@ -26,78 +30,108 @@ class QRoundProgressBar(QWidget):
         self.inner_radius = inner_radius
         self.width_ = width  # Initialize the width attribute
 
+        # The fonts never change, so they are built once instead of on every paint
+        self.number_font = QFont('Source Sans 3 Black')
+        self.number_font.setPointSize(self.font_size)
+        self.number_font.setBold(True)
+        self.number_font.setWeight(75)
+        self.percentage_font = QFont('Source Sans 3')
+        self.percentage_font.setPointSize(int(self.font_size / 1.75))
+        self.text_pen = QPen(QBrush(QColor(255, 255, 255)), 1)  # White color
+
+        # The ring, the inner disc and the "%" only change with the size, so they live in a pixmap
+        self.static_layer = QPixmap()
+        self.static_layer_key = None
+        # Laid out numbers, keyed by their text (there are at most 101 of them and UNAVAILABLE)
+        self.number_texts = {}
+
+        # Paint statistics, `paint_time / paints` is the average cost of a paint in seconds
+        self.paints = 0
+        self.paint_time = 0.0
+        self.layer_builds = 0
+
     @pyqtSlot(int)
     def set_value(self, val: int):
-        self.current_value = val if 0 <= val <= 100 else 0 if val < 0 else 100
+        # UNAVAILABLE shows as is, without a ring or a "%"
+        value = val if val == UNAVAILABLE or 0 <= val <= 100 else 0 if val < 0 else 100
+        if value == self.current_value:
+            return
+
+        self.current_value = value
         self.update()
 
     def paintEvent(self, event: QPaintEvent):
+        start_time = perf_counter()
         widget_dimensions = min(self.width(), self.height())
-        widget_container = QRectF(1, 1, widget_dimensions - 2, widget_dimensions - 2)
-        progress_bar = QImage(
-            widget_dimensions,
-            widget_dimensions,
-            QImage.Format_ARGB32_Premultiplied  # A format that supports transparency
-        )
-
-        painter = QPainter(progress_bar)  # Create a painter to draw the progress bar
-        painter.setRenderHint(QPainter.Antialiasing)  # Enable antialiasing for smoother drawing
+        inner_rect, inner_radius = self.calculate_inner_rect(widget_dimensions)
 
-        # Clear the image with a transparent background
-        progress_bar.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.get_static_layer(widget_dimensions))
 
-        # Draw the default color of the progress bar
-        self.draw_default_color(painter, widget_container)
-        # Draw the progress bar
-        self.draw_progress(painter, widget_container, self.current_value)
+        painter.setRenderHint(QPainter.Antialiasing)
+        if self.current_value != UNAVAILABLE:
+            self.draw_progress(painter, widget_dimensions, inner_radius, self.current_value)
+        self.draw_text(painter, inner_rect, self.current_value)
+        painter.end()
 
-        # Calculate the inner rectangle and radius for the progress bar
-        inner_rect, inner_radius = self.calculate_inner_rect(widget_dimensions)
+        self.paints += 1
+        self.paint_time += perf_counter() - start_time
 
-        # Draw the inner background of the progress bar
-        self.draw_inner_background(painter, inner_rect)
+    def get_static_layer(self, widget_dimensions: int) -> QPixmap:
+        ratio = self.devicePixelRatioF()
+        key = (
+            widget_dimensions, ratio, self.width_, self.font_size,
+            self.default_color.rgba(), self.inner_background_color.rgba(),
+            self.current_value == UNAVAILABLE,
+        )
+        if key == self.static_layer_key:
+            return self.static_layer
 
-        # Draw the text on the progress bar
-        self.draw_text(painter, inner_rect, self.current_value)
+        # Render at the device resolution so the cached layer stays sharp on scaled screens
+        pixmap = QPixmap(int(widget_dimensions * ratio), int(widget_dimensions * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
 
-        # Finish drawing on the buffer image
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        widget_container = QRectF(1, 1, widget_dimensions - 2, widget_dimensions - 2)
+        inner_rect, inner_radius = self.calculate_inner_rect(widget_dimensions)
+        self.draw_default_color(painter, widget_container)
+        self.draw_inner_background(painter, inner_rect)
+        if self.current_value != UNAVAILABLE:
+            self.draw_percentage(painter, inner_rect)
         painter.end()
 
-        # Create a painter to draw on the widget
-        main_painter = QPainter(self)
+        self.static_layer = pixmap
+        self.static_layer_key = key
+        self.number_texts.clear()
+        self.layer_builds += 1
+        return pixmap
 
-        # Make the background of the widget transparent
-        main_painter.fillRect(widget_container, Qt.GlobalColor.transparent)
+    def draw_progress(self, painter: QPainter, widget_dimensions: int, inner_radius: float, value: float):
+        if value <= 0:
+            return
 
-        # Draw the progress bar on the widget
-        main_painter.drawImage(0, 0, progress_bar)
+        # A flat-capped arc as wide as the ring, drawn between the ring and the inner disc
+        outer_radius = widget_dimensions / 2
+        ring_width = outer_radius - inner_radius
+        center = outer_radius - ring_width / 2
+        arc_rect = QRectF(ring_width / 2, ring_width / 2, center * 2, center * 2)
 
-    def draw_progress(self, painter: QPainter, widget_container: QRectF, value: float):
-        data_path = QPainterPath()
-        data_path.setFillRule(Qt.FillRule.WindingFill)
+        pen = QPen(self.progress_color, ring_width)
+        pen.setCapStyle(Qt.PenCapStyle.FlatCap)
+        painter.setPen(pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
 
+        # Qt angles are in 1/16th of a degree
         arc_length = 360 * (value / 100.0)  # Calculate the length of the arc
-
-        # Draw the progress bar arc
-        data_path.moveTo(widget_container.center())
-        outer_rect = widget_container.adjusted(-1, -1, 1, 1)
-        data_path.arcTo(outer_rect, self.start_position, -arc_length)
-        data_path.lineTo(widget_container.center())
-
-        painter.setBrush(QBrush(self.progress_color))
-        painter.setPen(Qt.GlobalColor.transparent)
-        painter.drawPath(data_path)
+        painter.drawArc(arc_rect, self.start_position * 16, int(-arc_length * 16))
 
     def draw_default_color(self, painter: QPainter, widget_container: QRectF):
-        data_path = QPainterPath()
-        data_path.setFillRule(Qt.FillRule.WindingFill)
-
         # Outer ellipse for default color
-        data_path.addEllipse(widget_container)
-
         painter.setBrush(QBrush(self.default_color))
         painter.setPen(Qt.GlobalColor.transparent)
-        painter.drawPath(data_path)
+        painter.drawEllipse(widget_container)
 
     def calculate_inner_rect(self, widget_dimensions: float):
         # This is the area inside the progress bar
@@ -113,34 +147,42 @@ class QRoundProgressBar(QWidget):
         painter.setPen(Qt.GlobalColor.transparent)
         painter.drawEllipse(inner_rect)
 
-    def draw_text(self, painter: QPainter, inner_rect: QRectF, value: float):
-        # Set the initial font and calculate metrics
-        number_font = QFont('Source Sans 3 Black')
-        number_font.setPointSize(self.font_size)
-        number_font.setBold(True)
-        number_font.setWeight(75)
-
-        painter.setFont(number_font)
-
-        # Draw the text on the progress bar and move it upwards a bit
+    def number_rect(self, inner_rect: QRectF) -> QRectF:
+        # The number is moved upwards a bit to make room for the "%" under it
         text_rect = QRectF(inner_rect)
-        text_rect.moveTop(text_rect.top() - number_font.pointSize() * 0.2)
-
-        # Set text color to white
-        painter.setPen(QPen(QBrush(QColor(255, 255, 255)), 1))  # White color
-        painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, self.value_to_text(value))
+        text_rect.moveTop(text_rect.top() - self.number_font.pointSize() * 0.2)
+        return text_rect
 
+    def draw_text(self, painter: QPainter, inner_rect: QRectF, value: float):
+        text = self.value_to_text(value)
+        static_text = self.number_texts.get(text)
+
+        if static_text is None:
+            static_text = QStaticText(text)
+            static_text.setTextFormat(Qt.TextFormat.PlainText)
+            static_text.prepare(painter.transform(), self.number_font)
+            # Centered in the number rect, the same place AlignCenter puts it
+            center = self.number_rect(inner_rect).center()
+            size = static_text.size()
+            position = QPointF(center.x() - size.width() / 2, center.y() - size.height() / 2)
+            static_text = self.number_texts[text] = (static_text, position)
+
+        painter.setFont(self.number_font)
+        painter.setPen(self.text_pen)
+        painter.drawStaticText(static_text[1], static_text[0])
+
+    def draw_percentage(self, painter: QPainter, inner_rect: QRectF):
         # Draw text "%" under the value and make it smaller
-        percentage_font = QFont('Source Sans 3')
-        percentage_font.setPointSize(int(number_font.pointSize() / 1.75))
-        painter.setFont(percentage_font)
-        text_rect.moveTop(text_rect.top() + (percentage_font.pointSize() * 3) * self.inner_radius)
+        text_rect = self.number_rect(inner_rect)
+        text_rect.moveTop(text_rect.top() + (self.percentage_font.pointSize() * 3) * self.inner_radius)
 
-        # Set text color to white
-        painter.setPen(QPen(QBrush(QColor(255, 255, 255)), 1))  # White color
+        painter.setFont(self.percentage_font)
+        painter.setPen(self.text_pen)
         painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, '%')
 
     def value_to_text(self, value: float):
+        if value == UNAVAILABLE:
+            return UNAVAILABLE
         text_to_draw = str(round((value - 0) / (100 - 0) * 100, 2))
         if text_to_draw.endswith('.0'):
             text_to_draw = text_to_draw[:-2]
@@ -0,0 +1,133 @@
+import numpy as np
+
+from typing import Optional
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QPainter, QPaintEvent, QPen, QPolygonF
+from PyQt5.QtWidgets import QWidget
+
+from backend.history import HistoryStore
+
+class Sparkline(QWidget):
+    def __init__(
+        self,
+        parent,
+        store: HistoryStore,
+        key: str,
+        window: float = 300,
+        minimum: Optional[float] = 0,
+        maximum: Optional[float] = 100,
+        line_color: QColor = QColor(90, 93, 90),
+        line_width: float = 1.5,
+    ):
+        """A small time-series chart of a metric's recent history.
+
+        The history is reduced to a min/max pair per pixel column and drawn with one
+        drawPolyline from a preallocated point buffer. The reduction only runs when the
+        store has new rows or the widget is resized, repaints just draw the buffer.
+
+        Args:
+        ---------
+            parent: The parent widget.
+            store (HistoryStore): The history to draw from.
+            key (str): The metric key.
+            window (float): How many seconds of history to show.
+            minimum (float): The value at the bottom, the lowest value shown if None.
+            maximum (float): The value at the top, the highest value shown if None.
+            line_color (QColor): The color of the line.
+            line_width (float): The width of the line.
+        """
+        super().__init__(parent)
+        self.store = store
+        self.key = key
+        self.window = window
+        self.minimum = minimum
+        self.maximum = maximum
+        self.pen = QPen(line_color, line_width)
+        self.pen.setCosmetic(True)
+
+        self.points = QPolygonF()
+        self.point_buffer = np.empty((0, 2), dtype = np.float64)
+        self._decimated_count = -1
+        self._decimated_size = None
+
+    def refresh(self):
+        """Schedule a repaint if the store has rows this chart hasn't drawn yet."""
+        if self.store.count != self._decimated_count:
+            self.update()
+
+    def allocate(self, columns: int):
+        # Two points (min and max) per pixel column, written in place through a NumPy view
+        self.points = QPolygonF(2 * columns)
+        pointer = self.points.data()
+        pointer.setsize(2 * columns * 2 * 8) # type: ignore
+        self.point_buffer = np.frombuffer(pointer, dtype = np.float64).reshape(-1, 2) # type: ignore
+
+    def decimate(self):
+        width, height = self.width(), self.height()
+        if self._decimated_size != (width, height):
+            self.allocate(max(1, width))
+            self._decimated_size = (width, height)
+        self._decimated_count = self.store.count
+
+        buffer = self.point_buffer
+        columns = len(buffer) // 2
+        rows = int(self.window / self.store.resolution)
+        timestamps, values = self.store.latest(self.key, rows)
+
+        if len(values) < 2:
+            buffer[:] = (0, height)
+            return
+
+        # Every pixel column covers the same number of rows, so the columns are rows of a reshape.
+        # The oldest column is padded with NaN so the newest row always lands in the last one.
+        per_column = max(1, -(-rows // columns))
+        padding = -len(values) % per_column
+        if padding:
+            values = np.concatenate((np.full(padding, np.nan), values))
+        blocks = values.reshape(-1, per_column)
+
+        low = np.where(np.isnan(blocks), np.inf, blocks)
+        high = np.where(np.isnan(blocks), -np.inf, blocks)
+        low_index, high_index = low.argmin(axis = 1), high.argmax(axis = 1)
+        rows_index = np.arange(len(blocks))
+        lows, highs = low[rows_index, low_index], high[rows_index, high_index]
+
+        # Keep the order the extremes happened in, that's what preserves the shape
+        low_first = low_index <= high_index
+        first = np.where(low_first, lows, highs)
+        second = np.where(low_first, highs, lows)
+        series = np.column_stack((first, second)).ravel()
+
+        finite = np.isfinite(series)
+        if not finite.any():
+            buffer[:] = (0, height)
+            return
+
+        minimum = series[finite].min() if self.minimum is None else self.minimum
+        maximum = series[finite].max() if self.maximum is None else self.maximum
+        span = maximum - minimum or 1
+
+        # Right-align the newest value, the columns that have no data yet are left empty
+        count = len(series)
+        x = width - 1 - (count - 1 - np.arange(count)) * ((width - 1) / max(1, 2 * (-(-rows // per_column)) - 1))
+        y = (height - 1) - (np.clip(series, minimum, maximum) - minimum) / span * (height - 1)
+        y = np.where(finite, y, np.nan)
+
+        # Gaps repeat the previous point, the unused tail of the buffer repeats the last one
+        valid = np.flatnonzero(finite)
+        fill = valid[np.maximum(np.searchsorted(valid, np.arange(count), side = "right") - 1, 0)]
+        buffer[:count, 0] = x
+        buffer[:count, 1] = y[fill]
+        buffer[count:] = buffer[count - 1]
+
+    def paintEvent(self, event: QPaintEvent):
+        if self.store.count != self._decimated_count or self._decimated_size != (self.width(), self.height()):
+            self.decimate()
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(self.pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawPolyline(self.points)
+        painter.end()
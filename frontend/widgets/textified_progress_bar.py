@@ -1,8 +1,10 @@
 from PyQt5 import QtCore, QtGui, QtWidgets
-from PyQt5.QtWidgets import QWidget, QProgressBar, QLabel
-from PyQt5.QtGui import QFontMetrics, QFont
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtGui import QColor, QFont, QFontMetricsF, QPainter, QPaintEvent
 
-from backend.internal_data import InternalData
+from backend.capabilities import UNAVAILABLE
+
+from frontend.assets import Assets
 
 class TextifiedProgressBar(QWidget):
     def __init__(
@@ -20,118 +22,124 @@ class TextifiedProgressBar(QWidget):
         progress_bar_width: int,
         progress_bar_height: int,
     ):
+        """A flat progress bar with a big number and a percent sign above it, plus an identifier label.
+
+        The number, the percent sign and the bar are painted by the widget itself. The width of
+        every character the number can use is measured once, so `set_value` only does arithmetic
+        and repaints nothing when the displayed text and bar length did not change. UNAVAILABLE
+        is shown as is, with an empty bar and no percent sign.
+        Positions are given in the coordinates of `parent`, like the rest of the page.
+        """
         super().__init__(parent)
         # First, load the fonts
-        self.source_sans_3 = QtGui.QFontDatabase.applicationFontFamilies(
-            QtGui.QFontDatabase.addApplicationFontFromData(InternalData.source_sans_3)
-        )[0]
-        self.source_sans_3_black = QtGui.QFontDatabase.applicationFontFamilies(
-            QtGui.QFontDatabase.addApplicationFontFromData(InternalData.source_sans_3_black)
-        )[0]
-
-        # Second we initialize the indentifier text
-        self.label = self.create_label(
-            label_pos_x, label_pos_y, label_width, label_height, label_text, self.source_sans_3_black, label_font_size, False)
-
-        # Third we initiate the progress bar
-        self.progress_bar = QProgressBar(self)
-        self.progress_bar.setGeometry(progress_bar_pos_x, progress_bar_pos_y, progress_bar_width, progress_bar_height)
-        self.progress_bar.setStyleSheet("QProgressBar{\n	background-color: rgb(42, 43, 42);\n    border: 0px;\n}\n\nQProgressBar::chunk {\n    background-color: rgb(22, 23, 22);\n}\n")
-        self.progress_bar.setValue(0 if value < 0 else 100 if value > 100 else value)
-        self.progress_bar.setTextVisible(False)
-
-        # Now we create the text above the progress bar
-        # There are two text labels here, the number which is big, and the percent sign which is small
-
-        # Number label
-        number_text = str(value) if value >= 0 else "?"
-        self.number_label = QLabel(number_text, self)
-        number_font = QFont(self.source_sans_3_black)
+        self.source_sans_3 = Assets.font_family("source_sans_3")
+        self.source_sans_3_black = Assets.font_family("source_sans_3_black")
+
+        # The number is big, the percent sign next to it is small
+        self.number_font = QFont(self.source_sans_3_black)
         number_font_size = int(label_font_size * 1.733)
-        number_font.setPointSize(number_font_size)
-        self.number_label.setFont(number_font)
-        self.number_label.setStyleSheet("QLabel {\n	background-color: none;\n	color: white;\n}")
-
-        # Calculate the width and height of the label text
-        number_font_metrics = QFontMetrics(number_font)
-        number_text_width = number_font_metrics.horizontalAdvance(number_text)
-        number_text_height = number_font_metrics.height()
-
-        # Calculate the X position to center the label above the progress bar
-        number_label_x = int(progress_bar_pos_x + (progress_bar_width - number_text_width) / 2)
-
-        self.number_label.setGeometry(
-            number_label_x,
-            progress_bar_pos_y - number_text_height - 5,
-            number_text_width,
-            number_text_height
+        self.number_font.setPointSize(number_font_size)
+        self.percent_font = QFont(self.source_sans_3)
+        self.percent_font.setPointSize(int(number_font_size * 0.5))
+
+        # Measure everything the number can be made of once, widths are then a sum of lookups
+        number_font_metrics = QFontMetricsF(self.number_font)
+        percent_font_metrics = QFontMetricsF(self.percent_font)
+        self.advances = {character: number_font_metrics.horizontalAdvance(character) for character in "0123456789.?" + UNAVAILABLE}
+        self.number_ascent = number_font_metrics.ascent()
+        self.number_height = number_font_metrics.height()
+        self.percent_ascent = percent_font_metrics.ascent()
+        self.percent_width = percent_font_metrics.horizontalAdvance("%")
+        self.percent_height = percent_font_metrics.height()
+
+        # The widget covers the label, the bar and the text above it, everything else is relative to it
+        widest_number = sum(self.advances[character] for character in "100.0")
+        left = min(label_pos_x, progress_bar_pos_x)
+        top = min(label_pos_y, int(progress_bar_pos_y - self.number_height - 5), int(progress_bar_pos_y / 1.06))
+        right = max(
+            label_pos_x + label_width,
+            progress_bar_pos_x + progress_bar_width,
+            int(progress_bar_pos_x + (progress_bar_width + widest_number) / 2 + 3 + self.percent_width) + 1,
         )
-
-        # Percent label
-        self.percent_label = QLabel("%", self)
-        percent_font = QFont(self.source_sans_3)
-        percent_font_size = int(number_font_size * 0.5)
-        percent_font.setPointSize(percent_font_size)
-        self.percent_label.setFont(percent_font)
-        self.percent_label.setStyleSheet("QLabel {\n	background-color: none;\n	color: white;\n}")
-
-        # Calculate the width and height of the label text
-        percent_font_metrics = QFontMetrics(percent_font)
-        percent_text_width = percent_font_metrics.horizontalAdvance("%")
-        percent_text_height = percent_font_metrics.height()
-
-        # Calculate the X position to center the label above the progress bar
-        percent_label_x = number_label_x + number_text_width + 3
-
-        self.percent_label.setGeometry(
-            percent_label_x,
-            int(progress_bar_pos_y / 1.06),
-            percent_text_width,
-            percent_text_height
+        bottom = max(
+            label_pos_y + label_height,
+            progress_bar_pos_y + progress_bar_height,
+            int(progress_bar_pos_y / 1.06 + self.percent_height) + 1,
         )
-    
+        self.setGeometry(left, top, right - left, bottom - top)
+
+        self.bar_rect = QtCore.QRectF(progress_bar_pos_x - left, progress_bar_pos_y - top, progress_bar_width, progress_bar_height)
+        self.number_bottom = self.bar_rect.top() - 5
+        self.percent_top = int(progress_bar_pos_y / 1.06) - top
+        # Only this part changes with the value, the label above it is never repainted for it
+        self.value_rect = QtCore.QRect(
+            0, int(min(self.number_bottom - self.number_height, self.percent_top)),
+            self.width(), self.height()
+        )
+
+        self.background_color = QColor(42, 43, 42)
+        self.chunk_color = QColor(22, 23, 22)
+        self.text_color = QColor(255, 255, 255)
+
+        # Then we initialize the indentifier text
+        self.label = self.create_label(
+            label_pos_x - left, label_pos_y - top, label_width, label_height, label_text, self.source_sans_3_black, label_font_size, False)
+
+        self.number_text = str(value) if value >= 0 else "?"
+        self.bar_value = 0 if value < 0 else 100 if value > 100 else value
+        self.number_width = self.text_width(self.number_text)
+
+    def text_width(self, text: str) -> float:
+        return sum(self.advances.get(character, self.advances["0"]) for character in text)
+
     def set_value(self, value: float, leave_as_float: bool = False):
-        if leave_as_float:
+        if value == UNAVAILABLE:
+            number_text, bar_value = UNAVAILABLE, 0
+        elif leave_as_float:
             # Get first decimal place only
             value = round(float(value), 1)
             # If the value is 0.0, we set it to 0
             if value == 0.0:
                 value = 0
-            self.progress_bar.setValue(int(float(value)))
-            self.number_label.setText(str(value))
-        else:
-            self.progress_bar.setValue(int(float(value)))
-            self.number_label.setText(str(int(float(value))))
-
-        # Update the position of the number label
-        if leave_as_float:
             number_text = str(value)
         else:
             number_text = str(int(float(value)))
-        number_font = self.number_label.font()
-        number_font_metrics = QFontMetrics(number_font)
-        number_text_width = number_font_metrics.horizontalAdvance(number_text)
-        number_text_height = number_font_metrics.height()
-        number_label_x = int(self.progress_bar.x() + (self.progress_bar.width() - number_text_width) / 2)
-        self.number_label.setGeometry(
-            number_label_x,
-            self.progress_bar.y() - number_text_height - 5,
-            number_text_width,
-            number_text_height
-        )
 
-        # Update the position of the percent label
-        percent_font = self.percent_label.font()
-        percent_font_metrics = QFontMetrics(percent_font)
-        percent_text_width = percent_font_metrics.horizontalAdvance("%")
-        percent_text_height = percent_font_metrics.height()
-        percent_label_x = number_label_x + number_text_width + 3
-        self.percent_label.setGeometry(
-            percent_label_x,
-            int(self.progress_bar.y() / 1.06),
-            percent_text_width,
-            percent_text_height
-        )
+        if value != UNAVAILABLE:
+            bar_value = int(float(value))
+            bar_value = 0 if bar_value < 0 else 100 if bar_value > 100 else bar_value
+
+        # Most updates show the same thing again, those don't need a repaint
+        if number_text == self.number_text and bar_value == self.bar_value:
+            return
+
+        self.number_text = number_text
+        self.bar_value = bar_value
+        self.number_width = self.text_width(number_text)
+        self.update(self.value_rect)
+
+    def paintEvent(self, event: QPaintEvent):
+        painter = QPainter(self)
+
+        # The bar
+        painter.fillRect(self.bar_rect, self.background_color)
+        if self.bar_value:
+            chunk = QtCore.QRectF(self.bar_rect)
+            chunk.setWidth(self.bar_rect.width() * self.bar_value / 100)
+            painter.fillRect(chunk, self.chunk_color)
+
+        # The number, centered above the bar
+        number_x = int(self.bar_rect.x() + (self.bar_rect.width() - self.number_width) / 2)
+        painter.setPen(self.text_color)
+        painter.setFont(self.number_font)
+        painter.drawText(QtCore.QPointF(number_x, self.number_bottom - self.number_height + self.number_ascent), self.number_text)
+
+        # The percent sign, right after the number
+        if self.number_text != UNAVAILABLE:
+            painter.setFont(self.percent_font)
+            painter.drawText(QtCore.QPointF(number_x + self.number_width + 3, self.percent_top + self.percent_ascent), "%")
+
+        painter.end()
 
     def create_label(
         self,
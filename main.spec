@@ -5,7 +5,7 @@ a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('frontend/icons/nyx.png', 'frontend/icons')],
+    datas=[('frontend/icons/*.png', 'frontend/icons'), ('frontend/fonts/*.ttf', 'frontend/fonts')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
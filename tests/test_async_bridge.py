@@ -0,0 +1,86 @@
+import os, time, asyncio, threading
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtCore = pytest.importorskip("PyQt5.QtCore")
+
+from frontend.async_bridge import AsyncBridge
+
+@pytest.fixture(scope = "module")
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+@pytest.fixture
+def bridge(app):
+    bridge = AsyncBridge()
+    yield bridge
+    bridge.stop()
+
+def process_events_until(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        QtCore.QCoreApplication.processEvents(QtCore.QEventLoop.AllEvents, 10)
+        time.sleep(0.005)
+    return condition()
+
+async def loop_thread() -> str:
+    await asyncio.sleep(0)
+    return threading.current_thread().name
+
+def test_result_is_delivered_on_the_gui_thread(bridge):
+    delivered = []
+
+    bridge.submit(loop_thread(), lambda result: delivered.append((result, threading.current_thread() is threading.main_thread())))
+
+    assert process_events_until(lambda: delivered)
+    assert delivered == [("NyxAsyncLoop", True)]
+
+def test_failures_and_cancellations_call_nothing(bridge):
+    delivered = []
+
+    async def fail():
+        raise RuntimeError("no sensor")
+
+    bridge.submit(fail(), delivered.append)
+    cancelled = bridge.submit(asyncio.sleep(30), delivered.append)
+    cancelled.cancel()
+    bridge.submit(loop_thread(), delivered.append)
+
+    assert process_events_until(lambda: delivered)
+    assert delivered == ["NyxAsyncLoop"]
+
+def test_runs_that_are_still_going_arent_started_twice(bridge):
+    runs = []
+
+    async def slow():
+        runs.append(time.monotonic())
+        await asyncio.sleep(0.3)
+
+    timer = bridge.every(50, slow)
+    process_events_until(lambda: False, timeout = 0.5)
+    timer.stop()
+
+    # Started right away and once the first one finished, not on every tick
+    assert len(runs) == 2
+
+def test_run_waits_for_the_result(bridge):
+    assert bridge.run(loop_thread(), timeout = 5) == "NyxAsyncLoop"
+
+def test_stop_cancels_what_is_running(app):
+    bridge = AsyncBridge()
+    cancelled = threading.Event()
+
+    async def forever():
+        try:
+            await asyncio.sleep(30)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    bridge.submit(forever())
+    time.sleep(0.1)
+    bridge.stop()
+
+    assert cancelled.is_set()
+    assert bridge.loop.is_closed()
@@ -0,0 +1,83 @@
+import time, shutil, asyncio
+
+import psutil
+import pytest
+
+from backend.async_command_channel import AsyncCommandChannel
+
+pytestmark = pytest.mark.skipif(shutil.which("sh") is None, reason = "needs a POSIX shell")
+
+def run(test, size: int = 2):
+    """Run `test(channel)` on a fresh event loop, closing the channel afterwards."""
+    async def main():
+        channel = AsyncCommandChannel(["sh"], timeout = 5, size = size)
+        try:
+            return await test(channel)
+        finally:
+            await channel.close()
+    return asyncio.run(main())
+
+def test_queries_run_on_as_many_shells_at_once():
+    async def test(channel):
+        start = time.monotonic()
+        replies = await asyncio.gather(*(channel.query(f"sleep 0.3; echo {index}") for index in range(3)))
+        return replies, time.monotonic() - start, channel.spawns
+
+    replies, elapsed, spawns = run(test)
+
+    assert replies == ["0", "1", "2"]
+    # Two at once, the third waits for a free shell
+    assert 0.6 <= elapsed < 1.5
+    assert spawns == 2
+
+def test_timed_out_query_kills_the_shell_and_what_it_started():
+    async def test(channel):
+        await channel.query("echo warm")
+        [process] = channel._processes
+        shell = psutil.Process(process.pid)
+        await channel.query("sleep 30 & echo started", timeout = 5)
+        [sleeper] = shell.children()
+
+        start = time.monotonic()
+        with pytest.raises(TimeoutError):
+            await channel.query("sleep 30", timeout = 0.2)
+        elapsed = time.monotonic() - start
+
+        return elapsed, process.returncode, sleeper, await channel.query("echo again"), channel.spawns
+
+    elapsed, returncode, sleeper, reply, spawns = run(test, size = 1)
+
+    # Killing doesn't wait out the kill timeout for pipes held by the shell's children
+    assert elapsed < 0.9
+    assert returncode is not None
+    assert not sleeper.is_running() or sleeper.status() == psutil.STATUS_ZOMBIE
+    assert (reply, spawns) == ("again", 2)
+
+def test_cancelled_query_kills_its_shell():
+    async def test(channel):
+        task = asyncio.ensure_future(channel.query("sleep 30; echo late"))
+        await asyncio.sleep(0.2)
+        [process] = channel._processes
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return process.returncode, channel.alive, await channel.query("echo next")
+
+    returncode, alive, reply = run(test, size = 1)
+
+    assert returncode is not None
+    assert alive == 0
+    # The reply of the cancelled query isn't taken for the next one
+    assert reply == "next"
+
+def test_close_stops_every_shell():
+    async def test(channel):
+        await asyncio.gather(channel.query("sleep 0.1; echo a"), channel.query("sleep 0.1; echo b"))
+        processes = list(channel._processes)
+        await channel.close()
+        return [process.returncode for process in processes], channel.alive
+
+    returncodes, alive = run(test)
+
+    assert None not in returncodes
+    assert alive == 0
@@ -0,0 +1,77 @@
+import time, asyncio
+
+from backend.async_nyx_base import AsyncNyxBase
+from backend.nyx_base import NyxBase
+from benchmarks.fake_system_sources import FakeSystemSources
+
+class PlatformNyxBase(NyxBase):
+    """A platform that reads what NyxBase asks PowerShell for its own way, without a temperature sensor."""
+
+    def get_cpu_temperature(self):
+        raise FileNotFoundError("No CPU temperature sensor was found")
+
+    def get_cpu_usage(self):
+        return 7.0
+
+    def get_drive_type(self):
+        return "SSD"
+
+    def get_power_plan(self):
+        return "performance"
+
+def run(nyx_base: NyxBase, test):
+    """Run `test(async_nyx_base)` on a fresh event loop, closing it afterwards."""
+    async def main():
+        async_nyx_base = AsyncNyxBase(nyx_base)
+        try:
+            return await test(async_nyx_base)
+        finally:
+            await async_nyx_base.close()
+    return asyncio.run(main())
+
+def test_read_all_reads_every_probe_at_once():
+    sources = FakeSystemSources(latency = 0.2)
+    start = time.monotonic()
+
+    values = run(NyxBase(sources = sources), lambda async_nyx_base: async_nyx_base.read_all())
+
+    assert sorted(values) == ["cpu", "disk", "disk.io_percent", "gpu", "net.lan", "net.wifi", "power_plan", "ram"]
+    assert (values["cpu"].temperature, values["cpu"].usage, values["power_plan"]) == (51.85, 23.0, "Balanced")
+    # Far less than the sum of the queries and reads, each takes 0.2s
+    assert time.monotonic() - start < 1.5
+
+def test_platform_getters_are_used_instead_of_powershell():
+    sources = FakeSystemSources()
+
+    async def test(async_nyx_base):
+        return (
+            await async_nyx_base.get_cpu_usage(),
+            await async_nyx_base.get_drive_type(),
+            await async_nyx_base.get_power_plan(),
+        )
+
+    assert run(PlatformNyxBase(sources = sources), test) == (7.0, "SSD", "performance")
+    assert sources.queries == 0
+
+def test_missing_temperature_sensor_leaves_the_rest_of_the_cpu():
+    async def test(async_nyx_base):
+        return await async_nyx_base.read_all(["cpu"]), async_nyx_base.diagnostics()["cpu"]
+
+    values, stats = run(PlatformNyxBase(sources = FakeSystemSources()), test)
+
+    cpu = values["cpu"]
+    assert (cpu.temperature, cpu.usage, cpu.processor) == (None, 7.0, NyxBase(sources = FakeSystemSources()).get_cpu_name())
+    assert "Temperature: N/A" in str(cpu)
+    # The failure is still counted against the probe
+    assert stats["errors"] == 1
+    assert stats["last_error"].startswith("FileNotFoundError")
+
+def test_probe_that_misses_its_deadline_is_left_out_of_the_others():
+    async def test(async_nyx_base):
+        return await async_nyx_base.read_all(["cpu", "ram"], timeout = 0.1), async_nyx_base.diagnostics()
+
+    values, diagnostics = run(NyxBase(sources = FakeSystemSources(latency = 0.5)), test)
+
+    # Only the shell queries are slow
+    assert list(values) == ["ram"]
+    assert diagnostics["cpu"]["timeouts"] == 1
@@ -0,0 +1,74 @@
+from backend.capabilities import CapabilityRegistry, CircuitBreaker
+
+def fail(breaker, times, now = 0.0, timed_out = False):
+    for _ in range(times):
+        state = breaker.record(True, timed_out = timed_out, now = now)
+    return state
+
+def test_source_failing_its_first_reads_is_unavailable():
+    breaker = CircuitBreaker(failure_threshold = 3, max_reset_timeout = 300.0)
+
+    assert fail(breaker, 2) == CircuitBreaker.CLOSED
+    assert fail(breaker, 1, now = 10.0) == CircuitBreaker.UNAVAILABLE
+    assert not breaker.allow(now = 309.0)
+    assert breaker.allow(now = 310.0)
+
+def test_timeouts_never_make_a_source_unavailable():
+    breaker = CircuitBreaker(failure_threshold = 3, reset_timeout = 5.0)
+
+    assert fail(breaker, 5, timed_out = True) == CircuitBreaker.OPEN
+
+def test_slow_call_counts_as_timed_out():
+    breaker = CircuitBreaker(failure_threshold = 1, timeout = 1.0)
+
+    assert breaker.record(False, elapsed = 2.0, now = 0.0) == CircuitBreaker.OPEN
+    assert not breaker.probed
+
+def test_failures_after_a_success_open_the_breaker():
+    breaker = CircuitBreaker(failure_threshold = 3, reset_timeout = 5.0)
+    breaker.record(False, now = 0.0)
+
+    assert fail(breaker, 2) == CircuitBreaker.CLOSED
+    assert fail(breaker, 1) == CircuitBreaker.OPEN
+    assert not breaker.allow(now = 4.9)
+    assert breaker.allow(now = 5.0)
+
+def test_backoff_doubles_up_to_max_reset_timeout():
+    breaker = CircuitBreaker(failure_threshold = 1, reset_timeout = 5.0, max_reset_timeout = 30.0)
+    breaker.record(False, now = 0.0)
+
+    delays = []
+    for now in range(5):
+        breaker.record(True, now = float(now))
+        delays.append(breaker.retry_at - now)
+
+    assert delays == [5.0, 10.0, 20.0, 30.0, 30.0]
+
+def test_success_closes_the_breaker_and_resets_the_backoff():
+    breaker = CircuitBreaker(failure_threshold = 1, reset_timeout = 5.0)
+    breaker.record(False, now = 0.0)
+    fail(breaker, 3)
+
+    assert breaker.record(False, now = 100.0) == CircuitBreaker.CLOSED
+    assert (breaker.failures, breaker.opens) == (0, 0)
+    assert breaker.allow(now = 100.0)
+    fail(breaker, 1, now = 100.0)
+    assert breaker.retry_at == 105.0
+
+def test_success_makes_an_unavailable_source_available():
+    breaker = CircuitBreaker(failure_threshold = 1)
+    fail(breaker, 1)
+
+    assert breaker.record(False, now = 300.0) == CircuitBreaker.CLOSED
+    # It was there after all, so failing again only opens the breaker
+    assert fail(breaker, 1, now = 300.0) == CircuitBreaker.OPEN
+
+def test_registry_lists_unavailable_sources():
+    registry = CapabilityRegistry(failure_threshold = 1)
+    fail(registry.register("gpu"), 1)
+    registry.register("cpu").record(False)
+
+    assert registry.unavailable() == ["gpu"]
+    assert registry.register("gpu") is registry.breakers["gpu"]
+    assert registry.is_available("cpu")
+    assert registry.is_available("unknown")
@@ -0,0 +1,41 @@
+import shutil
+
+import pytest
+
+from backend.command_channel import CommandChannel
+from backend.instrumentation import SourceStats, context
+
+pytestmark = pytest.mark.skipif(shutil.which("sh") is None, reason = "needs a POSIX shell")
+
+@pytest.fixture
+def channel():
+    channel = CommandChannel(["sh"], timeout = 10)
+    yield channel
+    channel.close()
+
+@pytest.fixture
+def stats():
+    context.stats = stats = SourceStats()
+    yield stats
+    context.stats = None
+
+def test_query_returns_what_the_shell_printed(channel, stats):
+    assert channel.query("echo one; echo two") == "one\ntwo"
+    assert channel.query("echo three") == "three"
+    assert (channel.spawns, stats.spawns) == (1, 1)
+
+def test_cpu_time_of_the_shell_is_charged_to_the_source(channel, stats):
+    channel.query("echo warm")
+    before = stats.child_cpu_time
+
+    channel.query("i=0; while [ $i -lt 100000 ]; do i=$((i + 1)); done; echo $i")
+
+    assert stats.child_cpu_time - before > 0.01
+
+def test_cpu_time_of_children_the_shell_waited_for_is_charged(channel, stats):
+    channel.query("echo warm")
+    before = stats.child_cpu_time
+
+    channel.query("sh -c 'i=0; while [ $i -lt 100000 ]; do i=$((i + 1)); done'; echo done")
+
+    assert stats.child_cpu_time - before > 0.01
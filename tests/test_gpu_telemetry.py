@@ -0,0 +1,74 @@
+import pytest
+
+from backend.gpu_telemetry import GPUTelemetry
+from benchmarks.fake_nvml import FakeDevice, FakeNVML
+
+def test_read_returns_every_field():
+    nvml = FakeNVML([FakeDevice(name = "GPU", temperature = 61, usage = 12, clock = 1500, memory_clock = 7000, fan_speed = 30)])
+    gpu = GPUTelemetry(nvml).read()
+
+    assert (gpu.name, gpu.temperature, gpu.usage, gpu.clock, gpu.memory_clock, gpu.fan_speed) == ("GPU", 61, 12.0, 1500, 7000, 30)
+
+def test_readings_are_shared_within_max_age():
+    nvml = FakeNVML()
+    telemetry = GPUTelemetry(nvml, max_age = 60)
+
+    telemetry.read()
+    telemetry.read()
+    telemetry.read_all()
+
+    assert nvml.calls["nvmlInit"] == 1
+    assert nvml.calls["nvmlDeviceGetTemperature"] == 1
+
+def test_readings_expire_after_max_age():
+    nvml = FakeNVML()
+    telemetry = GPUTelemetry(nvml, max_age = 0)
+
+    telemetry.read()
+    telemetry.read()
+
+    assert nvml.calls["nvmlDeviceGetTemperature"] == 2
+
+def test_every_gpu_is_read():
+    nvml = FakeNVML([FakeDevice(name = "First"), FakeDevice(name = "Second")])
+
+    assert [gpu.name for gpu in GPUTelemetry(nvml).read_all()] == ["First", "Second"]
+
+def test_missing_fan_is_none():
+    gpu = GPUTelemetry(FakeNVML([FakeDevice(fan_speed = None)])).read()
+
+    assert gpu.fan_speed is None
+
+def test_no_driver_raises():
+    telemetry = GPUTelemetry(FakeNVML(fail_init = True))
+
+    with pytest.raises(RuntimeError):
+        telemetry.read()
+    assert not telemetry.started
+    assert not telemetry.available
+
+def test_failed_session_is_opened_again_on_the_next_read():
+    nvml = FakeNVML([FakeDevice(name = "GPU")], fail_init = True)
+    telemetry = GPUTelemetry(nvml)
+    with pytest.raises(RuntimeError):
+        telemetry.read()
+
+    # e.g. the driver finished installing
+    nvml.fail_init = False
+
+    assert telemetry.read().name == "GPU"
+    assert telemetry.available
+    assert nvml.calls["nvmlInit"] == 2
+
+def test_stop_closes_the_session():
+    nvml = FakeNVML()
+    telemetry = GPUTelemetry(nvml)
+    telemetry.read()
+
+    telemetry.stop()
+
+    assert nvml.calls["nvmlShutdown"] == 1
+    assert not nvml.initialized
+    # The next read opens a new one
+    telemetry.read()
+    assert nvml.calls["nvmlInit"] == 2
@@ -0,0 +1,30 @@
+from backend.collector_process import get_source_keys
+from backend.linux_nyx_base import LinuxNyxBase
+from backend.nyx_base import NyxBase
+from backend.scheduler import Scheduler
+from benchmarks.fake_system_sources import FakeSystemSources
+
+def test_sources_publish_the_declared_keys():
+    nyx_base = NyxBase(sources = FakeSystemSources())
+
+    published = [key for source in nyx_base.get_metric_sources() for key in source.extract(source.function())]
+
+    assert published == NyxBase.get_metric_keys()
+    nyx_base.close()
+
+def test_sources_read_through_the_getters():
+    nyx_base = NyxBase(sources = FakeSystemSources())
+    sources = {source.key: source for source in nyx_base.get_metric_sources()}
+
+    assert sources["cpu.temperature"].function() == nyx_base.get_cpu_temperature()
+    assert sources["net.lan"].extract(sources["net.lan"].function())["net.lan.interface"] == "Ethernet"
+    assert sources["ram"].extract(nyx_base.get_ram_info()) == {"ram.used_percent": nyx_base.get_ram_info().used_percent}
+    nyx_base.close()
+
+def test_platforms_extend_the_sources():
+    scheduler = Scheduler()
+    for source in LinuxNyxBase(sources = FakeSystemSources()).get_metric_sources():
+        scheduler.add_source(source)
+
+    assert get_source_keys(scheduler) == LinuxNyxBase.get_metric_keys()
+    assert LinuxNyxBase.get_metric_keys() == NyxBase.get_metric_keys() + ["cpu.clock"]
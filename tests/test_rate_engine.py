@@ -0,0 +1,76 @@
+import pytest
+
+from backend.rate_engine import RateEngine
+
+def test_first_reading_has_no_rate():
+    assert RateEngine().update("net", {"recv": 1000}, now = 0.0) == {"recv": 0.0}
+
+def test_rate_is_the_growth_per_second():
+    rates = RateEngine(window = 0)
+    rates.update("net", {"recv": 1000, "sent": 0}, now = 0.0)
+
+    assert rates.update("net", {"recv": 3000, "sent": 500}, now = 0.5) == {"recv": 4000.0, "sent": 1000.0}
+
+def test_rate_is_smoothed_over_the_window():
+    rates = RateEngine(window = 1.0)
+    rates.update("net", {"recv": 0}, now = 0.0)
+    rates.update("net", {"recv": 1000}, now = 0.5)
+
+    # Still measured from the first reading, the only one a full window old
+    assert rates.update("net", {"recv": 1000}, now = 1.0) == {"recv": pytest.approx(1000.0)}
+
+def test_decrease_without_bits_is_a_reset():
+    rates = RateEngine(window = 0)
+    rates.update("net", {"recv": 2 ** 31 + 10}, now = 0.0)
+
+    assert rates.update("net", {"recv": 5}, now = 1.0) == {"recv": 0.0}
+    assert (rates.resets, rates.wraps) == (1, 0)
+    # The reset reading is the new baseline
+    assert rates.update("net", {"recv": 105}, now = 2.0) == {"recv": 100.0}
+
+def test_decrease_of_a_32_bit_counter_in_its_upper_half_is_a_wrap():
+    rates = RateEngine(window = 0)
+    rates.update("net", {"recv": 2 ** 32 - 10}, now = 0.0, bits = 32)
+
+    assert rates.update("net", {"recv": 5}, now = 1.0, bits = 32) == {"recv": 15.0}
+    assert (rates.resets, rates.wraps) == (0, 1)
+
+def test_decrease_of_a_32_bit_counter_in_its_lower_half_is_a_reset():
+    rates = RateEngine(window = 0)
+    rates.update("net", {"recv": 1000}, now = 0.0, bits = 32)
+
+    assert rates.update("net", {"recv": 10}, now = 1.0, bits = 32) == {"recv": 0.0}
+    assert (rates.resets, rates.wraps) == (1, 0)
+
+def test_readings_after_max_gap_start_over():
+    rates = RateEngine(window = 0, max_gap = 30.0)
+    rates.update("net", {"recv": 0}, now = 0.0)
+
+    # e.g. after sleep, the growth over the gap isn't a rate worth showing
+    assert rates.update("net", {"recv": 10 ** 9}, now = 60.0) == {"recv": 0.0}
+    assert rates.update("net", {"recv": 10 ** 9 + 100}, now = 61.0) == {"recv": 100.0}
+
+def test_readings_within_min_interval_reuse_the_last_rates():
+    rates = RateEngine(window = 0, min_interval = 0.05)
+    rates.update("net", {"recv": 0}, now = 0.0)
+    rates.update("net", {"recv": 100}, now = 1.0)
+
+    assert rates.update("net", {"recv": 10 ** 6}, now = 1.01) == {"recv": 100.0}
+    # The skipped reading isn't a baseline either
+    assert rates.update("net", {"recv": 200}, now = 2.0) == {"recv": 100.0}
+
+def test_changed_counter_names_start_over():
+    rates = RateEngine(window = 0)
+    rates.update("net", {"recv": 0}, now = 0.0)
+
+    assert rates.update("net", {"recv": 100, "sent": 100}, now = 1.0) == {"recv": 0.0, "sent": 0.0}
+
+def test_reset_forgets_one_source():
+    rates = RateEngine(window = 0)
+    rates.update("net", {"recv": 0}, now = 0.0)
+    rates.update("disk", {"read": 0}, now = 0.0)
+
+    rates.reset("net")
+
+    assert rates.update("net", {"recv": 100}, now = 1.0) == {"recv": 0.0}
+    assert rates.update("disk", {"read": 100}, now = 1.0) == {"read": 100.0}
@@ -0,0 +1,25 @@
+from backend.instrumentation import record_child_cpu_time
+from backend.scheduler import MetricSource, Scheduler
+
+def test_cpu_time_of_the_shells_is_part_of_the_cost_of_a_reading():
+    def read():
+        record_child_cpu_time(0.25)
+        return 1
+
+    scheduler = Scheduler()
+    source = scheduler.add_source(MetricSource("shell", read, 1000))
+
+    scheduler._collect(source)
+
+    assert source.stats.child_cpu_time == 0.25
+    assert 0.25 <= source.cpu_time < 0.3
+    assert scheduler.diagnostics()["shell"]["child_cpu_time"] == 0.25
+
+def test_cpu_time_of_other_readings_isnt_charged():
+    scheduler = Scheduler()
+    source = scheduler.add_source(MetricSource("plain", lambda: 1, 1000))
+    record_child_cpu_time(0.25)
+
+    scheduler._collect(source)
+
+    assert source.cpu_time < 0.05
@@ -0,0 +1,134 @@
+import threading, time
+
+import pytest
+
+from backend import snapshot_cache
+from backend.nyx_base import NyxBase
+from backend.snapshot_cache import SnapshotCache
+from benchmarks.fake_system_sources import FakeSystemSources
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(snapshot_cache, "time", clock)
+    return clock
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self) -> int:
+        self.calls += 1
+        return self.calls
+
+def test_reads_within_the_ttl_hit(clock):
+    cache, read = SnapshotCache(ttls = {"entry": 1.0}), Counter()
+
+    values = [cache.get("entry", read) for _ in range(5)]
+
+    assert values == [1] * 5
+    assert read.calls == 1
+    assert cache.stats()["entry"] == {"hits": 4, "misses": 1, "hit_ratio": 0.8}
+
+def test_reads_at_the_ttl_miss(clock):
+    cache, read = SnapshotCache(ttls = {"entry": 1.0}), Counter()
+    cache.get("entry", read)
+
+    clock.now += 0.999
+    assert cache.get("entry", read) == 1
+    clock.now += 0.001
+    assert cache.get("entry", read) == 2
+    # The new reading starts a new TTL
+    clock.now += 0.5
+    assert cache.get("entry", read) == 2
+
+    assert (cache.hits["entry"], cache.misses["entry"]) == (2, 2)
+
+def test_entries_expire_on_their_own_ttl(clock):
+    cache, fast, slow = SnapshotCache(ttls = {"fast": 0.2}, default_ttl = 5.0), Counter(), Counter()
+    cache.get("fast", fast)
+    cache.get("slow", slow)
+
+    clock.now += 1.0
+    cache.get("fast", fast)
+    cache.get("slow", slow)
+
+    assert (fast.calls, slow.calls) == (2, 1)
+
+def test_ttl_argument_overrides_the_configured_one(clock):
+    cache, read = SnapshotCache(ttls = {"entry": 60.0}), Counter()
+    cache.get("entry", read)
+
+    clock.now += 1.0
+
+    assert cache.get("entry", read, ttl = 0.5) == 2
+
+def test_invalidate_drops_one_entry(clock):
+    cache, first, second = SnapshotCache(ttls = {"first": 60.0, "second": 60.0}), Counter(), Counter()
+    cache.get("first", first)
+    cache.get("second", second)
+
+    cache.invalidate("first")
+    cache.get("first", first)
+    cache.get("second", second)
+
+    assert (first.calls, second.calls) == (2, 1)
+
+def test_invalidate_drops_every_entry_and_keeps_the_counts(clock):
+    cache, first, second = SnapshotCache(ttls = {"first": 60.0, "second": 60.0}), Counter(), Counter()
+    cache.get("first", first)
+    cache.get("first", first)
+    cache.get("second", second)
+
+    cache.invalidate()
+    cache.get("first", first)
+    cache.get("second", second)
+
+    assert (first.calls, second.calls) == (2, 2)
+    assert cache.stats()["first"] == {"hits": 1, "misses": 2, "hit_ratio": 1 / 3}
+
+def test_concurrent_readers_share_one_call():
+    cache, calls = SnapshotCache(ttls = {"entry": 60.0}), []
+
+    def read():
+        calls.append(threading.get_ident())
+        time.sleep(0.05)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target = lambda: results.append(cache.get("entry", read))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["value"] * 8
+    assert len(calls) == 1
+
+def test_network_interfaces_share_one_reading(clock):
+    sources = FakeSystemSources()
+    nyx_base = NyxBase(sources = sources, cache = SnapshotCache())
+
+    nyx_base.get_network_speed("Wi-Fi")
+    nyx_base.get_network_speed("Ethernet")
+    nyx_base.close()
+
+    assert sources.calls["net_io_counters"] == 1
+    assert nyx_base.cache.stats()["net_io_counters"] == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+def test_get_timed_says_when_the_result_was_read(clock):
+    cache, read = SnapshotCache(ttls = {"entry": 1.0}), Counter()
+
+    assert cache.get_timed("entry", read) == (100.0, 1)
+    clock.now += 0.5
+    # A hit is as old as the reading it shares
+    assert cache.get_timed("entry", read) == (100.0, 1)
+    clock.now += 0.5
+    assert cache.get_timed("entry", read) == (101.0, 2)
@@ -0,0 +1,165 @@
+import os, time
+from uuid import uuid4
+from multiprocessing import shared_memory
+
+import pytest
+
+from backend import live_snapshot, snapshot_ring
+from backend.objects import Snapshot
+from backend.snapshot_ring import SnapshotRing
+
+KEYS = ["cpu.usage", "cpu.name", "gpu.clock", "on_battery", "power_plan"]
+
+def unique_name() -> str:
+    return f"nyx_test_{uuid4().hex[:12]}"
+
+@pytest.fixture
+def ring():
+    ring = SnapshotRing.create(KEYS, capacity = 4, text_size = 16, name = unique_name())
+    yield ring
+    ring.close()
+
+def snapshot(sequence: int, **values) -> Snapshot:
+    values = {"cpu.usage": float(sequence), **values}
+    return Snapshot(sequence, 1000.0 + sequence, values, frozenset(values))
+
+class OverwrittenWhileRead:
+    def __init__(self, ring: SnapshotRing, index: int, overwrite):
+        """Stands in for the locks of `ring`, runs `overwrite` between the copy of record `index` and the check of its lock."""
+        self.locks = ring.locks
+        self.index = index
+        self.overwrite = overwrite
+        self.reads = 0
+
+    def __getitem__(self, index):
+        if index == self.index:
+            self.reads += 1
+            if self.reads == 2:
+                self.overwrite()
+        return self.locks[index]
+
+    def __setitem__(self, index, value):
+        self.locks[index] = value
+
+def test_values_keep_their_type(ring):
+    ring.write(Snapshot(7, 1234.5, {
+        "cpu.usage": 12.5,
+        "cpu.name": "A CPU with a very long name",
+        "gpu.clock": 1500,
+        "on_battery": False,
+        "power_plan": None,
+        "not.in.the.layout": 1,
+    }, frozenset({"cpu.usage"})))
+
+    [(sequence, read)] = ring.read()
+
+    assert sequence == 1
+    assert (read.sequence, read.timestamp, read.updated) == (7, 1234.5, frozenset({"cpu.usage"}))
+    # Texts are cut to text_size bytes
+    assert read.values == {"cpu.usage": 12.5, "cpu.name": "A CPU with a ver", "gpu.clock": 1500, "on_battery": False, "power_plan": None}
+    assert type(read.values["gpu.clock"]) is int
+
+def test_readers_get_the_newest_capacity_snapshots_across_the_wrap(ring):
+    for sequence in range(1, 7):
+        ring.write(snapshot(sequence))
+
+    assert ring.write_sequence == 6
+    assert [sequence for sequence, _ in ring.read()] == [3, 4, 5, 6]
+    assert [read.values["cpu.usage"] for _, read in ring.read(4)] == [5.0, 6.0]
+    assert ring.read(6) == []
+    assert ring.read_latest().sequence == 6
+
+def test_attached_reader_sees_the_writes(ring):
+    reader = SnapshotRing.attach(ring.name)
+    try:
+        assert (reader.keys, reader.capacity, reader.text_size, reader.pid) == (KEYS, 4, 16, os.getpid())
+        assert reader.read_latest() is None
+
+        ring.write(snapshot(1, **{"cpu.name": "CPU"}))
+
+        assert reader.read_latest().values == {"cpu.usage": 1.0, "cpu.name": "CPU"}
+    finally:
+        reader.close()
+
+def test_record_being_written_is_left_out(ring):
+    ring.write(snapshot(1))
+    ring.write(snapshot(2))
+    # The writer is inside the record of the second one
+    ring.locks[1] = 3
+
+    assert [sequence for sequence, _ in ring.read()] == [1]
+
+def test_record_overwritten_while_copied_is_left_out(ring):
+    for sequence in range(1, 5):
+        ring.write(snapshot(sequence))
+    # The writer laps the reader while it copies the oldest record
+    ring.locks = OverwrittenWhileRead(ring, 0, lambda: ring.write(snapshot(5)))
+
+    assert [sequence for sequence, _ in ring.read()] == [2, 3, 4]
+
+def test_read_latest_retries_a_torn_record(ring):
+    ring.write(snapshot(1))
+    ring.write(snapshot(2))
+
+    def overwrite():
+        for sequence in range(3, 7):
+            ring.write(snapshot(sequence))
+    ring.locks = OverwrittenWhileRead(ring, 1, overwrite)
+
+    assert ring.read_latest().sequence == 6
+
+def test_heartbeat_is_shared(ring):
+    reader = SnapshotRing.attach(ring.name)
+    try:
+        ring.header["heartbeat"] = 0.0
+        ring.beat()
+
+        assert abs(reader.heartbeat - time.time()) < 5
+    finally:
+        reader.close()
+
+def test_segment_without_a_ring_is_refused():
+    memory = shared_memory.SharedMemory(unique_name(), create = True, size = 1024)
+    # Created here, attaching mustn't take it away from this process' resource tracker
+    snapshot_ring.created.add(memory.name)
+    try:
+        with pytest.raises(ValueError):
+            SnapshotRing.attach(memory.name)
+    finally:
+        memory.close()
+        memory.unlink()
+        snapshot_ring.created.discard(memory.name)
+
+@pytest.fixture
+def segment_name(monkeypatch) -> str:
+    name = unique_name()
+    monkeypatch.setattr(live_snapshot, "SEGMENT_NAME", name)
+    return name
+
+def test_second_instance_gets_no_live_snapshot(segment_name):
+    first = live_snapshot.publish(KEYS)
+    try:
+        assert first is not None and first.name == segment_name
+        assert live_snapshot.publish(KEYS) is None
+    finally:
+        first.close()
+
+    # Once the first one exits, the next one runs
+    second = live_snapshot.publish(KEYS)
+    assert second is not None
+    second.close()
+
+def test_live_snapshot_of_a_crashed_instance_is_replaced(segment_name, monkeypatch):
+    crashed = SnapshotRing.create(KEYS, name = segment_name)
+    crashed.write(snapshot(1))
+    monkeypatch.setattr(live_snapshot, "is_alive", lambda pid: False)
+
+    ring = live_snapshot.publish(KEYS)
+    try:
+        assert ring is not None
+        # A new segment, not the one left behind
+        assert ring.read_latest() is None
+    finally:
+        crashed.close(unlink = False)
+        if ring is not None:
+            ring.close()